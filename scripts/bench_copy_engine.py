@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Compare shutil.copy2 with each libra.core.file_ops copy method per directory.
+
+Pass one directory per file system to compare (e.g. a tmpfs, an ext4 and a
+Btrfs mount). A method the file system refuses falls back to the next one;
+the ``used`` column shows what actually wrote the data.
+
+Usage:
+    python scripts/bench_copy_engine.py [--size-mb 256] [--repeat 3] DIR [DIR ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import shutil
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from libra.core.file_ops import COPY_METHODS, copy_file  # noqa: E402
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark file copies per copy method and file system")
+    parser.add_argument("dirs", nargs="+", help="directories to copy in (one per file system)")
+    parser.add_argument("--size-mb", type=float, default=256.0, help="size of the copied file in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    return parser.parse_args(argv)
+
+
+def filesystem_type(path: str) -> str:
+    """File system of ``path`` from /proc/self/mounts; "?" elsewhere."""
+    path = os.path.realpath(path)
+    best, fs_type = "", "?"
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1]
+                if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+                    best, fs_type = mount_point, fields[2]
+    except OSError:
+        pass
+    return fs_type
+
+
+def write_source(path: pathlib.Path, size_mb: float) -> None:
+    block = os.urandom(1024 * 1024)
+    remaining = int(size_mb * 1024 * 1024)
+    with open(path, "wb") as f:
+        while remaining > 0:
+            f.write(block[:remaining])
+            remaining -= len(block)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def best_of(repeat: int, dst: pathlib.Path, fn) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        if dst.exists():
+            dst.unlink()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    dst.unlink()
+    return best, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    size = args.size_mb * 1024 * 1024
+    for directory in args.dirs:
+        work = pathlib.Path(directory) / f".bench_copy_engine_{os.getpid()}"
+        work.mkdir(parents=True)
+        try:
+            src = work / "source.bin"
+            dst = work / "copy.bin"
+            write_source(src, args.size_mb)
+            print(f"{directory} ({filesystem_type(directory)}), {args.size_mb:.0f} MB")
+            rows = [("shutil.copy2", lambda: shutil.copy2(src, dst) and "-")]
+            rows += [
+                (method, lambda method=method: copy_file(str(src), str(dst), methods=[method]).method)
+                for method in COPY_METHODS
+            ]
+            rows.append(("auto", lambda: copy_file(str(src), str(dst)).method))
+            for name, fn in rows:
+                elapsed, used = best_of(args.repeat, dst, fn)
+                rate = size / elapsed / 1024 / 1024 if elapsed > 0 else float("inf")
+                print(f"  {name:<16} used={used:<16} {elapsed * 1000:9.1f} ms {rate:9.0f} MB/s")
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Compare stdlib json with libra.core.codec on a large synthetic meta file.
+
+Usage:
+    python scripts/bench_json_codec.py [--size-mb 5] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from libra.core import codec  # noqa: E402
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark JSON parse/serialize of a meta file")
+    parser.add_argument("--size-mb", type=float, default=5.0, help="approximate meta size in MB")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is reported)")
+    return parser.parse_args(argv)
+
+
+def build_meta(size_mb: float) -> dict:
+    docs: dict = {}
+    meta = {"documents": docs}
+    i = 0
+    target = int(size_mb * 1024 * 1024)
+    approx = 0
+    while approx < target:
+        key = f"設計書_{i:05d}.docx"
+        history = [
+            {
+                "rev": f"rev1.{h}.0_20260101",
+                "file": f"設計書_{i:05d}_rev1.{h}.0_20260101.docx",
+                "updated_at": "2026-01-01T09:00:00",
+                "updated_by": "yamada",
+                "memo": "レビュー指摘を反映 / minor fixes",
+            }
+            for h in range(8)
+        ]
+        docs[key] = {
+            "title": key,
+            "current_file": f"設計書_{i:05d}_rev1.8.0_20260101.docx",
+            "current_rev": "rev1.8.0_20260101",
+            "updated_at": "2026-01-01T09:00:00",
+            "updated_by": "yamada",
+            "last_memo": "最新版",
+            "history": history,
+        }
+        approx += 2200
+        i += 1
+    return meta
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    meta = build_meta(args.size_mb)
+    stdlib_bytes = json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")
+    codec_bytes = codec.dumps_indented(meta)
+    print(f"meta size: {len(stdlib_bytes) / 1024 / 1024:.2f} MB, documents: {len(meta['documents'])}")
+    print(f"codec backend: {codec.BACKEND}, identical output: {stdlib_bytes == codec_bytes}")
+
+    rows = [
+        ("parse", "stdlib json", lambda: json.loads(stdlib_bytes.decode("utf-8"))),
+        ("parse", "codec", lambda: codec.loads(stdlib_bytes)),
+        ("serialize", "stdlib json", lambda: json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")),
+        ("serialize", "codec", lambda: codec.dumps_indented(meta)),
+    ]
+    results = {}
+    for op, name, fn in rows:
+        results[(op, name)] = best_of(args.repeat, fn)
+        print(f"{op:<10} {name:<12} {results[(op, name)] * 1000:8.1f} ms")
+    for op in ("parse", "serialize"):
+        speedup = results[(op, "stdlib json")] / results[(op, "codec")]
+        print(f"{op} speedup: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -20,24 +20,70 @@ import os
 import re
 import shutil
 import sys
+import threading
+import time
 import datetime as dt
 import getpass
 import platform
-from dataclasses import dataclass
-from typing import Optional, Tuple, Dict, Any, List, Callable
-
-from PySide6.QtCore import Qt, QSize, QTimer, Signal
+from contextlib import contextmanager
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Dict, Any, Iterable, Iterator, List, Callable, Set
+
+from PySide6.QtCore import (
+    QAbstractItemModel,
+    QAbstractListModel,
+    QAbstractTableModel,
+    QFileSystemWatcher,
+    QItemSelectionModel,
+    QMimeData,
+    QModelIndex,
+    QObject,
+    QSortFilterProxyModel,
+    Qt,
+    QSize,
+    QTimer,
+    Signal,
+)
 from PySide6.QtGui import QAction, QBrush, QColor, QIcon, QPalette
 from .core.paths import (
     appdata_root,
     cache_dir,
     config_dir,
     logs_dir,
+    memo_index_path,
+    journal_dir,
     registry_path,
     checked_resource_path,
+    scan_index_path,
     settings_path,
     user_checks_path,
 )
+from .core.memo_index import MemoIndex, MemoRecord
+from .core.scan import DirScan, FileStat, latest_mtime, path_stamp, scan_directory
+from .core.scan_index import IndexedDocument, IndexEntry, ScanIndex
+from .core.search_index import SearchHit, SearchIndex
+from .core.unchecked_inbox import CategoryTally, InboxDocument, UncheckedInbox
+from .core.codec import loads as json_loads
+from .core.file_ops import OperationCancelled, copy_file
+from .core.journal import JournalEntry, OperationJournal
+from .core.history_store import StoreReport, collect_garbage, dedupe_history
+from .core.history_log import (
+    HISTORY_LOG_FILENAME,
+    append_history_ops,
+    append_op,
+    compact_history_log,
+    drop_doc_op,
+    history_entry,
+    history_log_needs_compaction,
+    history_log_path,
+    memo_op,
+    migrate_inline_history,
+    read_all_history,
+    read_doc_history,
+)
+from .core.storage import WRITE_STATS, is_atomic_temp_name, write_json_atomic
 from .core.version import resolve_app_version
 
 from PySide6.QtWidgets import (
@@ -49,6 +95,8 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QSplitter,
     QLineEdit,
+    QListView,
+    QTableView,
     QTableWidget,
     QTableWidgetItem,
     QPushButton,
@@ -62,6 +110,7 @@ from PySide6.QtWidgets import (
     QHeaderView,
     QAbstractItemView,
     QGroupBox,
+    QTreeView,
     QTreeWidget,
     QTreeWidgetItem,
     QMenu,
@@ -69,6 +118,7 @@ from PySide6.QtWidgets import (
     QSpinBox,
     QRadioButton,
     QCheckBox,
+    QProgressBar,
 )
 
 REV_RE = re.compile(
@@ -80,6 +130,7 @@ TEMP_FILE_RE = re.compile(r"^~\$")  # Office temporary files
 META_FILENAME = ".libra_meta.json"
 LEGACY_META_DIR = "_Meta"
 LEGACY_META_FILENAME = "docmeta.json"
+MANAGEMENT_DIR_NAMES = {"_history", LEGACY_META_DIR.lower()}
 META_SAVE_WARNED_PATHS: set[str] = set()
 
 
@@ -99,6 +150,9 @@ APP_VERSION = resolve_app_version()
 REGISTRY_PATH = str(registry_path())
 SETTINGS_PATH = str(settings_path())
 USER_CHECKS_PATH = str(user_checks_path())
+SCAN_INDEX_PATH = str(scan_index_path())
+MEMO_INDEX_PATH = str(memo_index_path())
+JOURNAL_DIR = str(journal_dir())
 DEFAULT_MEMO_TIMEOUT_MIN = 30
 NON_LOCKED_IDLE_SECONDS = 15
 UNCHECKED_COLOR = QColor("#C0504D")
@@ -107,6 +161,22 @@ NEW_FOLDER_BG_COLOR_DARK = QColor("#4C3B00")
 MISSING_FOLDER_BG_COLOR_LIGHT = QColor("#F4CCCC")
 MISSING_FOLDER_BG_COLOR_DARK = QColor("#5A1F1F")
 CATEGORY_PATH_SEP = "\u001f"
+SCAN_POOL_MAX_WORKERS = 8
+FOLDER_TABLE_STATUS_GROUP = "folder-table"
+FOLDER_STATUS_PLACEHOLDER = "…"
+PROGRESSIVE_REFRESH_INTERVAL_MS = 200
+WATCH_DEBOUNCE_MS = 300
+WATCH_POLL_INTERVAL_MS = 5000
+SCAN_INDEX_FLUSH_INTERVAL_MS = 1000
+SEARCH_DEBOUNCE_MS = 200
+SEARCH_RESULT_LIMIT = 50
+SEARCH_WARM_FOLDERS_PER_TICK = 20
+MEMO_SEARCH_LIMIT = 500
+RECENT_CHANGES_PAGE_SIZE = 200
+INBOX_REFRESH_DELAY_MS = 200
+FILE_OP_MAX_WORKERS = 2
+FILE_OP_COPY_WORKERS = 4
+FILE_OP_PROGRESS_INTERVAL = 0.1
 DEFAULT_VERSION_RULES = {
     "major": "",
     "minor": "",
@@ -142,8 +212,8 @@ def load_registry() -> List[Dict[str, Any]]:
     if not os.path.exists(REGISTRY_PATH):
         return []
     try:
-        with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(REGISTRY_PATH, "rb") as f:
+            data = json_loads(f.read())
         if isinstance(data, list):
             # normalize
             out = []
@@ -162,8 +232,7 @@ def load_registry() -> List[Dict[str, Any]]:
 
 
 def save_registry(items: List[Dict[str, Any]]) -> None:
-    with open(REGISTRY_PATH, "w", encoding="utf-8") as f:
-        json.dump(items, f, ensure_ascii=False, indent=2)
+    write_json_atomic(REGISTRY_PATH, items)
 
 
 def load_settings() -> Dict[str, Any]:
@@ -182,12 +251,13 @@ def load_settings() -> Dict[str, Any]:
             "ini": True,
         },
         "version_rules": DEFAULT_VERSION_RULES,
+        "history_dedup": False,
     }
     if not os.path.exists(SETTINGS_PATH):
         return defaults
     try:
-        with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(SETTINGS_PATH, "rb") as f:
+            data = json_loads(f.read())
         if not isinstance(data, dict):
             return defaults
         out = defaults.copy()
@@ -198,16 +268,15 @@ def load_settings() -> Dict[str, Any]:
 
 
 def save_settings(settings: Dict[str, Any]) -> None:
-    with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-        json.dump(settings, f, ensure_ascii=False, indent=2)
+    write_json_atomic(SETTINGS_PATH, settings)
 
 
 def load_user_checks() -> Dict[str, Dict[str, bool]]:
     if not os.path.exists(USER_CHECKS_PATH):
         return {}
     try:
-        with open(USER_CHECKS_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(USER_CHECKS_PATH, "rb") as f:
+            data = json_loads(f.read())
         if isinstance(data, dict) and isinstance(data.get("folders"), dict):
             return data["folders"]
         if isinstance(data, dict):
@@ -218,8 +287,7 @@ def load_user_checks() -> Dict[str, Dict[str, bool]]:
 
 
 def save_user_checks(checks: Dict[str, Dict[str, bool]]) -> None:
-    with open(USER_CHECKS_PATH, "w", encoding="utf-8") as f:
-        json.dump({"folders": checks}, f, ensure_ascii=False, indent=2)
+    write_json_atomic(USER_CHECKS_PATH, {"folders": checks})
 
 
 def ensure_history_dir(folder_path: str) -> str:
@@ -261,8 +329,8 @@ def load_meta(folder_path: str) -> Dict[str, Any]:
             return {"documents": {}}
         p = legacy_path
     try:
-        with open(p, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(p, "rb") as f:
+            data = json_loads(f.read())
         if not isinstance(data, dict):
             return {"documents": {}}
         if "documents" not in data or not isinstance(data["documents"], dict):
@@ -275,9 +343,9 @@ def load_meta(folder_path: str) -> Dict[str, Any]:
 def save_meta(folder_path: str, meta: Dict[str, Any]) -> None:
     p = meta_path_for_folder(folder_path)
     try:
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
-        set_hidden_on_windows(p)
+        if write_json_atomic(p, meta):
+            # the replaced file does not inherit the old one's attributes
+            set_hidden_on_windows(p)
         META_SAVE_WARNED_PATHS.discard(p)
     except PermissionError as e:
         if p not in META_SAVE_WARNED_PATHS:
@@ -292,6 +360,15 @@ def save_meta(folder_path: str, meta: Dict[str, Any]) -> None:
             META_SAVE_WARNED_PATHS.add(p)
 
 
+def save_history_ops(folder_path: str, ops: List[Dict[str, Any]]) -> None:
+    try:
+        append_history_ops(folder_path, ops)
+        if any(op.get("op") != "append" for op in ops) and history_log_needs_compaction(folder_path):
+            compact_history_log(folder_path)
+    except OSError as e:
+        print(f"[WARN] Failed to save history: {history_log_path(folder_path)} ({e})")
+
+
 def split_name_ext(filename: str) -> Tuple[str, str]:
     base, ext = os.path.splitext(filename)
     return base, ext
@@ -438,27 +515,34 @@ def should_ignore_file(filename: str, ignore_types: Dict[str, bool]) -> bool:
     return False
 
 
-def safe_list_files(folder_path: str, ignore_types: Optional[Dict[str, Any]] = None) -> List[str]:
+def filter_document_files(
+    files: Dict[str, FileStat],
+    ignore_types: Optional[Dict[str, Any]] = None,
+) -> Dict[str, FileStat]:
     ignore_flags = normalize_ignore_types(ignore_types)
-    files = []
-    try:
-        for name in os.listdir(folder_path):
-            full = os.path.join(folder_path, name)
-            if os.path.isdir(full):
-                # skip management folders
-                if name.lower() in {"_history", LEGACY_META_DIR.lower()}:
-                    continue
-                continue
-            if name.lower() == META_FILENAME.lower():
-                continue
-            if TEMP_FILE_RE.match(name):
-                continue
-            if should_ignore_file(name, ignore_flags):
-                continue
-            files.append(name)
-    except Exception:
-        pass
-    return files
+    out: Dict[str, FileStat] = {}
+    for name, stat in files.items():
+        if name.lower() in (META_FILENAME.lower(), HISTORY_LOG_FILENAME.lower()):
+            continue
+        if TEMP_FILE_RE.match(name) or is_atomic_temp_name(name):
+            continue
+        if should_ignore_file(name, ignore_flags):
+            continue
+        out[name] = stat
+    return out
+
+
+def list_folder_files(folder_path: str, ignore_types: Optional[Dict[str, Any]] = None) -> Dict[str, FileStat]:
+    return filter_document_files(scan_directory(folder_path).files, ignore_types)
+
+
+def safe_list_files(folder_path: str, ignore_types: Optional[Dict[str, Any]] = None) -> List[str]:
+    return list(list_folder_files(folder_path, ignore_types))
+
+
+def count_scan_subfolders(scan: DirScan) -> int:
+    # skip management folders
+    return sum(1 for name in scan.dirs if name.lower() not in MANAGEMENT_DIR_NAMES)
 
 
 def is_file_locked(path: str) -> bool:
@@ -500,29 +584,326 @@ class MemoWatchState:
     last_mtime: Optional[float] = None
 
 
-class CategoryTreeWidget(QTreeWidget):
-    order_changed = Signal()
+class CategoryTreeView(QTreeView):
+    """Category tree; drag and drop only reorders rows among their siblings."""
+
+    order_changed = Signal(QModelIndex)  # parent whose children were reordered
 
     def dropEvent(self, event):  # type: ignore[override]
-        items = self.selectedItems()
-        if not items:
-            return super().dropEvent(event)
-        dragged_parent = items[0].parent()
+        rows = self.selectionModel().selectedRows()
+        if not rows:
+            event.ignore()
+            return
+        dragged_parent = rows[0].parent()
+        if any(index.parent() != dragged_parent for index in rows):
+            event.ignore()
+            return
         pos = event.position().toPoint() if hasattr(event, "position") else event.pos()
-        target_item = self.itemAt(pos)
-        if target_item is None:
-            if dragged_parent is not None:
+        target = self.indexAt(pos)
+        if not target.isValid():
+            if dragged_parent.isValid():
                 event.ignore()
                 return
+            dest_row = self.model().rowCount(dragged_parent)
         else:
-            if target_item.parent() is not dragged_parent:
+            if target.parent() != dragged_parent:
                 event.ignore()
                 return
-        super().dropEvent(event)
-        self.order_changed.emit()
+            dest_row = target.row()
+            if self.dropIndicatorPosition() == QAbstractItemView.BelowItem:
+                dest_row += 1
+        # the model reorders in place; never let the view remove the dragged rows
+        self.model().move_rows(dragged_parent, [index.row() for index in rows], dest_row)
+        event.setDropAction(Qt.IgnoreAction)
+        event.accept()
+        self.order_changed.emit(dragged_parent)
+
+
+def file_row_sort_key(row: FileRow) -> Tuple[Any, ...]:
+    """Per-column sort keys of a files-table row (index = column)."""
+    version = parse_rev_from_rev_string(row.rev)
+    return (
+        None,  # check column: sorted by toggling, not by key
+        row.filename.casefold(),
+        (version is None, version or (0, 0, 0), row.rev),
+        row.updated_at or "",
+        (row.updated_by or "").casefold(),
+        row.doc_key.casefold(),
+    )
+
+
+class FilesTableModel(QAbstractTableModel):
+    """
+    Latest files of the current folder. Cell text is produced on demand by
+    ``data`` for the rows the view paints; sort keys are computed once per
+    ``set_rows``.
+    """
+
+    HEADERS = ["", "ファイル", "rev", "更新日", "更新者", "DocKey"]
+
+    check_changed = Signal(str, bool)  # doc_key, checked
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self.folder_path = ""
+        self.rows: List[FileRow] = []
+        self._checked: List[bool] = []
+        self._sort_keys: List[Tuple[Any, ...]] = []
+        self._rows_by_doc_key: Dict[str, int] = {}
+        self._header_check_state = Qt.Unchecked
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # noqa: N802
+        if orientation != Qt.Horizontal or not (0 <= section < len(self.HEADERS)):
+            return None
+        if role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        if role == Qt.CheckStateRole and section == 0:
+            return self._header_check_state
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self.rows)):
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 1:
+                return row.filename
+            if column == 2:
+                return display_rev(row.rev)
+            if column == 3:
+                return (row.updated_at or "").replace("T", " ")
+            if column == 4:
+                return row.updated_by or ""
+            if column == 5:
+                return row.doc_key
+            return ""
+        if column == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if self._checked[index.row()] else Qt.Unchecked
+            if role == Qt.UserRole:
+                return row.doc_key
+        elif column == 1:
+            if role == Qt.ToolTipRole:
+                return os.path.join(self.folder_path, row.filename)
+            if role == Qt.ForegroundRole and not self._checked[index.row()]:
+                return QBrush(UNCHECKED_COLOR)
+            if role == Qt.BackgroundRole and row.missing:
+                return QBrush(UNCHECKED_COLOR)
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:  # noqa: N802
+        if not index.isValid() or index.column() != 0 or role != Qt.CheckStateRole:
+            return False
+        checked = value in (Qt.Checked, Qt.Checked.value)
+        self._checked[index.row()] = checked
+        self.dataChanged.emit(self.index(index.row(), 0), self.index(index.row(), 1))
+        self.check_changed.emit(self.rows[index.row()].doc_key, checked)
+        return True
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        if not (1 <= column < len(self.HEADERS)) or not self.rows:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_rows = {id(row): n for n, row in enumerate(self.rows)}
+        ranked = sorted(
+            range(len(self.rows)),
+            key=lambda n: self._sort_keys[n][column],
+            reverse=order == Qt.DescendingOrder,
+        )
+        self.rows = [self.rows[n] for n in ranked]
+        self._checked = [self._checked[n] for n in ranked]
+        self._sort_keys = [self._sort_keys[n] for n in ranked]
+        self._rows_by_doc_key = {row.doc_key: n for n, row in enumerate(self.rows)}
+        new_position = {old_rows[id(row)]: n for n, row in enumerate(self.rows)}
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(new_position[p.row()], p.column()) for p in persistent],
+        )
+        self.layoutChanged.emit()
+
+    def set_rows(self, folder_path: str, rows: List[FileRow], checked: List[bool]) -> None:
+        self.beginResetModel()
+        self.folder_path = folder_path
+        self.rows = list(rows)
+        self._checked = list(checked)
+        self._sort_keys = [file_row_sort_key(row) for row in self.rows]
+        self._rows_by_doc_key = {row.doc_key: n for n, row in enumerate(self.rows)}
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_rows("", [], [])
+
+    def replace_row(self, row: FileRow, checked: bool) -> int:
+        """Swap in the new state of the row with ``row.doc_key``; -1 when it is not shown."""
+        n = self._rows_by_doc_key.get(row.doc_key, -1)
+        if n < 0:
+            return -1
+        self.rows[n] = row
+        self._checked[n] = checked
+        self._sort_keys[n] = file_row_sort_key(row)
+        self.dataChanged.emit(self.index(n, 0), self.index(n, len(self.HEADERS) - 1))
+        return n
+
+    def row_for_doc_key(self, doc_key: str) -> int:
+        return self._rows_by_doc_key.get(doc_key, -1)
+
+    def is_checked(self, row: int) -> bool:
+        return self._checked[row]
+
+    def checked_count(self) -> int:
+        return sum(self._checked)
+
+    def set_all_checked(self, checked: bool) -> None:
+        """Check or uncheck every row with one ``dataChanged`` and no ``check_changed``."""
+        if not self.rows:
+            return
+        self._checked = [checked] * len(self.rows)
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self.rows) - 1, 1))
+
+    def set_header_check_state(self, state: Qt.CheckState) -> None:
+        if state != self._header_check_state:
+            self._header_check_state = state
+            self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
+
+    def header_check_state(self) -> Qt.CheckState:
+        return self._header_check_state
 
 
-class FileDropTable(QTableWidget):
+class HistoryEntriesModel(QAbstractTableModel):
+    """
+    History rows (``{"kind", "rev", "file", "updated_at", "updated_by", "memo"}``
+    dicts) shown by the history pane and the history dialogs. ``columns``
+    maps each column to a header and a field; the ``"check"`` field adds a
+    checkbox column. Column 0 carries the entry dict in ``Qt.UserRole``.
+    """
+
+    def __init__(self, columns: List[Tuple[str, str]], parent: QObject | None = None):
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._entries: List[Dict[str, Any]] = []
+        self._checked: List[bool] = []
+
+    @staticmethod
+    def field_text(entry: Dict[str, Any], field: str) -> str:
+        if field == "check":
+            return ""
+        if field == "display_rev":
+            return display_rev(entry.get("rev", "") or "")
+        if field == "updated_at":
+            return (entry.get("updated_at", "") or "").replace("T", " ")
+        return str(entry.get(field, "") or "")
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # noqa: N802
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self._columns):
+            return self._columns[section][0]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._entries)):
+            return None
+        entry = self._entries[index.row()]
+        field = self._columns[index.column()][1]
+        if role == Qt.DisplayRole:
+            return self.field_text(entry, field)
+        if role == Qt.CheckStateRole and field == "check":
+            return Qt.Checked if self._checked[index.row()] else Qt.Unchecked
+        if role == Qt.UserRole and index.column() == 0:
+            return entry
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self._columns[index.column()][1] == "check":
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:  # noqa: N802
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        if self._columns[index.column()][1] != "check":
+            return False
+        self._checked[index.row()] = value in (Qt.Checked, Qt.Checked.value)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def set_entries(self, entries: List[Dict[str, Any]]) -> None:
+        self.beginResetModel()
+        self._entries = list(entries)
+        self._checked = [False] * len(self._entries)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_entries([])
+
+    def entry(self, row: int) -> Optional[Dict[str, Any]]:
+        if 0 <= row < len(self._entries):
+            return self._entries[row]
+        return None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        return list(self._entries)
+
+    def checked_entries(self) -> List[Dict[str, Any]]:
+        return [entry for entry, checked in zip(self._entries, self._checked) if checked]
+
+    def set_checked(self, checked: List[bool]) -> None:
+        """Replace all check states with one ``dataChanged``."""
+        if not self._entries:
+            return
+        self._checked = list(checked)
+        column = next(n for n, (_header, field) in enumerate(self._columns) if field == "check")
+        self.dataChanged.emit(
+            self.index(0, column),
+            self.index(len(self._entries) - 1, column),
+            [Qt.CheckStateRole],
+        )
+
+
+def unique_history_entries(history_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop repeated (file, rev) pairs, keeping the first occurrence."""
+    seen = set()
+    unique = []
+    for item in history_items:
+        key = (item.get("file", ""), item.get("rev", ""))
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(item)
+    return unique
+
+
+def configure_long_table(view: QTableView) -> None:
+    """Uniform row heights so the view lays out thousands of rows without measuring them."""
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setDefaultSectionSize(view.fontMetrics().height() + 8)
+    view.verticalHeader().setVisible(False)
+    view.setWordWrap(False)
+
+
+class FileDropTable(QTableView):
     files_dropped = Signal(list)
 
     def __init__(self, *args, **kwargs):
@@ -554,6 +935,93 @@ class FileDropTable(QTableWidget):
         event.acceptProposedAction()
 
 
+def reconcile_folder_meta(
+    meta: Dict[str, Any],
+    files: set[str],
+) -> Tuple[Dict[str, Any], List[FileRow], bool]:
+    """
+    Merges the real files into meta.
+    Returns (meta, file_rows_for_view, meta_changed).
+    """
+    docs: Dict[str, Any] = meta.get("documents", {})
+
+    # Build latest candidate per doc_key from filesystem (in case meta is missing/outdated)
+    latest_by_doc: Dict[str, Tuple[Optional[Tuple[int, int, int, int]], str]] = {}
+    for fn in files:
+        doc_key, ver_tuple, rev_str = parse_rev_from_filename(fn)
+        prev = latest_by_doc.get(doc_key)
+        if prev is None:
+            latest_by_doc[doc_key] = (ver_tuple, fn)
+        else:
+            prev_tuple, prev_fn = prev
+            # compare: version tuple if available, else keep existing if it has tuple
+            if prev_tuple is None and ver_tuple is not None:
+                latest_by_doc[doc_key] = (ver_tuple, fn)
+            elif prev_tuple is not None and ver_tuple is not None:
+                if ver_tuple > prev_tuple:
+                    latest_by_doc[doc_key] = (ver_tuple, fn)
+            elif prev_tuple is None and ver_tuple is None:
+                # fallback: lexicographic
+                if fn > prev_fn:
+                    latest_by_doc[doc_key] = (ver_tuple, fn)
+
+    # Merge into meta as "observed current" if meta lacks it
+    changed = False
+    for doc_key, (_t, fn) in latest_by_doc.items():
+        if doc_key not in docs:
+            docs[doc_key] = {
+                "title": doc_key,
+                "current_file": fn,
+                "current_rev": parse_rev_from_filename(fn)[2],
+                "updated_at": "",
+                "updated_by": "",
+                "last_memo": "",
+            }
+            changed = True
+        else:
+            # If current_file missing or no longer exists, refresh from scan
+            cur_fn = docs[doc_key].get("current_file", "")
+            if not cur_fn or cur_fn not in files:
+                docs[doc_key]["current_file"] = fn
+                docs[doc_key]["current_rev"] = parse_rev_from_filename(fn)[2]
+                changed = True
+
+    # Remove docs that no longer have a current file name.
+    # Missing files with a remembered current_file stay in docs and are highlighted in UI.
+    stale_keys = []
+    for doc_key, info in docs.items():
+        cur_fn = info.get("current_file", "") if isinstance(info, dict) else ""
+        if not cur_fn:
+            stale_keys.append(doc_key)
+    if stale_keys:
+        for key in stale_keys:
+            docs.pop(key, None)
+        changed = True
+
+    meta["documents"] = docs
+
+    # Build view rows (latest per doc)
+    rows: List[FileRow] = []
+    for doc_key, info in docs.items():
+        cur_fn = info.get("current_file", "")
+        if not cur_fn:
+            continue
+        rows.append(
+            FileRow(
+                filename=cur_fn,
+                doc_key=doc_key,
+                rev=info.get("current_rev", ""),
+                updated_at=info.get("updated_at", ""),
+                updated_by=info.get("updated_by", ""),
+                memo=info.get("last_memo", ""),
+                missing=cur_fn not in files,
+            )
+        )
+    # Sort by filename
+    rows.sort(key=lambda r: r.filename.lower())
+    return meta, rows, changed
+
+
 def scan_folder(
     folder_path: str,
     ignore_types: Optional[Dict[str, Any]] = None,
@@ -563,87 +1031,1433 @@ def scan_folder(
     Returns (meta, file_rows_for_view).
     """
     meta = load_meta(folder_path)
-    docs: Dict[str, Any] = meta.get("documents", {})
-    files = safe_list_files(folder_path, ignore_types)
+    files = set(safe_list_files(folder_path, ignore_types))
+    meta, rows, changed = reconcile_folder_meta(meta, files)
+    if migrate_inline_history(folder_path, meta["documents"]):
+        changed = True
+    if changed:
+        save_meta(folder_path, meta)
+    return meta, rows
+
+
+def normalize_folder_key(folder_path: str) -> str:
+    return os.path.normcase(os.path.abspath(folder_path))
+
+
+class FolderClaims:
+    """
+    Folders whose meta a queued or running file operation owns, readable
+    from any thread. Snapshot rebuilds on the scan pool check it before
+    writing a reconciled meta, so they cannot overwrite a revision's write.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def claim(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            count = self._counts.get(key, 0) - 1
+            if count > 0:
+                self._counts[key] = count
+            else:
+                self._counts.pop(key, None)
+
+    def owned(self, folder_path: str) -> bool:
+        with self._lock:
+            return normalize_folder_key(folder_path) in self._counts
+
+
+FILE_OP_FOLDERS = FolderClaims()
+
+
+def meta_file_stamp(folder_path: str) -> Optional[Tuple[int, int]]:
+    stamp = path_stamp(meta_path_for_folder(folder_path))
+    if stamp is None:
+        stamp = path_stamp(legacy_meta_path_for_folder(folder_path))
+    return stamp
+
+
+# Directory mtimes younger than this may still change within the same
+# timestamp tick (FAT/SMB keep 2 s resolution), so such snapshots are rebuilt.
+SNAPSHOT_RACY_SECONDS = 2.0
+
+
+@dataclass
+class FolderSnapshot:
+    folder_path: str
+    exists: bool
+    dir_stamp: Optional[Tuple[int, int]]
+    meta_stamp: Optional[Tuple[int, int]]
+    ignore_key: Tuple[Tuple[str, bool], ...]
+    meta: Dict[str, Any]
+    rows: List[FileRow]
+    latest_mtime: Optional[float]
+    subfolder_count: int
+    racy: bool = False
+
+
+def ignore_types_key(ignore_types: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, bool], ...]:
+    return tuple(sorted(normalize_ignore_types(ignore_types).items()))
+
+
+def build_folder_snapshot(folder_path: str, ignore_types: Optional[Dict[str, Any]] = None) -> FolderSnapshot:
+    dir_stamp = path_stamp(folder_path)
+    meta_stamp = meta_file_stamp(folder_path)
+    scan = scan_directory(folder_path)
+    if not scan.exists:
+        return FolderSnapshot(
+            folder_path=folder_path,
+            exists=False,
+            dir_stamp=None,
+            meta_stamp=None,
+            ignore_key=ignore_types_key(ignore_types),
+            meta={"documents": {}},
+            rows=[],
+            latest_mtime=None,
+            subfolder_count=0,
+        )
+    files = filter_document_files(scan.files, ignore_types)
+    meta, rows, changed = reconcile_folder_meta(load_meta(folder_path), set(files))
+    if migrate_inline_history(folder_path, meta["documents"]):
+        changed = True
+    # a file operation is moving files and writing the meta; its own write wins
+    deferred = changed and FILE_OP_FOLDERS.owned(folder_path)
+    if changed and not deferred:
+        save_meta(folder_path, meta)
+        dir_stamp = path_stamp(folder_path)
+        meta_stamp = meta_file_stamp(folder_path)
+    racy = deferred or dir_stamp is None or (time.time() - dir_stamp[0] / 1e9) < SNAPSHOT_RACY_SECONDS
+    return FolderSnapshot(
+        folder_path=folder_path,
+        exists=True,
+        dir_stamp=dir_stamp,
+        meta_stamp=meta_stamp,
+        ignore_key=ignore_types_key(ignore_types),
+        meta=meta,
+        rows=rows,
+        latest_mtime=latest_mtime(files),
+        subfolder_count=count_scan_subfolders(scan),
+        racy=racy,
+    )
+
+
+class FolderSnapshotCache:
+    """
+    Per-folder scan results keyed by normalized folder path.
+    A snapshot is reused while the folder's mtime and the meta file's
+    (mtime, size) are unchanged; otherwise the folder is listed and the meta
+    parsed again. Snapshot contents are shared and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, FolderSnapshot] = {}
+
+    def get(self, folder_path: str, ignore_types: Optional[Dict[str, Any]] = None) -> FolderSnapshot:
+        key = normalize_folder_key(folder_path)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is not None and self.is_fresh(snapshot, ignore_types):
+            return snapshot
+        snapshot = build_folder_snapshot(folder_path, ignore_types)
+        with self._lock:
+            self._snapshots[key] = snapshot
+        return snapshot
+
+    def is_fresh(self, snapshot: FolderSnapshot, ignore_types: Optional[Dict[str, Any]] = None) -> bool:
+        if snapshot.racy or snapshot.ignore_key != ignore_types_key(ignore_types):
+            return False
+        folder_path = snapshot.folder_path
+        if path_stamp(folder_path) != snapshot.dir_stamp:
+            return False
+        return meta_file_stamp(folder_path) == snapshot.meta_stamp
+
+    def invalidate(self, folder_path: Optional[str] = None) -> None:
+        with self._lock:
+            if folder_path is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(normalize_folder_key(folder_path), None)
+
+
+FOLDER_SNAPSHOTS = FolderSnapshotCache()
+
+
+def ignore_types_index_key(ignore_types: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(ignore_types_key(ignore_types))
+
+
+def index_entry_from_snapshot(snapshot: FolderSnapshot) -> IndexEntry:
+    documents: List[IndexedDocument] = []
+    docs = snapshot.meta.get("documents", {})
+    if isinstance(docs, dict):
+        for doc_key, info in docs.items():
+            if isinstance(info, dict):
+                documents.append(IndexedDocument(
+                    doc_key,
+                    str(info.get("current_file", "")),
+                    str(info.get("current_rev", "")),
+                    str(info.get("updated_at", "") or ""),
+                    str(info.get("updated_by", "") or ""),
+                ))
+    return IndexEntry(
+        folder_path=snapshot.folder_path,
+        exists=snapshot.exists,
+        # racy stamps may hide a change made within the same tick
+        dir_stamp=None if snapshot.racy else snapshot.dir_stamp,
+        meta_stamp=snapshot.meta_stamp,
+        ignore_key=json.dumps(snapshot.ignore_key),
+        latest_mtime=snapshot.latest_mtime,
+        subfolder_count=snapshot.subfolder_count,
+        documents=documents,
+    )
+
+
+def revalidate_indexed_folder(
+    folder_path: str,
+    ignore_types: Optional[Dict[str, Any]],
+    entry: IndexEntry,
+) -> Any:
+    """Return ``entry`` while its stamps still match, otherwise a fresh snapshot."""
+    if (
+        entry.exists
+        and entry.dir_stamp is not None
+        and entry.ignore_key == ignore_types_index_key(ignore_types)
+        and path_stamp(folder_path) == entry.dir_stamp
+        and meta_file_stamp(folder_path) == entry.meta_stamp
+    ):
+        return entry
+    return scan_folder_cached(folder_path, ignore_types)
+
+
+def scan_folder_cached(
+    folder_path: str,
+    ignore_types: Optional[Dict[str, Any]] = None,
+) -> FolderSnapshot:
+    return FOLDER_SNAPSHOTS.get(folder_path, ignore_types)
+
+
+def folder_memo_records(folder_path: str, meta: Dict[str, Any]) -> List[MemoRecord]:
+    """Past and current revisions of every document in ``meta``, for the memo index."""
+    histories = read_all_history(folder_path)
+    records: List[MemoRecord] = []
+    docs = meta.get("documents", {})
+    if not isinstance(docs, dict):
+        return records
+    for doc_key, info in docs.items():
+        if not isinstance(info, dict):
+            continue
+        inline = info.get("history")
+        items = [history_entry(item) for item in inline if isinstance(item, dict)] if isinstance(inline, list) else []
+        for item in items + histories.get(doc_key, []):
+            records.append(MemoRecord(
+                folder_path,
+                doc_key,
+                item["rev"],
+                item["file"],
+                item["updated_at"],
+                item["updated_by"],
+                item["memo"],
+            ))
+        if info.get("current_file"):
+            records.append(MemoRecord(
+                folder_path,
+                doc_key,
+                str(info.get("current_rev", "") or ""),
+                str(info.get("current_file", "") or ""),
+                str(info.get("updated_at", "") or ""),
+                str(info.get("updated_by", "") or ""),
+                str(info.get("last_memo", "") or ""),
+                latest=True,
+            ))
+    return records
+
+
+def index_folder_memos(memo_index: MemoIndex, folder_path: str) -> bool:
+    """Re-read one folder into ``memo_index`` unless its meta and history log are unchanged."""
+    key = normalize_folder_key(folder_path)
+    # stamps are taken before reading, so a racing write leaves the folder stale, not wrong
+    meta_stamp = meta_file_stamp(folder_path)
+    log_stamp = path_stamp(history_log_path(folder_path))
+    if memo_index.stamps(key) == (meta_stamp, log_stamp):
+        return False
+    records = folder_memo_records(folder_path, load_meta(folder_path))
+    memo_index.replace_folder(key, folder_path, meta_stamp, log_stamp, records)
+    return True
+
+
+class BackgroundTaskPool(QObject):
+    """
+    Runs blocking filesystem jobs on a bounded thread pool.
+    Results are delivered on the GUI thread through ``task_finished``;
+    ``idle`` fires once no submitted job is left.
+    """
+
+    task_finished = Signal(str, object)
+    idle = Signal()
+    _result_ready = Signal(str, object)
+
+    def __init__(self, max_workers: int = SCAN_POOL_MAX_WORKERS, parent: QObject | None = None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="libra-scan")
+        self._futures: Dict[str, Future] = {}
+        self._groups: Dict[str, str] = {}
+        self._result_ready.connect(self._on_result_ready)
+
+    def submit(self, key: str, fn: Callable[..., Any], *args: Any, group: str = "") -> bool:
+        if key in self._futures:
+            return False
+        self._futures[key] = self._executor.submit(self._run, key, fn, args)
+        self._groups[key] = group
+        return True
+
+    def cancel_pending(self, group: str) -> None:
+        """Drop queued jobs of ``group``; jobs already running still report."""
+        for key, future in list(self._futures.items()):
+            if self._groups.get(key) != group:
+                continue
+            if future.cancel():
+                self._futures.pop(key, None)
+                self._groups.pop(key, None)
+        if not self._futures:
+            self.idle.emit()
+
+    def is_pending(self, key: str) -> bool:
+        return key in self._futures
+
+    def pending_count(self) -> int:
+        return len(self._futures)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel queued jobs; ``wait`` blocks until the running ones return."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._groups.clear()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, key: str, fn: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        try:
+            result = fn(*args)
+        except Exception as e:
+            print(f"[WARN] Background task failed: {key} ({e})")
+            result = None
+        # emitted from the worker thread; Qt queues it to the GUI thread
+        self._result_ready.emit(key, result)
+
+    def _on_result_ready(self, key: str, result: Any) -> None:
+        if self._futures.pop(key, None) is None:
+            return
+        self._groups.pop(key, None)
+        self.task_finished.emit(key, result)
+        if not self._futures:
+            self.idle.emit()
+
+
+class SearchResultsModel(QAbstractListModel):
+    """Hits of the global search box; the ``SearchHit`` is in ``Qt.UserRole``."""
+
+    KIND_LABELS = {"folder": "フォルダ", "category": "カテゴリ", "document": "文書"}
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self.hits: List[SearchHit] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self.hits)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self.hits)):
+            return None
+        hit = self.hits[index.row()]
+        if role == Qt.DisplayRole:
+            text = f"[{self.KIND_LABELS.get(hit.kind, hit.kind)}] {hit.label}"
+            if hit.kind == "document":
+                text += f"  — {os.path.basename(hit.folder_path) or hit.folder_path}"
+            return text
+        if role == Qt.ToolTipRole:
+            return hit.folder_path or " / ".join(hit.category_path)
+        if role == Qt.UserRole:
+            return hit
+        return None
+
+    def set_hits(self, hits: List[SearchHit]) -> None:
+        self.beginResetModel()
+        self.hits = list(hits)
+        self.endResetModel()
+
+
+@dataclass
+class RevisionChange:
+    """What an update, replace or rollback did to one document."""
+
+    folder_path: str
+    doc_key: str
+    filename: str
+    rev: str
+    updated_at: str
+    updated_by: str
+    memo: str
+    # the former current file as appended to the history log, if any
+    previous: Optional[Dict[str, str]] = None
+    file_mtime: Optional[float] = None
+
+    @classmethod
+    def from_doc_info(
+        cls,
+        folder_path: str,
+        doc_key: str,
+        info: Dict[str, Any],
+        previous: Optional[Dict[str, Any]] = None,
+    ) -> "RevisionChange":
+        filename = str(info.get("current_file", "") or "")
+        try:
+            file_mtime: Optional[float] = os.stat(os.path.join(folder_path, filename)).st_mtime
+        except OSError:
+            file_mtime = None
+        return cls(
+            folder_path=folder_path,
+            doc_key=doc_key,
+            filename=filename,
+            rev=str(info.get("current_rev", "") or ""),
+            updated_at=str(info.get("updated_at", "") or ""),
+            updated_by=str(info.get("updated_by", "") or ""),
+            memo=str(info.get("last_memo", "") or ""),
+            previous=history_entry(previous) if previous else None,
+            file_mtime=file_mtime,
+        )
+
+    def doc_fields(self) -> Dict[str, str]:
+        return {
+            "current_file": self.filename,
+            "current_rev": self.rev,
+            "updated_at": self.updated_at,
+            "updated_by": self.updated_by,
+            "last_memo": self.memo,
+        }
+
+    def file_row(self) -> FileRow:
+        return FileRow(
+            filename=self.filename,
+            doc_key=self.doc_key,
+            rev=self.rev,
+            updated_at=self.updated_at,
+            updated_by=self.updated_by,
+            memo=self.memo,
+        )
+
+    def inbox_document(self) -> InboxDocument:
+        return InboxDocument(self.doc_key, self.filename, self.rev, self.updated_at, self.updated_by)
+
+
+REVISION_VERBS = {"update": "更新", "replace": "差し替え", "rollback": "差し戻し"}
+
+
+@dataclass(frozen=True)
+class RevisionPlan:
+    """Inputs of an update, replace or rollback, validated on the GUI thread."""
+
+    kind: str  # "update", "replace" or "rollback"
+    folder_path: str
+    doc_key: str
+    current_file: str
+    current_rev: str
+    source_path: str  # copied to the new current file
+    new_file: str
+    new_rev: str
+    memo: str
+    open_after: bool = False
+
+    @property
+    def new_path(self) -> str:
+        return os.path.join(self.folder_path, self.new_file)
+
+
+def history_file_name(history_dir: str, filename: str) -> str:
+    """``filename`` for ``_History``, timestamped when that name is taken."""
+    if not os.path.exists(os.path.join(history_dir, filename)):
+        return filename
+    ts = dt.datetime.now().strftime("%Y%m%d%H%M%S")
+    base, ext = split_name_ext(filename)
+    return f"{base}_{ts}{ext}"
+
+
+def run_revision_plans(
+    plans: List[RevisionPlan],
+    op: "FileOperation",
+    journal: OperationJournal,
+    history_dedup: bool = False,
+) -> List[RevisionChange]:
+    """
+    Worker-thread half of updates, replaces and rollbacks of documents in
+    one folder. The sources are copied to the new current files first,
+    side by side; that is the long and cancellable part. After the commit
+    point the old current files move to ``_History``, and the history log
+    and the meta are written once for all of them. Every step is announced
+    in ``journal`` first, so ``recover_revision`` can finish or undo it
+    after a crash. With ``history_dedup`` the moved files then join the
+    ``_History/.store``.
+    """
+    entry = journal.begin("revision", plans=[dataclasses.asdict(plan) for plan in plans], phase="copying")
+    try:
+        if len(plans) == 1:
+            op.copy(plans[0].source_path, plans[0].new_path)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(FILE_OP_COPY_WORKERS, len(plans)),
+                thread_name_prefix="libra-copy",
+            ) as executor:
+                futures = [executor.submit(op.copy, plan.source_path, plan.new_path) for plan in plans]
+                wait(futures, return_when=FIRST_EXCEPTION)
+                errors = [future.exception() for future in futures if future.done() and future.exception()]
+                if errors:
+                    # a failed copy stops the others; report it rather than their cancellation
+                    op.cancel()
+                    wait(futures)
+                    errors = [future.exception() for future in futures if future.exception()]
+                    raise next((e for e in errors if not isinstance(e, OperationCancelled)), errors[0])
+        op.commit()
+    except BaseException:
+        for plan in plans:
+            if plan.new_path in op.copied_paths and os.path.exists(plan.new_path):
+                os.remove(plan.new_path)
+        entry.finish()
+        raise
+    history_dir = ensure_history_dir(plans[0].folder_path)
+    entry.advance("committed", history_files=[history_file_name(history_dir, plan.current_file) for plan in plans])
+    changes = resume_revision_plans(plans, entry)
+    if history_dedup:
+        try:
+            dedupe_history(history_dir)
+        except OSError as e:
+            # the revision itself is complete; the next pass links what this one missed
+            print(f"[WARN] Failed to deduplicate history: {history_dir} ({e})")
+    return changes
+
+
+def resume_revision_plans(plans: List[RevisionPlan], entry: JournalEntry) -> List[RevisionChange]:
+    """Run the steps after the commit point that ``entry`` has not completed yet."""
+    folder_path = plans[0].folder_path
+    history_dir = ensure_history_dir(folder_path)
+    if entry.phase == "committed":
+        hist_names = list(entry.data["history_files"])
+        for i, plan in enumerate(plans):
+            cur_path = os.path.join(folder_path, plan.current_file)
+            # a crash may have hit before or after this move
+            if not os.path.exists(cur_path):
+                continue
+            if os.path.exists(os.path.join(history_dir, hist_names[i])):
+                hist_names[i] = history_file_name(history_dir, plan.current_file)
+                entry.advance("committed", history_files=hist_names)
+            shutil.move(cur_path, os.path.join(history_dir, hist_names[i]))
+        entry.advance("moved")
+
+    if entry.phase == "moved":
+        docs = load_meta(folder_path).get("documents", {})
+        now = now_iso()
+        previous = []
+        fields = []
+        for plan, hist_name in zip(plans, entry.data["history_files"]):
+            d = docs.get(plan.doc_key)
+            # the previous current file as appended to the history log; a
+            # document the meta did not list yet has no previous revision
+            previous.append({
+                "rev": plan.current_rev,
+                "file": hist_name,
+                "updated_at": d.get("updated_at", ""),
+                "updated_by": d.get("updated_by", ""),
+                "memo": d.get("last_memo", ""),
+            } if isinstance(d, dict) else None)
+            fields.append({
+                "current_file": plan.new_file,
+                "current_rev": plan.new_rev,
+                "updated_at": now,
+                "updated_by": user_name(),
+                "last_memo": plan.memo,
+            })
+        entry.advance("history", previous=previous, fields=fields)
+
+    previous = entry.data["previous"]
+    if entry.phase == "history":
+        save_history_ops(folder_path, [append_op(plan.doc_key, prev) for plan, prev in zip(plans, previous) if prev])
+        entry.advance("meta")
+
+    # setting the fields again is harmless, so a repeated meta write needs no phase of its own
+    meta = load_meta(folder_path)
+    docs = meta.get("documents", {})
+    infos = []
+    for plan, doc_fields in zip(plans, entry.data["fields"]):
+        d = docs.get(plan.doc_key)
+        if not isinstance(d, dict):
+            d = {"title": plan.doc_key}
+        d.update(doc_fields)
+        docs[plan.doc_key] = d
+        infos.append(d)
+    meta["documents"] = docs
+    save_meta(folder_path, meta)
+    entry.finish()
+    return [
+        RevisionChange.from_doc_info(folder_path, plan.doc_key, d, prev)
+        for plan, d, prev in zip(plans, infos, previous)
+    ]
+
+
+def recover_revision(entry: JournalEntry) -> str:
+    """
+    Finish or undo revisions that a crash interrupted: before the commit
+    point the copies are removed, after it the remaining steps run.
+    Returns "rolled_back" or "rolled_forward"; raises when the folder is not
+    reachable, leaving the entry for the next start.
+    """
+    plans = [RevisionPlan(**data) for data in entry.data["plans"]]
+    if not plans:
+        entry.finish()
+        return "rolled_back"
+    if not os.path.isdir(plans[0].folder_path):
+        raise FileNotFoundError(plans[0].folder_path)
+    if entry.phase == "copying":
+        for plan in plans:
+            if os.path.exists(plan.new_path) and os.path.exists(os.path.join(plan.folder_path, plan.current_file)):
+                os.remove(plan.new_path)
+        entry.finish()
+        return "rolled_back"
+    resume_revision_plans(plans, entry)
+    return "rolled_forward"
+
+
+def format_byte_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class FileOperation:
+    """
+    One copy/move/meta-write pipeline run by ``FileOperationQueue``.
+    ``run(op)`` does the work on a worker thread: it copies through
+    ``op.copy``, which reports progress and honours a cancel request, and
+    calls ``op.commit()`` before the first step that cannot be undone; from
+    then on cancelling is refused. ``on_done(result)`` and ``on_error(exc)``
+    are called on the GUI thread.
+    """
+
+    def __init__(
+        self,
+        folder_path: str,
+        label: str,
+        total_bytes: int,
+        run: Callable[["FileOperation"], Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        doc_keys: Iterable[str] = (),
+    ):
+        self.folder_path = folder_path
+        self.label = label
+        self.total_bytes = max(0, total_bytes)
+        self.run = run
+        self.on_done = on_done
+        self.on_error = on_error
+        self.doc_keys = frozenset(doc_keys)
+        self.state = "queued"  # queued, running, done, failed or cancelled
+        self.done_bytes = 0
+        self.started_at: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._cancel_requested = False
+        self._committed = False
+        self.copied_paths: Set[str] = set()  # targets this operation created
+        self._copied = 0
+        self._active: Dict[str, int] = {}  # bytes done per copy still running
+        self._report: Optional[Callable[["FileOperation"], None]] = None
+        self._last_report = 0.0
+
+    def can_cancel(self) -> bool:
+        with self._lock:
+            return self.state in ("queued", "running") and not self._committed and not self._cancel_requested
+
+    def cancel(self) -> bool:
+        """Ask the pipeline to stop; False once it passed its commit point."""
+        with self._lock:
+            if self._committed or self.state not in ("queued", "running"):
+                return False
+            self._cancel_requested = True
+            return True
+
+    def is_cancelled(self) -> bool:
+        with self._lock:
+            return self._cancel_requested and not self._committed
+
+    def commit(self) -> None:
+        """Enter the part that must run to the end; raises if a cancel came first."""
+        with self._lock:
+            if self._cancel_requested:
+                raise OperationCancelled(self.label)
+            self._committed = True
+
+    def copy(self, src: str, dst: str) -> int:
+        """Copy ``src`` to the new file ``dst``; several copies may run at once."""
+        copied = copy_file(src, dst, lambda done: self._set_done(dst, done), self.is_cancelled).size
+        with self._lock:
+            self._active.pop(dst, None)
+            self._copied += copied
+            self.copied_paths.add(dst)
+            self.done_bytes = self._copied + sum(self._active.values())
+        return copied
+
+    def _set_done(self, dst: str, done: int) -> None:
+        with self._lock:
+            self._active[dst] = done
+            self.done_bytes = self._copied + sum(self._active.values())
+            now = time.monotonic()
+            if self._report is None or now - self._last_report < FILE_OP_PROGRESS_INTERVAL:
+                return
+            self._last_report = now
+        self._report(self)
+
+    def fraction(self) -> float:
+        if self.total_bytes <= 0:
+            return 0.0
+        return min(1.0, self.done_bytes / self.total_bytes)
+
+    def throughput(self) -> float:
+        """Bytes per second since the operation started."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started_at
+        return self.done_bytes / elapsed if elapsed > 0 else 0.0
+
+
+class FileOperationQueue(QObject):
+    """
+    Runs ``FileOperation``s on worker threads. Operations on the same folder
+    run one at a time in submission order, so a folder's meta and history
+    log are never written by two of them at once; different folders run side
+    by side. ``changed`` fires when operations are added, progress or end.
+    """
+
+    changed = Signal()
+    finished = Signal(object)
+    idle = Signal()
+    _progress_ready = Signal(object)
+    _result_ready = Signal(object, object, object)
+
+    def __init__(self, max_workers: int = FILE_OP_MAX_WORKERS, parent: QObject | None = None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="libra-fileop")
+        # folder key -> operations in order; the head is the running one
+        self._queues: Dict[str, List[FileOperation]] = {}
+        self._closed = False
+        self._progress_ready.connect(self._on_progress)
+        self._result_ready.connect(self._on_result_ready)
+
+    def submit(self, op: FileOperation) -> None:
+        key = normalize_folder_key(op.folder_path)
+        if key not in self._queues:
+            FILE_OP_FOLDERS.claim(key)
+        queue = self._queues.setdefault(key, [])
+        queue.append(op)
+        if len(queue) == 1:
+            self._start(op)
+        self.changed.emit()
+
+    def operations(self) -> List[FileOperation]:
+        """Running operations first, then the queued ones."""
+        ops = [op for queue in self._queues.values() for op in queue]
+        return [op for op in ops if op.state == "running"] + [op for op in ops if op.state != "running"]
+
+    def pending_count(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def is_busy(self, folder_path: str, doc_key: Optional[str] = None) -> bool:
+        """An operation on the folder (or on ``doc_key`` in it) is queued or running."""
+        queue = self._queues.get(normalize_folder_key(folder_path), [])
+        return any(doc_key is None or doc_key in op.doc_keys for op in queue)
+
+    def cancel(self, op: FileOperation) -> bool:
+        """Drop a queued operation or ask a running one to stop."""
+        if op.state == "queued":
+            queue = self._queues.get(normalize_folder_key(op.folder_path), [])
+            if op in queue:
+                op.cancel()
+                op.state = "cancelled"
+                queue.remove(op)
+                self._finish(op, OperationCancelled(op.label))
+                return True
+        return op.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel what has not committed yet and wait for the running operations."""
+        self._closed = True
+        for queue in self._queues.values():
+            for op in queue:
+                op.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for key in self._queues:
+            FILE_OP_FOLDERS.release(key)
+        self._queues.clear()
+
+    def _start(self, op: FileOperation) -> None:
+        op.state = "running"
+        op.started_at = time.monotonic()
+        op._report = self._progress_ready.emit
+        self._executor.submit(self._run, op)
+
+    def _run(self, op: FileOperation) -> None:
+        try:
+            result, error = op.run(op), None
+        except Exception as e:
+            result, error = None, e
+        # emitted from the worker thread; Qt queues it to the GUI thread
+        self._result_ready.emit(op, result, error)
+
+    def _on_progress(self, _op: FileOperation) -> None:
+        self.changed.emit()
+
+    def _on_result_ready(self, op: FileOperation, result: Any, error: Optional[BaseException]) -> None:
+        if self._closed:
+            return
+        key = normalize_folder_key(op.folder_path)
+        queue = self._queues.get(key, [])
+        if op in queue:
+            queue.remove(op)
+        if queue:
+            self._start(queue[0])
+        elif self._queues.pop(key, None) is not None:
+            FILE_OP_FOLDERS.release(key)
+        if error is None:
+            op.state = "done"
+            op.done_bytes = op.total_bytes
+        else:
+            op.state = "cancelled" if isinstance(error, OperationCancelled) else "failed"
+        if error is None and op.on_done is not None:
+            op.on_done(result)
+        self._finish(op, error)
+
+    def _finish(self, op: FileOperation, error: Optional[BaseException]) -> None:
+        op.error = error
+        if error is not None and op.on_error is not None:
+            op.on_error(error)
+        self.finished.emit(op)
+        self.changed.emit()
+        if not self._queues:
+            self.idle.emit()
+
+
+@dataclass
+class RefreshRequest:
+    # folder path -> True when its contents changed on disk (rescan), False
+    # when only user state such as check marks changed
+    folders: Dict[str, bool] = field(default_factory=dict)
+    docs: Dict[str, set] = field(default_factory=dict)  # folder path -> doc keys
+    # applied in order; a rescan of the same folder supersedes them
+    revisions: List[RevisionChange] = field(default_factory=list)
+    folder_table: bool = False
+    folder_table_force_scan: bool = False
+    category_tree: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.folders or self.docs or self.revisions or self.folder_table or self.category_tree)
+
+
+class RefreshScheduler(QObject):
+    """
+    Collects what operations dirtied and hands one merged ``RefreshRequest``
+    to ``apply`` on the next event-loop turn, however many marks were made.
+    """
+
+    def __init__(self, apply: Callable[[RefreshRequest], None], parent: QObject | None = None):
+        super().__init__(parent)
+        self._apply = apply
+        self._pending = RefreshRequest()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    def mark_folder(self, folder_path: str, rescan: bool = True) -> None:
+        """The folder's files (``rescan``) or only its check marks changed."""
+        self._pending.folders[folder_path] = self._pending.folders.get(folder_path, False) or rescan
+        self._schedule()
+
+    def mark_doc(self, folder_path: str, doc_key: str) -> None:
+        """Only the meta of one document (memo, history) changed."""
+        self._pending.docs.setdefault(folder_path, set()).add(doc_key)
+        self._schedule()
+
+    def mark_revision(self, change: RevisionChange) -> None:
+        """One document got a new current file; its row is patched, not rescanned."""
+        self._pending.revisions.append(change)
+        self._schedule()
+
+    def mark_folder_table(self, force_scan: bool = False) -> None:
+        self._pending.folder_table = True
+        self._pending.folder_table_force_scan = self._pending.folder_table_force_scan or force_scan
+        self._schedule()
+
+    def mark_category_tree(self) -> None:
+        self._pending.category_tree = True
+        self._schedule()
+
+    def is_pending(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self) -> None:
+        self._timer.stop()
+        request = self._pending
+        self._pending = RefreshRequest()
+        if request:
+            self._apply(request)
+
+    def _schedule(self) -> None:
+        if not self._timer.isActive():
+            self._timer.start()
+
+
+class FolderWatcher(QObject):
+    """
+    Watches folders (and, for registered folders, their ``_History`` dir and
+    meta file) and reports each changed folder once per burst through
+    ``folder_changed``. Paths the platform refuses to watch, e.g. once the
+    inotify watch limit is reached, are polled by stamp instead.
+    """
+
+    folder_changed = Signal(str)
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._owners: Dict[str, str] = {}
+        self._polled: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._dirty: Dict[str, None] = {}
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._flush)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(WATCH_POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.poll)
+
+    def set_folders(self, registered: List[str], others: List[str]) -> None:
+        wanted: Dict[str, str] = {}
+        for folder in others:
+            wanted[folder] = folder
+        for folder in registered:
+            wanted[folder] = folder
+            wanted[os.path.join(folder, "_History")] = folder
+            wanted[meta_path_for_folder(folder)] = folder
+            wanted[history_log_path(folder)] = folder
+        stale = [path for path in self._owners if path not in wanted]
+        if stale:
+            self._watcher.removePaths([p for p in stale if p not in self._polled])
+            for path in stale:
+                self._polled.pop(path, None)
+        self._owners = wanted
+        self._arm(list(wanted))
+
+    def polled_paths(self) -> List[str]:
+        return list(self._polled)
+
+    def stop(self) -> None:
+        self._debounce_timer.stop()
+        self._poll_timer.stop()
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def poll(self) -> None:
+        for path, stamp in list(self._polled.items()):
+            current = path_stamp(path)
+            if current != stamp:
+                self._polled[path] = current
+                self._mark_dirty(path)
+
+    def _arm(self, paths: List[str]) -> None:
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        # missing paths (no _History yet, meta not written) are picked up by
+        # the parent folder's notification, which re-arms its paths
+        candidates = [
+            p for p in paths
+            if p not in watched and p not in self._polled and os.path.exists(p)
+        ]
+        if not candidates:
+            return
+        failed = self._watcher.addPaths(candidates)
+        for path in failed:
+            self._polled[path] = path_stamp(path)
+        if self._polled and not self._poll_timer.isActive():
+            self._poll_timer.start()
+
+    def _on_path_changed(self, path: str) -> None:
+        self._mark_dirty(path)
+
+    def _mark_dirty(self, path: str) -> None:
+        folder = self._owners.get(path)
+        if folder is None:
+            return
+        self._dirty[folder] = None
+        self._debounce_timer.start()
+
+    def _flush(self) -> None:
+        dirty = list(self._dirty)
+        self._dirty.clear()
+        # atomic replaces drop file watches; re-add whatever exists again
+        self._arm([path for path, folder in self._owners.items() if folder in dirty])
+        for folder in dirty:
+            self.folder_changed.emit(folder)
+
+
+FOLDER_NAME_ROLE = Qt.UserRole + 1
+
+
+@dataclass(frozen=True)
+class FolderRowStatus:
+    last_date: str = ""
+    has_unchecked: bool = False
+    unchecked_count: int = 0
+    missing: bool = False
+
+
+def unchecked_badge(text: str, count: int) -> str:
+    """Row label with its number of unchecked documents, when there are any."""
+    return f"{text} ({count})" if count > 0 else text
+
+
+@dataclass(frozen=True)
+class FolderListEntry:
+    kind: str  # "category" or "folder"
+    name: str
+    path: Any  # category path (List[str]) or folder path (str)
+    key: str = ""
+    tooltip: str = ""
+    icon_prefix: str = "📁 "
+    highlight_enabled: bool = False
+    has_new_subfolder: bool = False
+    status: FolderRowStatus = FolderRowStatus()
+
+
+class FolderListModel(QAbstractTableModel):
+    """
+    Rows of the folder list (sub-categories and folders of the selected
+    category). Status columns are patched per row with ``dataChanged``;
+    the name filter lives in a ``QSortFilterProxyModel`` on top.
+    """
+
+    HEADERS = ["登録名", "最終更新日"]
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._entries: List[FolderListEntry] = []
+        self._rows_by_key: Dict[str, int] = {}
+        self._new_bg = QColor()
+        self._missing_bg = QColor()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # noqa: N802
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._entries)):
+            return None
+        entry = self._entries[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                count = entry.status.unchecked_count if entry.status.has_unchecked else 0
+                return unchecked_badge(f"{entry.icon_prefix}{entry.name}", count)
+            return entry.status.last_date if entry.kind == "folder" else ""
+        if role == Qt.ToolTipRole and column == 0:
+            return entry.tooltip or None
+        if role == Qt.ForegroundRole and column == 0 and entry.status.has_unchecked:
+            return QBrush(UNCHECKED_COLOR)
+        if role == Qt.BackgroundRole:
+            if entry.status.missing:
+                return QBrush(self._missing_bg)
+            if entry.has_new_subfolder:
+                return QBrush(self._new_bg)
+            return None
+        if role == Qt.UserRole and column == 0:
+            if entry.kind == "category":
+                return {"type": "category", "path": entry.path}
+            return entry.path
+        if role == FOLDER_NAME_ROLE:
+            return entry.name
+        return None
+
+    def entry(self, row: int) -> Optional[FolderListEntry]:
+        if 0 <= row < len(self._entries):
+            return self._entries[row]
+        return None
+
+    def row_for_key(self, key: str) -> int:
+        return self._rows_by_key.get(key, -1)
+
+    def set_colors(self, new_bg: QColor, missing_bg: QColor) -> None:
+        self._new_bg = QColor(new_bg)
+        self._missing_bg = QColor(missing_bg)
+
+    def set_entries(self, entries: List[FolderListEntry]) -> None:
+        same_rows = len(entries) == len(self._entries) and all(
+            (a.kind, a.path) == (b.kind, b.path) for a, b in zip(entries, self._entries)
+        )
+        if not same_rows:
+            self.beginResetModel()
+            self._entries = list(entries)
+            self._rows_by_key = {e.key: row for row, e in enumerate(self._entries) if e.key}
+            self.endResetModel()
+            return
+        for row, entry in enumerate(entries):
+            if entry != self._entries[row]:
+                self._entries[row] = entry
+                self._emit_row_changed(row)
+
+    def set_status(self, row: int, status: FolderRowStatus) -> None:
+        entry = self.entry(row)
+        if entry is None or entry.status == status:
+            return
+        self._entries[row] = dataclasses.replace(entry, status=status)
+        self._emit_row_changed(row)
+
+    def _emit_row_changed(self, row: int) -> None:
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+
+class FolderFilterProxyModel(QSortFilterProxyModel):
+    """Case-insensitive substring filter on the plain row name; keeps model order."""
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self.setFilterRole(FOLDER_NAME_ROLE)
+        self.setFilterKeyColumn(0)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self._query = ""
+
+    def set_query(self, query: str) -> None:
+        query = query.strip()
+        if query == self._query:
+            return
+        self._query = query
+        self.setFilterFixedString(query)
+
+
+@dataclass(frozen=True)
+class CategoryTreeRow:
+    kind: str  # "category" or "folder"
+    name: str
+    path: Any  # category path (List[str]) or folder path (str)
+    category_path: Any = ()  # parent category of a folder row
+    tooltip: str = ""
+    icon_prefix: str = "📁 "
+    checked: bool = False
+    has_new: bool = False
+    has_unchecked: bool = False
+    unchecked_count: int = 0
+    has_children: bool = False
+
+    @property
+    def identity(self) -> Tuple[str, Any]:
+        if self.kind == "category":
+            return ("category", tuple(self.path))
+        return ("folder", self.path)
+
+
+class _CategoryTreeNode:
+    __slots__ = ("row", "parent", "children", "position", "populated")
+
+    def __init__(self, row: Optional[CategoryTreeRow], parent: Optional["_CategoryTreeNode"]):
+        self.row = row
+        self.parent = parent
+        self.children: List["_CategoryTreeNode"] = []
+        self.position = 0
+        # folders and empty categories have nothing to fetch
+        self.populated = row is not None and (row.kind != "category" or not row.has_children)
+
+
+class CategoryTreeModel(QAbstractItemModel):
+    """
+    Category/folder tree. Children are read from ``provider(category_path)``
+    only when a node is expanded (``fetchMore``); ``sync`` re-reads the
+    populated nodes and applies the difference as row inserts, removals,
+    moves and ``dataChanged``, so the view keeps expansion and selection.
+    Rows are looked up by identity (category path or folder path) without
+    walking the tree.
+    """
+
+    MIME_TYPE = "application/x-libra-category-rows"
+
+    check_toggled = Signal(object, bool)  # UserRole payload, checked
+
+    def __init__(self, provider: Callable[[List[str]], List[CategoryTreeRow]], parent: QObject | None = None):
+        super().__init__(parent)
+        self._provider = provider
+        self._root = _CategoryTreeNode(None, None)
+        self._nodes: Dict[Tuple[str, Any], _CategoryTreeNode] = {}
+        self._new_bg = QColor()
+
+    # ----- QAbstractItemModel -----
+    def index(self, row: int, column: int = 0, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        node = self._node(parent)
+        if column != 0 or not (0 <= row < len(node.children)):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:  # type: ignore[override]
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.position, 0, parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:  # noqa: N802
+        node = self._node(parent)
+        if node is self._root or node.populated:
+            return bool(node.children) or not node.populated
+        return node.row.has_children
 
-    # Build latest candidate per doc_key from filesystem (in case meta is missing/outdated)
-    latest_by_doc: Dict[str, Tuple[Optional[Tuple[int, int, int, int]], str]] = {}
-    for fn in files:
-        doc_key, ver_tuple, rev_str = parse_rev_from_filename(fn)
-        prev = latest_by_doc.get(doc_key)
-        if prev is None:
-            latest_by_doc[doc_key] = (ver_tuple, fn)
-        else:
-            prev_tuple, prev_fn = prev
-            # compare: version tuple if available, else keep existing if it has tuple
-            if prev_tuple is None and ver_tuple is not None:
-                latest_by_doc[doc_key] = (ver_tuple, fn)
-            elif prev_tuple is not None and ver_tuple is not None:
-                if ver_tuple > prev_tuple:
-                    latest_by_doc[doc_key] = (ver_tuple, fn)
-            elif prev_tuple is None and ver_tuple is None:
-                # fallback: lexicographic
-                if fn > prev_fn:
-                    latest_by_doc[doc_key] = (ver_tuple, fn)
+    def canFetchMore(self, parent: QModelIndex) -> bool:  # noqa: N802
+        return not self._node(parent).populated
 
-    # Merge into meta as "observed current" if meta lacks it
-    changed = False
-    for doc_key, (_t, fn) in latest_by_doc.items():
-        if doc_key not in docs:
-            docs[doc_key] = {
-                "title": doc_key,
-                "current_file": fn,
-                "current_rev": parse_rev_from_filename(fn)[2],
-                "updated_at": "",
-                "updated_by": "",
-                "last_memo": "",
-                "history": [],
-            }
-            changed = True
-        else:
-            # If current_file missing or no longer exists, refresh from scan
-            cur_fn = docs[doc_key].get("current_file", "")
-            if not cur_fn or cur_fn not in files:
-                docs[doc_key]["current_file"] = fn
-                docs[doc_key]["current_rev"] = parse_rev_from_filename(fn)[2]
-                changed = True
+    def fetchMore(self, parent: QModelIndex) -> None:  # noqa: N802
+        node = self._node(parent)
+        if not node.populated:
+            self._populate(node, parent)
 
-    # Remove docs that no longer have a current file name.
-    # Missing files with a remembered current_file stay in docs and are highlighted in UI.
-    stale_keys = []
-    for doc_key, info in docs.items():
-        cur_fn = info.get("current_file", "") if isinstance(info, dict) else ""
-        if not cur_fn:
-            stale_keys.append(doc_key)
-    if stale_keys:
-        for key in stale_keys:
-            docs.pop(key, None)
-        changed = True
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row: CategoryTreeRow = index.internalPointer().row
+        if role == Qt.DisplayRole:
+            return unchecked_badge(f"{row.icon_prefix}{row.name}", row.unchecked_count if row.has_unchecked else 0)
+        if role == Qt.ToolTipRole:
+            return row.tooltip or None
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if row.checked else Qt.Unchecked
+        if role == Qt.ForegroundRole and row.has_unchecked:
+            return QBrush(UNCHECKED_COLOR)
+        if role == Qt.BackgroundRole and row.has_new:
+            return QBrush(self._new_bg)
+        if role == Qt.UserRole:
+            if row.kind == "category":
+                return {"type": "category", "path": list(row.path)}
+            return {"type": "folder", "path": row.path, "category_path": list(row.category_path)}
+        return None
 
-    meta["documents"] = docs
-    if changed:
-        save_meta(folder_path, meta)
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:  # noqa: N802
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        node: _CategoryTreeNode = index.internalPointer()
+        checked = value in (Qt.Checked, Qt.Checked.value)
+        if checked != node.row.checked:
+            node.row = dataclasses.replace(node.row, checked=checked)
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.check_toggled.emit(self.data(index, Qt.UserRole), checked)
+        return True
 
-    # Build view rows (latest per doc)
-    rows: List[FileRow] = []
-    for doc_key, info in docs.items():
-        cur_fn = info.get("current_file", "")
-        if not cur_fn:
-            continue
-        rows.append(
-            FileRow(
-                filename=cur_fn,
-                doc_key=doc_key,
-                rev=info.get("current_rev", ""),
-                updated_at=info.get("updated_at", ""),
-                updated_by=info.get("updated_by", ""),
-                memo=info.get("last_memo", ""),
-                missing=cur_fn not in files,
-            )
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return (
+            Qt.ItemIsEnabled
+            | Qt.ItemIsSelectable
+            | Qt.ItemIsUserCheckable
+            | Qt.ItemIsDragEnabled
+            | Qt.ItemIsDropEnabled
         )
-    # Sort by filename
-    rows.sort(key=lambda r: r.filename.lower())
-    return meta, rows
+
+    def supportedDropActions(self) -> Qt.DropActions:  # noqa: N802
+        return Qt.MoveAction
+
+    def mimeTypes(self) -> List[str]:  # noqa: N802
+        return [self.MIME_TYPE]
+
+    def mimeData(self, indexes: List[QModelIndex]) -> QMimeData:  # noqa: N802
+        # drops are handled by CategoryTreeView from the selection; the payload is a marker
+        mime = QMimeData()
+        mime.setData(self.MIME_TYPE, b"")
+        return mime
+
+    # ----- lookups -----
+    def set_colors(self, new_bg: QColor) -> None:
+        self._new_bg = QColor(new_bg)
+
+    def category_index(self, path: List[str]) -> QModelIndex:
+        """Index of the category ``path``, fetching its ancestors on the way; O(depth)."""
+        if not self._root.populated:
+            self._populate(self._root, QModelIndex())
+        node = self._root
+        for depth in range(1, len(path) + 1):
+            child = self._nodes.get(("category", tuple(path[:depth])))
+            if child is None:
+                return QModelIndex()
+            if depth < len(path) and not child.populated:
+                self._populate(child, self._index_of(child))
+            node = child
+        return self._index_of(node)
+
+    def folder_index(self, category_path: List[str], folder_path: str) -> QModelIndex:
+        """Index of the folder row ``folder_path`` under the category ``category_path``."""
+        parent = self.category_index(category_path)
+        if not parent.isValid():
+            return QModelIndex()
+        node = self._node(parent)
+        if not node.populated:
+            self._populate(node, parent)
+        for n, child in enumerate(node.children):
+            if child.row.kind == "folder" and child.row.path == folder_path:
+                return self.index(n, 0, parent)
+        return QModelIndex()
+
+    def child_rows(self, parent: QModelIndex = QModelIndex()) -> List[CategoryTreeRow]:
+        return [child.row for child in self._node(parent).children]
+
+    # ----- updates -----
+    def sync(self) -> None:
+        """Re-read every populated node from the provider and apply the differences."""
+        if not self._root.populated:
+            self._populate(self._root, QModelIndex())
+            return
+        self._sync_children(self._root, QModelIndex())
+
+    def move_rows(self, parent: QModelIndex, rows: List[int], dest_row: int) -> bool:
+        node = self._node(parent)
+        moving = [node.children[r] for r in sorted(set(rows)) if 0 <= r < len(node.children)]
+        if not moving:
+            return False
+        moving_ids = {id(child) for child in moving}
+        before = [c for c in node.children[:dest_row] if id(c) not in moving_ids]
+        after = [c for c in node.children[dest_row:] if id(c) not in moving_ids]
+        self._reorder(node, before + moving + after)
+        return True
+
+    def _node(self, index: QModelIndex) -> _CategoryTreeNode:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node: _CategoryTreeNode) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.position, 0, node)
+
+    def _path(self, node: _CategoryTreeNode) -> List[str]:
+        return [] if node is self._root else list(node.row.path)
+
+    def _make_nodes(self, parent: _CategoryTreeNode, rows: List[CategoryTreeRow]) -> List[_CategoryTreeNode]:
+        nodes = [_CategoryTreeNode(row, parent) for row in rows]
+        for node in nodes:
+            self._nodes[node.row.identity] = node
+        return nodes
+
+    def _forget(self, node: _CategoryTreeNode) -> None:
+        if self._nodes.get(node.row.identity) is node:
+            del self._nodes[node.row.identity]
+        for child in node.children:
+            self._forget(child)
+
+    @staticmethod
+    def _renumber(node: _CategoryTreeNode) -> None:
+        for position, child in enumerate(node.children):
+            child.position = position
+
+    def _populate(self, node: _CategoryTreeNode, index: QModelIndex) -> None:
+        node.populated = True
+        rows = self._provider(self._path(node))
+        if not rows:
+            return
+        self.beginInsertRows(index, 0, len(rows) - 1)
+        node.children = self._make_nodes(node, rows)
+        self._renumber(node)
+        self.endInsertRows()
+
+    def _reorder(self, node: _CategoryTreeNode, children: List[_CategoryTreeNode]) -> None:
+        self.layoutAboutToBeChanged.emit()
+        node.children = children
+        self._renumber(node)
+        moved_from: List[QModelIndex] = []
+        moved_to: List[QModelIndex] = []
+        for persistent in self.persistentIndexList():
+            child = persistent.internalPointer() if persistent.isValid() else None
+            if child is not None and child.parent is node and persistent.row() != child.position:
+                moved_from.append(persistent)
+                moved_to.append(self.createIndex(child.position, persistent.column(), child))
+        self.changePersistentIndexList(moved_from, moved_to)
+        self.layoutChanged.emit()
+
+    def _sync_children(self, node: _CategoryTreeNode, index: QModelIndex) -> None:
+        rows = self._provider(self._path(node))
+        new_ids = [row.identity for row in rows]
+        rows_by_id = dict(zip(new_ids, rows))
+
+        # removals, bottom-up in contiguous runs so earlier positions stay valid
+        end = len(node.children)
+        while end > 0:
+            if node.children[end - 1].row.identity in rows_by_id:
+                end -= 1
+                continue
+            start = end - 1
+            while start > 0 and node.children[start - 1].row.identity not in rows_by_id:
+                start -= 1
+            self.beginRemoveRows(index, start, end - 1)
+            for child in node.children[start:end]:
+                self._forget(child)
+            del node.children[start:end]
+            self._renumber(node)
+            self.endRemoveRows()
+            end = start
+
+        # moves: put surviving rows into their new relative order
+        kept = {child.row.identity for child in node.children}
+        if [i for i in new_ids if i in kept] != [child.row.identity for child in node.children]:
+            rank = {identity: n for n, identity in enumerate(new_ids)}
+            self._reorder(node, sorted(node.children, key=lambda child: rank[child.row.identity]))
+
+        # inserts, in contiguous runs of new rows
+        pos = 0
+        while pos < len(rows):
+            if pos < len(node.children) and node.children[pos].row.identity == new_ids[pos]:
+                pos += 1
+                continue
+            stop = pos
+            while stop < len(rows) and new_ids[stop] not in kept:
+                stop += 1
+            self.beginInsertRows(index, pos, stop - 1)
+            node.children[pos:pos] = self._make_nodes(node, rows[pos:stop])
+            self._renumber(node)
+            self.endInsertRows()
+            pos = stop
+
+        for child in node.children:
+            row = rows_by_id[child.row.identity]
+            child_index = self.createIndex(child.position, 0, child)
+            if row != child.row:
+                child.row = row
+                self.dataChanged.emit(child_index, child_index)
+            if child.populated and row.kind == "category":
+                self._sync_children(child, child_index)
+            elif not child.populated and not row.has_children:
+                child.populated = True
 
 
 class RegisterDialog(QDialog):
@@ -1122,8 +2936,10 @@ class HistoryClearDialog(QDialog):
             current_text = format_version_numbers(*current_version)
         layout.addWidget(QLabel(f"現在のバージョン: {current_text}"))
 
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["選択", "rev", "ファイル"])
+        self.model = HistoryEntriesModel([("選択", "check"), ("rev", "rev"), ("ファイル", "file")], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        configure_long_table(self.table)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
@@ -1151,78 +2967,29 @@ class HistoryClearDialog(QDialog):
         self.populate_table()
 
     def populate_table(self):
-        self.table.setRowCount(0)
-        seen = set()
-        for item in self.history_items:
-            key = (item.get("file", ""), item.get("rev", ""))
-            if key in seen:
-                continue
-            seen.add(key)
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-            check_item = QTableWidgetItem("")
-            check_item.setCheckState(Qt.Unchecked)
-            check_item.setData(Qt.UserRole, item)
-            rev_item = QTableWidgetItem(item.get("rev", ""))
-            file_item = QTableWidgetItem(item.get("file", ""))
-            self.table.setItem(r, 0, check_item)
-            self.table.setItem(r, 1, rev_item)
-            self.table.setItem(r, 2, file_item)
+        self.model.set_entries(unique_history_entries(self.history_items))
 
     def selected_items(self) -> List[Dict[str, Any]]:
-        selected = []
-        for r in range(self.table.rowCount()):
-            check_item = self.table.item(r, 0)
-            if check_item and check_item.checkState() == Qt.Checked:
-                data = check_item.data(Qt.UserRole)
-                if isinstance(data, dict):
-                    selected.append(data)
-        return selected
+        return self.model.checked_entries()
 
     def latest_version_tuple(self) -> Optional[Tuple[int, int, int]]:
         return parse_rev_numbers(self.current_rev)
 
-    def select_patch_versions(self):
+    def check_versions(self, should_select: Callable[[Tuple[int, int, int], Tuple[int, int, int]], bool]) -> None:
         latest = self.latest_version_tuple()
         if not latest:
             return
-        for r in range(self.table.rowCount()):
-            check_item = self.table.item(r, 0)
-            if not check_item:
-                continue
-            data = check_item.data(Qt.UserRole)
-            if not isinstance(data, dict):
-                continue
-            rev = data.get("rev", "")
-            candidate = parse_rev_from_rev_string(rev)
-            if not candidate:
-                check_item.setCheckState(Qt.Unchecked)
-                continue
-            if should_select_patch(latest, candidate):
-                check_item.setCheckState(Qt.Checked)
-            else:
-                check_item.setCheckState(Qt.Unchecked)
+        checked = []
+        for data in self.model.entries():
+            candidate = parse_rev_from_rev_string(data.get("rev", ""))
+            checked.append(bool(candidate) and should_select(latest, candidate))
+        self.model.set_checked(checked)
+
+    def select_patch_versions(self):
+        self.check_versions(should_select_patch)
 
     def select_minor_versions(self):
-        latest = self.latest_version_tuple()
-        if not latest:
-            return
-        for r in range(self.table.rowCount()):
-            check_item = self.table.item(r, 0)
-            if not check_item:
-                continue
-            data = check_item.data(Qt.UserRole)
-            if not isinstance(data, dict):
-                continue
-            rev = data.get("rev", "")
-            candidate = parse_rev_from_rev_string(rev)
-            if not candidate:
-                check_item.setCheckState(Qt.Unchecked)
-                continue
-            if should_select_minor(latest, candidate):
-                check_item.setCheckState(Qt.Checked)
-            else:
-                check_item.setCheckState(Qt.Unchecked)
+        self.check_versions(should_select_minor)
 
 
 class HistorySelectDialog(QDialog):
@@ -1235,8 +3002,10 @@ class HistorySelectDialog(QDialog):
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("差し戻す履歴を選択してください。"))
 
-        self.table = QTableWidget(0, 2)
-        self.table.setHorizontalHeaderLabels(["rev", "ファイル"])
+        self.model = HistoryEntriesModel([("rev", "rev"), ("ファイル", "file")], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        configure_long_table(self.table)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -1253,33 +3022,13 @@ class HistorySelectDialog(QDialog):
         self.populate_table()
 
     def populate_table(self):
-        self.table.setRowCount(0)
-        seen = set()
-        for item in self.history_items:
-            key = (item.get("file", ""), item.get("rev", ""))
-            if key in seen:
-                continue
-            seen.add(key)
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-            rev_item = QTableWidgetItem(item.get("rev", ""))
-            rev_item.setData(Qt.UserRole, item)
-            file_item = QTableWidgetItem(item.get("file", ""))
-            self.table.setItem(r, 0, rev_item)
-            self.table.setItem(r, 1, file_item)
+        self.model.set_entries(unique_history_entries(self.history_items))
 
     def selected_item(self) -> Optional[Dict[str, Any]]:
         sel = self.table.selectionModel().selectedRows()
         if not sel:
             return None
-        row = sel[0].row()
-        item = self.table.item(row, 0)
-        if not item:
-            return None
-        data = item.data(Qt.UserRole)
-        if isinstance(data, dict):
-            return data
-        return None
+        return self.model.entry(sel[0].row())
 
 
 class HistoryDetailDialog(QDialog):
@@ -1383,6 +3132,310 @@ class MemoDialog(QDialog):
         return self.memo.toPlainText().strip()
 
 
+class MemoSearchDialog(QDialog):
+    """
+    Searches the memos, revs and users of every registered folder.
+    ``search(text, user)`` returns history-row dicts carrying ``folder_path``,
+    ``folder_name`` and ``doc_key``; a double-clicked row is passed to
+    ``open_requested``.
+    """
+
+    open_requested = Signal(dict)
+
+    def __init__(self, search: Callable[[str, str], List[Dict[str, Any]]], parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("メモ検索")
+        self.resize(960, 560)
+        self._search = search
+        self._building = False
+
+        layout = QVBoxLayout(self)
+        inputs = QHBoxLayout()
+        self.text_edit = QLineEdit()
+        self.text_edit.setPlaceholderText("メモ・rev・更新者（空白区切りで AND）")
+        self.user_edit = QLineEdit()
+        self.user_edit.setPlaceholderText("更新者で絞り込み")
+        inputs.addWidget(self.text_edit, 3)
+        inputs.addWidget(self.user_edit, 1)
+        layout.addLayout(inputs)
+
+        self.model = HistoryEntriesModel(
+            [
+                ("登録名", "folder_name"),
+                ("文書", "doc_key"),
+                ("rev", "display_rev"),
+                ("更新日時", "updated_at"),
+                ("更新者", "updated_by"),
+                ("メモ", "memo"),
+            ],
+            self,
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        configure_long_table(self.table)
+        header = self.table.horizontalHeader()
+        for column in range(5):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(5, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.doubleClicked.connect(self.on_double_clicked)
+        layout.addWidget(self.table, 1)
+
+        bottom = QHBoxLayout()
+        self.status = QLabel("")
+        btn_close = QPushButton("閉じる")
+        btn_close.clicked.connect(self.close)
+        bottom.addWidget(self.status, 1)
+        bottom.addWidget(btn_close)
+        layout.addLayout(bottom)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._timer.timeout.connect(self.run_search)
+        self.text_edit.textChanged.connect(self.schedule_search)
+        self.user_edit.textChanged.connect(self.schedule_search)
+        self.text_edit.returnPressed.connect(self.run_search)
+        self.user_edit.returnPressed.connect(self.run_search)
+
+    def schedule_search(self, _text: str = "") -> None:
+        self._timer.start()
+
+    def run_search(self) -> None:
+        self._timer.stop()
+        self.model.set_entries(self._search(self.text_edit.text(), self.user_edit.text()))
+        self.update_status()
+
+    def set_building(self, building: bool) -> None:
+        self._building = building
+        self.update_status()
+
+    def update_status(self) -> None:
+        count = self.model.rowCount()
+        if not (self.text_edit.text().strip() or self.user_edit.text().strip()):
+            text = ""
+        elif count >= MEMO_SEARCH_LIMIT:
+            text = f"新しい順に {count} 件を表示"
+        else:
+            text = f"{count} 件"
+        if self._building:
+            text = f"{text}（索引を作成中）" if text else "索引を作成中"
+        self.status.setText(text)
+
+    def on_double_clicked(self, index: QModelIndex) -> None:
+        entry = self.model.entry(index.row())
+        if entry is not None:
+            self.open_requested.emit(entry)
+
+
+class RecentChangesDialog(QDialog):
+    """
+    Revisions of every registered folder since a chosen point in time,
+    newest first, one page at a time. ``load_page(since, after)`` returns
+    history-row dicts and the cursor of the next page; ``count(since)``
+    returns the total.
+    """
+
+    open_requested = Signal(dict)
+
+    PERIODS = [("今日", 0), ("昨日から", 1), ("過去 7 日", 7), ("過去 30 日", 30), ("すべて", None)]
+
+    def __init__(
+        self,
+        load_page: Callable[[str, Optional[Tuple[str, int]]], Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]],
+        count: Callable[[str], int],
+        parent: QWidget | None = None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("最近の変更")
+        self.resize(960, 560)
+        self._load_page = load_page
+        self._count = count
+        # cursors of the pages before the shown one; the first page has none
+        self._cursors: List[Optional[Tuple[str, int]]] = []
+        self._cursor: Optional[Tuple[str, int]] = None
+        self._next: Optional[Tuple[str, int]] = None
+
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        self.period = QComboBox()
+        for label, _days in self.PERIODS:
+            self.period.addItem(label)
+        self.period.setCurrentIndex(1)
+        self.period.currentIndexChanged.connect(self.reload)
+        self.status = QLabel("")
+        top.addWidget(QLabel("期間"))
+        top.addWidget(self.period)
+        top.addWidget(self.status, 1)
+        layout.addLayout(top)
+
+        self.model = HistoryEntriesModel(
+            [
+                ("更新日時", "updated_at"),
+                ("登録名", "folder_name"),
+                ("文書", "doc_key"),
+                ("rev", "display_rev"),
+                ("更新者", "updated_by"),
+                ("メモ", "memo"),
+            ],
+            self,
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        configure_long_table(self.table)
+        header = self.table.horizontalHeader()
+        for column in range(5):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(5, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.doubleClicked.connect(self.on_double_clicked)
+        layout.addWidget(self.table, 1)
+
+        btn_row = QHBoxLayout()
+        self.btn_prev = QPushButton("前へ")
+        self.btn_next = QPushButton("次へ")
+        btn_close = QPushButton("閉じる")
+        btn_row.addWidget(self.btn_prev)
+        btn_row.addWidget(self.btn_next)
+        btn_row.addStretch(1)
+        btn_row.addWidget(btn_close)
+        layout.addLayout(btn_row)
+        self.btn_prev.clicked.connect(self.previous_page)
+        self.btn_next.clicked.connect(self.next_page)
+        btn_close.clicked.connect(self.close)
+
+    def since(self) -> str:
+        days = self.PERIODS[self.period.currentIndex()][1]
+        if days is None:
+            return ""
+        start = dt.datetime.combine(dt.date.today() - dt.timedelta(days=days), dt.time())
+        return start.isoformat(timespec="seconds")
+
+    def reload(self) -> None:
+        """Show the first page of the chosen period again."""
+        self._cursors = []
+        self._cursor = None
+        self.show_page()
+
+    def show_page(self) -> None:
+        since = self.since()
+        entries, self._next = self._load_page(since, self._cursor)
+        self.model.set_entries(entries)
+        first = len(self._cursors) * RECENT_CHANGES_PAGE_SIZE
+        total = self._count(since)
+        self.status.setText(f"{first + 1}〜{first + len(entries)} 件目 / 全 {total} 件" if entries else "変更はありません")
+        self.btn_prev.setEnabled(bool(self._cursors))
+        self.btn_next.setEnabled(self._next is not None)
+
+    def on_first_page(self) -> bool:
+        return not self._cursors
+
+    def next_page(self) -> None:
+        if self._next is None:
+            return
+        self._cursors.append(self._cursor)
+        self._cursor = self._next
+        self.show_page()
+
+    def previous_page(self) -> None:
+        if not self._cursors:
+            return
+        self._cursor = self._cursors.pop()
+        self.show_page()
+
+    def on_double_clicked(self, index: QModelIndex) -> None:
+        entry = self.model.entry(index.row())
+        if entry is not None:
+            self.open_requested.emit(entry)
+
+
+class UncheckedInboxDialog(QDialog):
+    """
+    Unchecked current documents of every registered folder. Ticked rows are
+    passed to ``check_off_requested`` in one list; a double-clicked row is
+    passed to ``open_requested``.
+    """
+
+    open_requested = Signal(dict)
+    check_off_requested = Signal(list)
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("未確認一覧")
+        self.resize(960, 560)
+
+        layout = QVBoxLayout(self)
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+
+        self.model = HistoryEntriesModel(
+            [
+                ("選択", "check"),
+                ("登録名", "folder_name"),
+                ("カテゴリ", "category"),
+                ("ファイル", "file"),
+                ("rev", "display_rev"),
+                ("更新日時", "updated_at"),
+                ("更新者", "updated_by"),
+            ],
+            self,
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        configure_long_table(self.table)
+        header = self.table.horizontalHeader()
+        for column in range(7):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.doubleClicked.connect(self.on_double_clicked)
+        layout.addWidget(self.table, 1)
+
+        btn_row = QHBoxLayout()
+        btn_all = QPushButton("すべて選択")
+        btn_none = QPushButton("選択解除")
+        self.btn_check_off = QPushButton("選択を確認済みにする")
+        btn_close = QPushButton("閉じる")
+        btn_row.addWidget(btn_all)
+        btn_row.addWidget(btn_none)
+        btn_row.addStretch(1)
+        btn_row.addWidget(self.btn_check_off)
+        btn_row.addWidget(btn_close)
+        layout.addLayout(btn_row)
+
+        btn_all.clicked.connect(lambda: self.model.set_checked([True] * self.model.rowCount()))
+        btn_none.clicked.connect(lambda: self.model.set_checked([False] * self.model.rowCount()))
+        self.btn_check_off.clicked.connect(self.on_check_off)
+        btn_close.clicked.connect(self.close)
+
+    @staticmethod
+    def entry_id(entry: Dict[str, Any]) -> Tuple[str, str, str]:
+        return entry["folder_path"], entry["doc_key"], entry["file"]
+
+    def set_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Show ``entries``, keeping the ticks of rows that are still listed."""
+        ticked = {self.entry_id(entry) for entry in self.model.checked_entries()}
+        self.model.set_entries(entries)
+        if ticked:
+            self.model.set_checked([self.entry_id(entry) in ticked for entry in entries])
+        self.status.setText(f"未確認 {len(entries)} 件")
+
+    def on_check_off(self) -> None:
+        entries = self.model.checked_entries()
+        if entries:
+            self.check_off_requested.emit(entries)
+
+    def on_double_clicked(self, index: QModelIndex) -> None:
+        entry = self.model.entry(index.row())
+        if entry is not None:
+            self.open_requested.emit(entry)
+
+
 class DropLineEdit(QLineEdit):
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
@@ -1429,55 +3482,213 @@ class ReplaceDialog(QDialog):
         self.file_btn = QPushButton("ファイル選択...")
         self.file_btn.clicked.connect(self.pick_file)
 
-        row = QHBoxLayout()
-        row.addWidget(self.file_edit, 1)
-        row.addWidget(self.file_btn)
-        layout.addLayout(row)
+        row = QHBoxLayout()
+        row.addWidget(self.file_edit, 1)
+        row.addWidget(self.file_btn)
+        layout.addLayout(row)
+
+        self.memo = QPlainTextEdit()
+        self.memo.setAcceptDrops(False)
+        self.memo.setPlaceholderText("作業メモ（空欄可） 例：外注成果品差し替え、図面反映 等")
+        layout.addWidget(self.memo, 1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.button(QDialogButtonBox.Ok).setText("差し替え実行")
+        buttons.button(QDialogButtonBox.Cancel).setText("キャンセル")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def dragEnterEvent(self, event):  # noqa: N802
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event):  # noqa: N802
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dropEvent(self, event):  # noqa: N802
+        urls = event.mimeData().urls()
+        if not urls:
+            event.ignore()
+            return
+        path = urls[0].toLocalFile()
+        if not path:
+            event.ignore()
+            return
+        self.file_edit.setText(path)
+        event.acceptProposedAction()
+
+    def pick_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "差し替えるファイルを選択")
+        if path:
+            self.file_edit.setText(path)
+
+    def get_values(self) -> Tuple[str, str]:
+        return self.file_edit.text().strip(), self.memo.toPlainText().strip()
+
+
+def match_incoming_files(current_files: Dict[str, str], paths: Iterable[str]) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Pair incoming files with documents by the document name without the
+    revision: ``current_files`` maps doc_key -> current file name. Returns
+    (doc_key -> incoming path, paths that matched no document).
+    """
+    doc_by_base = {
+        os.path.normcase(parse_rev_from_filename(filename)[0]): doc_key
+        for doc_key, filename in current_files.items()
+    }
+    matched: Dict[str, str] = {}
+    unmatched: List[str] = []
+    for path in paths:
+        doc_key = doc_by_base.get(os.path.normcase(parse_rev_from_filename(os.path.basename(path))[0]))
+        if doc_key is None:
+            unmatched.append(path)
+        else:
+            matched[doc_key] = path
+    return matched, unmatched
+
+
+class BatchRevisionDialog(QDialog):
+    """Update or replace the selected documents with one version bump and one memo."""
+
+    def __init__(
+        self,
+        docs: List[Tuple[str, Dict[str, Any]]],
+        version_rules: Optional[Dict[str, Any]] = None,
+        mode: str = "update",
+        parent: QWidget | None = None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("一括更新・差し替え")
+        self.setMinimumWidth(720)
+        self.setMinimumHeight(480)
+        self.setAcceptDrops(True)
+
+        self.docs = docs
+        self.version_rules = normalize_version_rules(version_rules)
+        self.incoming: Dict[str, str] = {}
+
+        layout = QVBoxLayout(self)
+
+        mode_row = QHBoxLayout()
+        self.radio_update = QRadioButton("更新")
+        self.radio_replace = QRadioButton("差し替え")
+        self.radio_replace.setChecked(mode == "replace")
+        self.radio_update.setChecked(mode != "replace")
+        mode_row.addWidget(self.radio_update)
+        mode_row.addWidget(self.radio_replace)
+        mode_row.addStretch(1)
+        self.file_btn = QPushButton("差し替えファイル選択...")
+        self.file_btn.clicked.connect(self.pick_files)
+        mode_row.addWidget(self.file_btn)
+        layout.addLayout(mode_row)
+
+        self.bump_group = QGroupBox("バージョンの選択")
+        bump_layout = QVBoxLayout(self.bump_group)
+        self.radio_major = QRadioButton(f"メジャーバージョン：{self.version_rules['major']}")
+        self.radio_minor = QRadioButton(f"マイナーバージョン：{self.version_rules['minor']}")
+        self.radio_patch = QRadioButton(f"パッチバージョン：{self.version_rules['patch']}")
+        self.radio_patch.setChecked(True)
+        bump_layout.addWidget(self.radio_major)
+        bump_layout.addWidget(self.radio_minor)
+        bump_layout.addWidget(self.radio_patch)
+        layout.addWidget(self.bump_group)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["ファイル", "現在", "更新後", "差し替えファイル"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table, 1)
 
         self.memo = QPlainTextEdit()
         self.memo.setAcceptDrops(False)
-        self.memo.setPlaceholderText("作業メモ（空欄可） 例：外注成果品差し替え、図面反映 等")
-        layout.addWidget(self.memo, 1)
+        self.memo.setPlaceholderText("作業メモ（空欄可、全ファイル共通）")
+        self.memo.setMaximumHeight(80)
+        layout.addWidget(self.memo)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        buttons.button(QDialogButtonBox.Ok).setText("差し替え実行")
+        buttons.button(QDialogButtonBox.Ok).setText("実行")
         buttons.button(QDialogButtonBox.Cancel).setText("キャンセル")
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
+        for radio in (self.radio_update, self.radio_replace, self.radio_major, self.radio_minor, self.radio_patch):
+            radio.toggled.connect(self.refresh_table)
+        self.refresh_table()
+
+    def selected_mode(self) -> str:
+        return "replace" if self.radio_replace.isChecked() else "update"
+
+    def selected_bump(self) -> str:
+        if self.radio_major.isChecked():
+            return "major"
+        if self.radio_minor.isChecked():
+            return "minor"
+        return "patch"
+
+    def memo_text(self) -> str:
+        return self.memo.toPlainText().strip()
+
+    def add_incoming(self, paths: List[str]) -> List[str]:
+        """Match ``paths`` to the documents; returns the ones no document matched."""
+        current_files = {doc_key: info.get("current_file", "") for doc_key, info in self.docs}
+        matched, unmatched = match_incoming_files(current_files, paths)
+        self.incoming.update(matched)
+        self.refresh_table()
+        return unmatched
+
+    def pick_files(self):
+        paths, _ = QFileDialog.getOpenFileNames(self, "差し替えるファイルを選択")
+        if paths:
+            self.report_unmatched(self.add_incoming(paths))
+
+    def report_unmatched(self, unmatched: List[str]) -> None:
+        if unmatched:
+            names = "\n".join(os.path.basename(path) for path in unmatched)
+            QMessageBox.warning(self, "注意", f"対応する文書が見つからないファイルがあります:\n{names}")
+
+    def refresh_table(self, *_args):
+        replace = self.selected_mode() == "replace"
+        self.file_btn.setEnabled(replace)
+        self.table.setColumnHidden(3, not replace)
+        bump = self.selected_bump()
+        self.table.setRowCount(len(self.docs))
+        for row, (doc_key, info) in enumerate(self.docs):
+            cur_rev = info.get("current_rev", "")
+            cur_version = parse_rev_numbers(cur_rev)
+            self.table.setItem(row, 0, QTableWidgetItem(info.get("current_file", "") or doc_key))
+            self.table.setItem(row, 1, QTableWidgetItem(format_version_numbers(*cur_version) if cur_version else "未設定"))
+            self.table.setItem(row, 2, QTableWidgetItem(format_version_numbers(*next_rev_with_bump(cur_rev, bump))))
+            incoming = self.incoming.get(doc_key, "")
+            self.table.setItem(row, 3, QTableWidgetItem(os.path.basename(incoming) if incoming else "未選択"))
+
     def dragEnterEvent(self, event):  # noqa: N802
-        if event.mimeData().hasUrls():
+        if event.mimeData().hasUrls() and self.selected_mode() == "replace":
             event.acceptProposedAction()
         else:
             event.ignore()
 
     def dragMoveEvent(self, event):  # noqa: N802
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
-        else:
-            event.ignore()
+        self.dragEnterEvent(event)
 
     def dropEvent(self, event):  # noqa: N802
-        urls = event.mimeData().urls()
-        if not urls:
-            event.ignore()
-            return
-        path = urls[0].toLocalFile()
-        if not path:
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.toLocalFile()]
+        if not paths or self.selected_mode() != "replace":
             event.ignore()
             return
-        self.file_edit.setText(path)
+        self.report_unmatched(self.add_incoming(paths))
         event.acceptProposedAction()
 
-    def pick_file(self):
-        path, _ = QFileDialog.getOpenFileName(self, "差し替えるファイルを選択")
-        if path:
-            self.file_edit.setText(path)
-
-    def get_values(self) -> Tuple[str, str]:
-        return self.file_edit.text().strip(), self.memo.toPlainText().strip()
-
 
 class OptionsDialog(QDialog):
     def __init__(
@@ -1485,6 +3696,7 @@ class OptionsDialog(QDialog):
         timeout_min: int,
         ignore_types: Optional[Dict[str, Any]] = None,
         version_rules: Optional[Dict[str, Any]] = None,
+        history_dedup: bool = False,
         parent: QWidget | None = None,
     ):
         super().__init__(parent)
@@ -1533,6 +3745,15 @@ class OptionsDialog(QDialog):
         ignore_layout.addWidget(self.ignore_ini)
         layout.addWidget(ignore_group)
 
+        self.history_dedup = QCheckBox("_History の同一内容ファイルを共有する（ハードリンク）")
+        self.history_dedup.setChecked(history_dedup)
+        self.history_dedup.setToolTip(
+            "同じ内容の履歴ファイルを _History/.store の 1 つの実体へのハードリンクにします。\n"
+            "OneDrive / SharePoint の同期フォルダではハードリンクが別ファイルとして扱われ、\n"
+            "クラウド側の使用量がかえって増えるため、ローカルや共有サーバー上のフォルダでのみ有効にしてください。"
+        )
+        layout.addWidget(self.history_dedup)
+
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.button(QDialogButtonBox.Ok).setText("保存")
         buttons.button(QDialogButtonBox.Cancel).setText("キャンセル")
@@ -1560,6 +3781,108 @@ class OptionsDialog(QDialog):
             "patch": self.rule_patch.text(),
         })
 
+    def get_history_dedup(self) -> bool:
+        return self.history_dedup.isChecked()
+
+
+class HistoryStoreReportDialog(QDialog):
+    """Per-folder size of ``_History`` and what the shared store saves (or would save)."""
+
+    def __init__(self, rows: List[Tuple[str, Any]], applied: bool, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("履歴の容量")
+        self.setMinimumWidth(640)
+        self.setMinimumHeight(360)
+
+        layout = QVBoxLayout(self)
+        if applied:
+            layout.addWidget(QLabel("同一内容の履歴ファイルを共有しました。"))
+        else:
+            layout.addWidget(QLabel("同一内容の履歴ファイルを共有した場合の見込みです（オプションで有効にすると適用されます）。"))
+
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["フォルダ", "履歴ファイル", "履歴サイズ", "実使用量", "削減量"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, 5):
+            self.table.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table, 1)
+
+        saved_total = 0
+        for name, report in rows:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            if not isinstance(report, StoreReport):
+                status = "中止" if isinstance(report, OperationCancelled) else f"エラー: {report}"
+                self.table.setItem(row, 1, QTableWidgetItem(status))
+                continue
+            saved_total += report.saved_bytes
+            saved_text = format_byte_size(report.saved_bytes)
+            if not report.supported:
+                saved_text += "（ハードリンク非対応）"
+            self.table.setItem(row, 1, QTableWidgetItem(str(report.files)))
+            self.table.setItem(row, 2, QTableWidgetItem(format_byte_size(report.total_bytes)))
+            self.table.setItem(row, 3, QTableWidgetItem(format_byte_size(report.stored_bytes)))
+            self.table.setItem(row, 4, QTableWidgetItem(saved_text))
+        layout.addWidget(QLabel(f"削減量の合計: {format_byte_size(saved_total)}"))
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.button(QDialogButtonBox.Close).setText("閉じる")
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+
+class FileOperationPanel(QWidget):
+    """Status-bar panel for ``FileOperationQueue``: the running operation's progress, throughput and cancel."""
+
+    def __init__(self, queue: FileOperationQueue, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.queue = queue
+        self.current: Optional[FileOperation] = None
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel("")
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 1000)
+        self.progress.setFixedWidth(160)
+        self.progress.setTextVisible(False)
+        self.btn_cancel = QPushButton("中止")
+        self.btn_cancel.clicked.connect(self.on_cancel)
+        layout.addWidget(self.label)
+        layout.addWidget(self.progress)
+        layout.addWidget(self.btn_cancel)
+        queue.changed.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self) -> None:
+        ops = self.queue.operations()
+        if not ops:
+            self.current = None
+            self.hide()
+            return
+        op = ops[0]
+        self.current = op
+        text = op.label
+        if op.state == "running":
+            text += f"  {format_byte_size(op.done_bytes)} / {format_byte_size(op.total_bytes)}"
+            text += f"  {format_byte_size(op.throughput())}/s"
+        else:
+            text += "  待機中"
+        if len(ops) > 1:
+            text += f"（ほか {len(ops) - 1} 件）"
+        self.label.setText(text)
+        self.setToolTip("\n".join(o.label for o in ops))
+        self.progress.setValue(int(op.fraction() * 1000))
+        self.btn_cancel.setEnabled(op.can_cancel())
+        self.show()
+
+    def on_cancel(self) -> None:
+        if self.current is not None:
+            self.queue.cancel(self.current)
+            self.refresh()
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -1574,14 +3897,24 @@ class MainWindow(QMainWindow):
         self.settings = load_settings()
         self.user_checks = load_user_checks()
         self._settings_save_pending = False
+        self._settings_batch_depth = 0
         self._user_checks_save_pending = False
-        self._folder_table_refresh_pending = False
-        self._folder_table_refresh_force_scan = True
         self.folder_unchecked_cache: Dict[str, bool] = {}
+        # fed by scans and check toggles; folder_unchecked_cache mirrors it per folder
+        # and the tally sums its counts up the category tree
+        self.unchecked_tally = CategoryTally()
+        self.unchecked_inbox = UncheckedInbox(self.on_unchecked_changed)
+        self.inbox_dialog: Optional[UncheckedInboxDialog] = None
+        self._inbox_timer = QTimer(self)
+        self._inbox_timer.setSingleShot(True)
+        self._inbox_timer.setInterval(INBOX_REFRESH_DELAY_MS)
+        self._inbox_timer.timeout.connect(self.refresh_inbox_dialog)
         self.folder_latest_date_cache: Dict[str, str] = {}
+        self.folder_missing_cache: Dict[str, bool] = {}
         self.memo_timeout_min = int(self.settings.get("memo_timeout_min", DEFAULT_MEMO_TIMEOUT_MIN))
         self.ignore_types = normalize_ignore_types(self.settings.get("ignore_types"))
         self.version_rules = normalize_version_rules(self.settings.get("version_rules"))
+        self.history_dedup = bool(self.settings.get("history_dedup", False))
 
         print(f"[Libra] version={APP_VERSION}")
         print(f"[Libra] appdata_root={appdata_root()}")
@@ -1608,12 +3941,44 @@ class MainWindow(QMainWindow):
         act_report = QAction("不具合報告情報をコピー", self)
         act_report.triggered.connect(self.on_copy_bug_report)
         toolbar.addAction(act_report)
+        act_memo_search = QAction("メモ検索", self)
+        act_memo_search.triggered.connect(self.on_memo_search)
+        toolbar.addAction(act_memo_search)
+        act_inbox = QAction("未確認一覧", self)
+        act_inbox.triggered.connect(self.on_unchecked_inbox)
+        toolbar.addAction(act_inbox)
+        act_recent = QAction("最近の変更", self)
+        act_recent.triggered.connect(self.on_recent_changes)
+        toolbar.addAction(act_recent)
+        act_history_store = QAction("履歴の容量", self)
+        act_history_store.triggered.connect(self.on_history_store_report)
+        toolbar.addAction(act_history_store)
 
         # Top controls
         top = QHBoxLayout()
         self.search = QLineEdit()
-        self.search.setPlaceholderText("検索（登録名でフィルタ）")
-        self.search.textChanged.connect(lambda _text: self.refresh_folder_table())
+        self.search.setPlaceholderText("検索（登録名・カテゴリ・文書名）")
+        self.search.textChanged.connect(self.apply_folder_filter)
+        self.search.textChanged.connect(self.schedule_global_search)
+        self.search.returnPressed.connect(self.on_search_return_pressed)
+        self.search_index = SearchIndex()
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.run_global_search)
+        # indexes reported documents in small steps once the startup scan is done
+        self._search_warm_timer = QTimer(self)
+        self._search_warm_timer.setSingleShot(True)
+        self._search_warm_timer.setInterval(0)
+        self._search_warm_timer.timeout.connect(self.warm_search_index)
+        self.search_results_model = SearchResultsModel(self)
+        self.search_results = QListView()
+        self.search_results.setModel(self.search_results_model)
+        self.search_results.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.search_results.setMaximumHeight(180)
+        self.search_results.setVisible(False)
+        self.search_results.activated.connect(self.on_search_result_activated)
+        self.search_results.clicked.connect(self.on_search_result_activated)
 
         btn_rescan = QPushButton("再スキャン")
         btn_rescan.clicked.connect(self.on_rescan)
@@ -1622,6 +3987,7 @@ class MainWindow(QMainWindow):
         top.addWidget(btn_rescan)
 
         root_layout.addLayout(top)
+        root_layout.addWidget(self.search_results)
 
         splitter = QSplitter(Qt.Horizontal)
         root_layout.addWidget(splitter, 1)
@@ -1644,7 +4010,10 @@ class MainWindow(QMainWindow):
         tree_button_row.addWidget(btn_batch_register)
         tree_button_row.addStretch(1)
 
-        self.category_tree = CategoryTreeWidget()
+        self._category_tree_source: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+        self.category_model = CategoryTreeModel(self.category_tree_rows, self)
+        self.category_tree = CategoryTreeView()
+        self.category_tree.setModel(self.category_model)
         self.category_tree.setHeaderHidden(True)
         self.category_tree.setDragEnabled(True)
         self.category_tree.setAcceptDrops(True)
@@ -1652,9 +4021,9 @@ class MainWindow(QMainWindow):
         self.category_tree.setDragDropMode(QAbstractItemView.InternalMove)
         self.category_tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.category_tree.order_changed.connect(self.on_category_tree_order_changed)
-        self.category_tree.itemSelectionChanged.connect(self.on_category_tree_selected)
-        self.category_tree.itemDoubleClicked.connect(self.on_category_tree_double_clicked)
-        self.category_tree.itemChanged.connect(self.on_category_tree_item_changed)
+        self.category_tree.selectionModel().selectionChanged.connect(self.on_category_tree_selected)
+        self.category_tree.doubleClicked.connect(self.on_category_tree_double_clicked)
+        self.category_model.check_toggled.connect(self.on_category_tree_check_toggled)
         self.category_tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.category_tree.customContextMenuRequested.connect(self.on_category_tree_context_menu)
         tree_layout.addWidget(tree_title)
@@ -1680,14 +4049,19 @@ class MainWindow(QMainWindow):
         folders_button_row.addWidget(btn_export_folder)
         folders_button_row.addStretch(1)
 
-        self.folders_table = QTableWidget(0, 2)
-        self.folders_table.setHorizontalHeaderLabels(["登録名", "最終更新日"])
+        self.folder_model = FolderListModel(self)
+        self.folder_model.set_colors(self.new_folder_bg_color(), self.missing_folder_bg_color())
+        self.folder_proxy = FolderFilterProxyModel(self)
+        self.folder_proxy.setSourceModel(self.folder_model)
+        self.folders_table = QTableView()
+        self.folders_table.setModel(self.folder_proxy)
+        self.folders_table.verticalHeader().setVisible(False)
         self.folders_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.folders_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.folders_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.folders_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.folders_table.itemSelectionChanged.connect(self.on_folder_selected)
-        self.folders_table.itemDoubleClicked.connect(self.on_folder_double_clicked)
+        self.folders_table.selectionModel().selectionChanged.connect(self.on_folder_selected)
+        self.folders_table.doubleClicked.connect(self.on_folder_double_clicked)
         self.folders_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.folders_table.customContextMenuRequested.connect(self.on_folders_table_context_menu)
 
@@ -1722,12 +4096,12 @@ class MainWindow(QMainWindow):
         files_button_row.addWidget(btn_view)
         files_button_row.addStretch(1)
 
-        self.files_table = FileDropTable(0, 6)
-        self.files_table.setHorizontalHeaderLabels(["", "ファイル", "rev", "更新日", "更新者", "DocKey"])
-        files_header_item = QTableWidgetItem("")
-        files_header_item.setFlags(files_header_item.flags() | Qt.ItemIsUserCheckable)
-        files_header_item.setCheckState(Qt.Unchecked)
-        self.files_table.setHorizontalHeaderItem(0, files_header_item)
+        self.files_model = FilesTableModel(self)
+        self.files_model.check_changed.connect(self.on_file_check_changed)
+        self._files_sort: Optional[Tuple[int, Qt.SortOrder]] = None
+        self.files_table = FileDropTable()
+        self.files_table.setModel(self.files_model)
+        configure_long_table(self.files_table)
         self.files_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.files_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.files_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
@@ -1737,9 +4111,8 @@ class MainWindow(QMainWindow):
         self.files_table.horizontalHeader().sectionClicked.connect(self.on_files_header_clicked)
         self.files_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.files_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.files_table.itemSelectionChanged.connect(self.on_file_selected)
-        self.files_table.itemDoubleClicked.connect(self.on_file_double_clicked)
-        self.files_table.itemChanged.connect(self.on_file_check_changed)
+        self.files_table.selectionModel().selectionChanged.connect(self.on_file_selected)
+        self.files_table.doubleClicked.connect(self.on_file_double_clicked)
         self.files_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.files_table.customContextMenuRequested.connect(self.on_files_table_context_menu)
         self.files_table.files_dropped.connect(self.on_files_dropped)
@@ -1748,8 +4121,19 @@ class MainWindow(QMainWindow):
         hist_layout = QVBoxLayout(hist_group)
         hist_layout.setContentsMargins(0, 0, 0, 0)
         hist_title = QLabel("履歴")
-        self.hist_table = QTableWidget(0, 5)
-        self.hist_table.setHorizontalHeaderLabels(["区分", "rev", "更新日時", "更新者", "メモ"])
+        self.hist_model = HistoryEntriesModel(
+            [
+                ("区分", "kind"),
+                ("rev", "display_rev"),
+                ("更新日時", "updated_at"),
+                ("更新者", "updated_by"),
+                ("メモ", "memo"),
+            ],
+            self,
+        )
+        self.hist_table = QTableView()
+        self.hist_table.setModel(self.hist_model)
+        configure_long_table(self.hist_table)
         self.hist_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.hist_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.hist_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
@@ -1757,7 +4141,7 @@ class MainWindow(QMainWindow):
         self.hist_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
         self.hist_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.hist_table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.hist_table.itemDoubleClicked.connect(self.on_history_item_double_clicked)
+        self.hist_table.doubleClicked.connect(self.on_history_item_double_clicked)
         hist_layout.addWidget(hist_title)
         hist_layout.addWidget(self.hist_table)
 
@@ -1780,13 +4164,63 @@ class MainWindow(QMainWindow):
         self.watch_timer = None
         self.watch_states: Dict[str, MemoWatchState] = {}
         self.current_user = user_name()
-        self._category_tree_refreshing = False
-        self._category_tree_refresh_pending = False
+        self.refresh_scheduler = RefreshScheduler(self.apply_refresh, self)
         self.new_folder_highlights: set[str] = set()
         self.new_category_highlights: set[str] = set()
-
+        self.scanned_subfolder_counts: Dict[str, int] = {}
+        self.scan_pool = BackgroundTaskPool(parent=self)
+        self.scan_pool.task_finished.connect(self.on_background_task_finished)
+        self.scan_pool.idle.connect(self.on_background_scan_idle)
+        self.folder_watcher = FolderWatcher(self)
+        self.folder_watcher.folder_changed.connect(self.on_watched_folder_changed)
+        self._watched_registered_keys: set[str] = set()
+        self._watch_signature: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+        self._watch_pending: set[str] = set()
+        # folder key -> path of folders that changed while their scan was queued or running
+        self._watch_rescan: Dict[str, str] = {}
+        # folder key -> path of rebuilds postponed until its file operations finish
+        self._rescan_after_file_ops: Dict[str, str] = {}
+        self._progressive_refresh_timer = QTimer(self)
+        self._progressive_refresh_timer.setSingleShot(True)
+        self._progressive_refresh_timer.setInterval(PROGRESSIVE_REFRESH_INTERVAL_MS)
+        self._progressive_refresh_timer.timeout.connect(self.apply_progressive_refresh)
+        self._startup_scan_active = False
+        # repaired before the scan index is read, so no stale entry is shown for those folders
+        self.journal = OperationJournal(JOURNAL_DIR)
+        self.recover_journal()
+        self.scan_index = ScanIndex(SCAN_INDEX_PATH)
+        self.scan_index.open()
+        self._scan_index_pending: Dict[str, IndexEntry] = {}
+        self._scan_index_timer = QTimer(self)
+        self._scan_index_timer.setSingleShot(True)
+        self._scan_index_timer.setInterval(SCAN_INDEX_FLUSH_INTERVAL_MS)
+        self._scan_index_timer.timeout.connect(self.flush_scan_index)
+        self._indexed_folders = self.scan_index.load_all()
+        # one worker keeps memo indexing off the scan pool and its writes ordered
+        self.memo_index = MemoIndex(MEMO_INDEX_PATH)
+        self.memo_index.open()
+        self.memo_pool = BackgroundTaskPool(max_workers=1, parent=self)
+        self.memo_pool.task_finished.connect(self.on_memo_index_finished)
+        self.memo_pool.idle.connect(self.on_memo_index_idle)
+        self._memo_reindex: Dict[str, str] = {}
+        self.memo_search_dialog: Optional[MemoSearchDialog] = None
+        self.recent_changes_dialog: Optional[RecentChangesDialog] = None
+        self._recent_changes_timer = QTimer(self)
+        self._recent_changes_timer.setSingleShot(True)
+        self._recent_changes_timer.setInterval(INBOX_REFRESH_DELAY_MS)
+        self._recent_changes_timer.timeout.connect(self.reload_recent_changes)
+        # copies and moves of update/replace/rollback run here, serialized per folder
+        self.file_ops = FileOperationQueue(parent=self)
+        self.file_ops.finished.connect(self.on_file_operation_finished)
+        self.file_ops_panel = FileOperationPanel(self.file_ops, self)
+        self.statusBar().addPermanentWidget(self.file_ops_panel)
+        for key, entry in self._indexed_folders.items():
+            self.apply_index_entry(key, entry)
+
+        # queue the startup scan first so visible rows attach to its jobs
+        # instead of queueing cancellable duplicates
         self.startup_rescan()
-        self.refresh_folder_table()
+        self.refresh_folder_table(force_scan=False)
         self.refresh_category_tree()
 
     # ---------- UI helpers ----------
@@ -1800,8 +4234,15 @@ class MainWindow(QMainWindow):
         return QMessageBox.question(self, "確認", msg, QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes
 
     def selected_folder_index(self) -> int:
+        """Source-model row of the first selected folder-list row, or -1."""
         sel = self.folders_table.selectionModel().selectedRows()
-        return sel[0].row() if sel else -1
+        return self.folder_proxy.mapToSource(sel[0]).row() if sel else -1
+
+    def folder_row_data(self, row: int) -> Any:
+        """``Qt.UserRole`` payload of a source row: a folder path or a category dict."""
+        if row < 0:
+            return None
+        return self.folder_model.index(row, 0).data(Qt.UserRole)
 
     def selected_file_index(self) -> int:
         sel = self.files_table.selectionModel().selectedRows()
@@ -1850,7 +4291,7 @@ class MainWindow(QMainWindow):
 
     def save_archived_categories(self, archived: List[List[str]]) -> None:
         self.settings["archived_categories"] = archived
-        save_settings(self.settings)
+        self.schedule_settings_save()
 
     def is_archived_path(self, categories: List[str]) -> bool:
         if not categories:
@@ -1986,7 +4427,7 @@ class MainWindow(QMainWindow):
         else:
             paths.pop(key, None)
         self.settings["category_folder_paths"] = paths
-        save_settings(self.settings)
+        self.schedule_settings_save()
 
     def replace_category_prefix(self, path: List[str], old_prefix: List[str], new_prefix: List[str]) -> List[str]:
         if path[:len(old_prefix)] != old_prefix:
@@ -2044,7 +4485,7 @@ class MainWindow(QMainWindow):
             for path in self.archived_categories()
         ]
         self.save_archived_categories(archived)
-        save_settings(self.settings)
+        self.schedule_settings_save()
 
     def category_check_states(self) -> Dict[str, bool]:
         checks = self.settings.get("category_check_states")
@@ -2072,12 +4513,14 @@ class MainWindow(QMainWindow):
         checks = self.category_check_states()
         checks[self.category_path_key(path)] = checked
         self.settings["category_check_states"] = checks
+        self.unchecked_tally.set_category_enabled(path, checked)
         self.schedule_settings_save()
 
     def set_folder_tree_checked(self, folder_path: str, checked: bool) -> None:
         checks = self.folder_tree_check_states()
         checks[self.folder_key(folder_path)] = checked
         self.settings["folder_tree_check_states"] = checks
+        self.unchecked_tally.set_folder_enabled(self.folder_key(folder_path), checked)
         self.schedule_settings_save()
 
     def is_category_highlight_enabled_for_path(self, path: List[str]) -> bool:
@@ -2125,22 +4568,10 @@ class MainWindow(QMainWindow):
         return ordered
 
     def folder_key(self, folder_path: str) -> str:
-        return os.path.normcase(os.path.abspath(folder_path))
+        return normalize_folder_key(folder_path)
 
     def count_immediate_subfolders(self, folder_path: str) -> int:
-        if not os.path.isdir(folder_path):
-            return 0
-        try:
-            count = 0
-            for name in os.listdir(folder_path):
-                if name.lower() in {"_history", LEGACY_META_DIR.lower()}:
-                    continue
-                full = os.path.join(folder_path, name)
-                if os.path.isdir(full):
-                    count += 1
-            return count
-        except Exception:
-            return 0
+        return count_scan_subfolders(scan_directory(folder_path))
 
     def folder_subfolder_counts(self) -> Dict[str, int]:
         data = self.settings.get("folder_subfolder_counts", {})
@@ -2154,7 +4585,7 @@ class MainWindow(QMainWindow):
 
     def save_folder_subfolder_counts(self, counts: Dict[str, int]) -> None:
         self.settings["folder_subfolder_counts"] = counts
-        save_settings(self.settings)
+        self.schedule_settings_save()
 
     def folder_subfolder_count_for_path(self, folder_path: str) -> Optional[int]:
         if not folder_path:
@@ -2188,7 +4619,7 @@ class MainWindow(QMainWindow):
         counts = self.folder_subfolder_counts()
         counts = {k: v for k, v in counts.items() if k not in keys}
         self.settings["folder_subfolder_counts"] = counts
-        save_settings(self.settings)
+        self.schedule_settings_save()
 
     def remove_category_settings_under_path(self, path: List[str]) -> List[str]:
         target_key = self.category_path_key(path)
@@ -2209,7 +4640,7 @@ class MainWindow(QMainWindow):
             if key != target_key and not (prefix and key.startswith(prefix))
         }
         self.settings["category_check_states"] = remaining_checks
-        save_settings(self.settings)
+        self.schedule_settings_save()
         return removed_paths
 
     def clear_unused_cache(self) -> Tuple[int, int]:
@@ -2257,7 +4688,7 @@ class MainWindow(QMainWindow):
         settings_removed += len(category_folder_paths) - len(filtered_category_folder_paths)
         self.settings["category_folder_paths"] = filtered_category_folder_paths
 
-        save_settings(self.settings)
+        self.schedule_settings_save()
 
         user_checks_removed = 0
         folder_checks = self.user_checks
@@ -2294,10 +4725,16 @@ class MainWindow(QMainWindow):
             if isinstance(folder_path, str) and folder_path:
                 targets.add(folder_path)
         for root_path in targets:
-            if not root_path or not os.path.isdir(root_path):
+            if not root_path:
                 continue
             root_key = self.folder_key(root_path)
-            current_count = self.count_immediate_subfolders(root_path)
+            if root_key in self.scanned_subfolder_counts:
+                current_count = self.scanned_subfolder_counts[root_key]
+            else:
+                scan = scan_directory(root_path)
+                if not scan.exists:
+                    continue
+                current_count = count_scan_subfolders(scan)
             if root_key not in counts:
                 counts[root_key] = current_count
                 updated_counts = True
@@ -2311,6 +4748,29 @@ class MainWindow(QMainWindow):
 
     def update_new_folder_highlights(self) -> None:
         self.new_folder_highlights = self.detect_new_subfolders()
+        self.update_new_category_highlights()
+
+    def update_new_folder_highlight(self, folder_path: str, current_count: int) -> bool:
+        """Re-evaluate the new-subfolder highlight of one folder; True when it changed."""
+        key = self.folder_key(folder_path)
+        counts = self.folder_subfolder_counts()
+        was_new = key in self.new_folder_highlights
+        if key not in counts:
+            counts[key] = current_count
+            self.save_folder_subfolder_counts(counts)
+            is_new = False
+        else:
+            is_new = current_count > counts[key]
+        if is_new == was_new:
+            return False
+        if is_new:
+            self.new_folder_highlights.add(key)
+        else:
+            self.new_folder_highlights.discard(key)
+        self.update_new_category_highlights()
+        return True
+
+    def update_new_category_highlights(self) -> None:
         self.new_category_highlights = set()
         category_paths_by_folder: Dict[str, set[str]] = {}
         for path, folder_path in self.category_folder_paths().items():
@@ -2357,16 +4817,17 @@ class MainWindow(QMainWindow):
             folder_checks = {}
         folder_checks[doc_key] = checked
         self.user_checks[folder_key] = folder_checks
+        self.unchecked_inbox.set_checked(folder_key, doc_key, checked)
         self.schedule_user_checks_save()
 
     def mark_doc_checked(self, folder_path: str, doc_key: str) -> None:
         self.set_doc_checked(folder_path, doc_key, True)
 
     def mark_all_docs_checked(self, folder_path: str) -> None:
-        if not os.path.isdir(folder_path):
+        snapshot = scan_folder_cached(folder_path, self.ignore_types)
+        if not snapshot.exists:
             return
-        meta, _rows = scan_folder(folder_path, self.ignore_types)
-        docs = meta.get("documents", {})
+        docs = snapshot.meta.get("documents", {})
         if not isinstance(docs, dict) or not docs:
             return
         folder_key = self.folder_key(folder_path)
@@ -2377,6 +4838,7 @@ class MainWindow(QMainWindow):
         for doc_key in docs.keys():
             if folder_checks.get(doc_key) is not True:
                 folder_checks[doc_key] = True
+                self.unchecked_inbox.set_checked(folder_key, doc_key, True)
                 updated = True
         if updated:
             self.user_checks[folder_key] = folder_checks
@@ -2384,32 +4846,12 @@ class MainWindow(QMainWindow):
             self.folder_unchecked_cache[self.folder_key(folder_path)] = False
 
     def folder_has_unchecked(self, folder_path: str) -> bool:
-        if not os.path.isdir(folder_path):
-            return False
-        meta, _rows = scan_folder(folder_path, self.ignore_types)
-        docs = meta.get("documents", {})
-        if not isinstance(docs, dict):
-            return False
-        for doc_key, info in docs.items():
-            if not isinstance(info, dict):
-                continue
-            if not info.get("current_file"):
-                continue
-            if not self.doc_is_checked(folder_path, doc_key, info):
-                return True
-        return False
-
-    def set_item_unchecked_style(self, item: QTableWidgetItem, unchecked: bool) -> None:
-        if unchecked:
-            item.setForeground(QBrush(UNCHECKED_COLOR))
-        else:
-            item.setForeground(QBrush())
-
-    def set_item_new_folder_style(self, item: QTableWidgetItem, has_new: bool) -> None:
-        if has_new:
-            item.setBackground(QBrush(self.new_folder_bg_color()))
-        else:
-            item.setBackground(QBrush())
+        """Unchecked documents in ``folder_path``; scans only a folder no scan has reported yet."""
+        key = self.folder_key(folder_path)
+        if key not in self.folder_unchecked_cache:
+            snapshot = scan_folder_cached(folder_path, self.ignore_types)
+            self.update_folder_unchecked_cache_for_folder(folder_path, snapshot.meta)
+        return self.unchecked_inbox.has_unchecked(key)
 
     def set_item_missing_folder_style(self, item: QTableWidgetItem, missing: bool) -> None:
         if missing:
@@ -2598,43 +5040,44 @@ class MainWindow(QMainWindow):
                 return False
         target_paths = {item["path"] for item in targets}
         self.registry = [item for item in self.registry if item["path"] not in target_paths]
-        if target_paths:
-            self.remove_folder_settings_for_paths(list(target_paths))
-            self.remove_user_checks_for_paths(target_paths)
-        self.remove_archived_under_path(path)
-        removed_category_paths = self.remove_category_settings_under_path(path)
-        self.remove_folder_settings_for_paths(removed_category_paths)
-        order = self.category_order()
-        target_key = self.category_path_key(path)
-        parent_key = self.category_path_key(path[:-1])
-        if path and parent_key in order.get("categories", {}):
-            order["categories"][parent_key] = [
-                name for name in order["categories"][parent_key]
-                if name != path[-1]
-            ]
-            if not order["categories"][parent_key]:
-                order["categories"].pop(parent_key, None)
-        if path and parent_key in order.get("tree", {}):
-            order["tree"][parent_key] = [
-                entry for entry in order["tree"][parent_key]
-                if isinstance(entry, dict)
-                and not (entry.get("type") == "category" and entry.get("name") == path[-1])
-            ]
-            if not order["tree"][parent_key]:
-                order["tree"].pop(parent_key, None)
-        prefix = f"{target_key}{CATEGORY_PATH_SEP}" if target_key else ""
-        for key in list(order.get("categories", {}).keys()):
-            if key == target_key or (prefix and key.startswith(prefix)):
-                order["categories"].pop(key, None)
-        for key in list(order.get("tree", {}).keys()):
-            if key == target_key or (prefix and key.startswith(prefix)):
-                order["tree"].pop(key, None)
-        for key in list(order.get("folder", {}).keys()):
-            if key == target_key or (prefix and key.startswith(prefix)):
-                order["folder"].pop(key, None)
-        self.settings["category_order"] = order
-        save_registry(self.registry)
-        save_settings(self.settings)
+        with self.settings_batch():
+            if target_paths:
+                self.remove_folder_settings_for_paths(list(target_paths))
+                self.remove_user_checks_for_paths(target_paths)
+            self.remove_archived_under_path(path)
+            removed_category_paths = self.remove_category_settings_under_path(path)
+            self.remove_folder_settings_for_paths(removed_category_paths)
+            order = self.category_order()
+            target_key = self.category_path_key(path)
+            parent_key = self.category_path_key(path[:-1])
+            if path and parent_key in order.get("categories", {}):
+                order["categories"][parent_key] = [
+                    name for name in order["categories"][parent_key]
+                    if name != path[-1]
+                ]
+                if not order["categories"][parent_key]:
+                    order["categories"].pop(parent_key, None)
+            if path and parent_key in order.get("tree", {}):
+                order["tree"][parent_key] = [
+                    entry for entry in order["tree"][parent_key]
+                    if isinstance(entry, dict)
+                    and not (entry.get("type") == "category" and entry.get("name") == path[-1])
+                ]
+                if not order["tree"][parent_key]:
+                    order["tree"].pop(parent_key, None)
+            prefix = f"{target_key}{CATEGORY_PATH_SEP}" if target_key else ""
+            for key in list(order.get("categories", {}).keys()):
+                if key == target_key or (prefix and key.startswith(prefix)):
+                    order["categories"].pop(key, None)
+            for key in list(order.get("tree", {}).keys()):
+                if key == target_key or (prefix and key.startswith(prefix)):
+                    order["tree"].pop(key, None)
+            for key in list(order.get("folder", {}).keys()):
+                if key == target_key or (prefix and key.startswith(prefix)):
+                    order["folder"].pop(key, None)
+            self.settings["category_order"] = order
+            save_registry(self.registry)
+            self.schedule_settings_save()
         if self.current_folder and self.current_folder["path"] in target_paths:
             self.current_folder = None
             self.current_meta = None
@@ -2704,48 +5147,60 @@ class MainWindow(QMainWindow):
                     node["children"].setdefault(name, {"children": {}, "folders": []})
         return root
 
-    def capture_expanded_category_paths(self) -> Optional[set[str]]:
-        if self.category_tree.topLevelItemCount() == 0:
-            return None
-
-        expanded: set[str] = set()
-
-        def walk(item: QTreeWidgetItem):
-            data = item.data(0, Qt.UserRole) or {}
-            if data.get("type") == "category":
-                path = data.get("path", [])
-                if isinstance(path, list) and item.isExpanded():
-                    expanded.add(self.category_path_key(path))
-            for i in range(item.childCount()):
-                walk(item.child(i))
-
-        for i in range(self.category_tree.topLevelItemCount()):
-            walk(self.category_tree.topLevelItem(i))
-        return expanded
+    def find_category_tree_item(self, path: List[str]) -> QModelIndex:
+        return self.category_model.category_index(path)
 
-    def find_category_tree_item(self, path: List[str]) -> Optional[QTreeWidgetItem]:
-        def walk(item: QTreeWidgetItem) -> Optional[QTreeWidgetItem]:
-            data = item.data(0, Qt.UserRole) or {}
-            if data.get("type") == "category" and data.get("path") == path:
-                return item
-            for i in range(item.childCount()):
-                found = walk(item.child(i))
-                if found:
-                    return found
-            return None
+    def ordered_category_entries(
+        self,
+        node: Dict[str, Any],
+        path: List[str],
+        order: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Children of ``node`` in display order: saved tree order, then categories, then folders."""
+        key = self.category_path_key(path)
+        child_names = self.ordered_list(
+            list(node["children"].keys()),
+            order.get("categories", {}).get(key, []),
+        )
+        folder_order = order.get("folder", {}).get(key, [])
+        folder_mapping = {folder["path"]: folder for folder in node["folders"]}
+        remaining_folders = self.folders_sorted_for_category(node["folders"], folder_order)
+        tree_order = order.get("tree", {}).get(key, [])
+        ordered_entries: List[Dict[str, Any]] = []
+        added_categories: set[str] = set()
+        added_folders: set[str] = set()
+        if isinstance(tree_order, list):
+            for entry in tree_order:
+                if not isinstance(entry, dict):
+                    continue
+                entry_type = entry.get("type")
+                if entry_type == "category":
+                    name = entry.get("name")
+                    if isinstance(name, str) and name in node["children"] and name not in added_categories:
+                        ordered_entries.append({"type": "category", "name": name})
+                        added_categories.add(name)
+                elif entry_type == "folder":
+                    folder_path = entry.get("path")
+                    if isinstance(folder_path, str) and folder_path in folder_mapping and folder_path not in added_folders:
+                        ordered_entries.append({"type": "folder", "folder": folder_mapping[folder_path]})
+                        added_folders.add(folder_path)
+
+        for name in child_names:
+            if name not in added_categories:
+                ordered_entries.append({"type": "category", "name": name})
+                added_categories.add(name)
 
-        for i in range(self.category_tree.topLevelItemCount()):
-            found = walk(self.category_tree.topLevelItem(i))
-            if found:
-                return found
-        return None
+        for folder in remaining_folders:
+            if folder["path"] in added_folders:
+                continue
+            ordered_entries.append({"type": "folder", "folder": folder})
+            added_folders.add(folder["path"])
+        return ordered_entries
 
     def refresh_folder_table(self, force_scan: bool = True):
         preserve_key: Optional[Tuple[str, str]] = None
         if self.current_folder:
             preserve_key = ("folder", self.current_folder["path"])
-        self.folders_table.blockSignals(True)
-        query = self.search.text().strip().lower()
         items: List[Dict[str, Any]] = []
         root = self.build_category_tree_root()
         node = root
@@ -2757,421 +5212,498 @@ class MainWindow(QMainWindow):
 
         if node is not None:
             order = self.category_order()
-            key = self.category_path_key(self.selected_category_path)
-            child_names = self.ordered_list(
-                list(node["children"].keys()),
-                order.get("categories", {}).get(key, []),
-            )
-            folder_order = order.get("folder", {}).get(key, [])
-            folder_mapping = {folder["path"]: folder for folder in node["folders"]}
-            remaining_folders = self.folders_sorted_for_category(node["folders"], folder_order)
-            tree_order = order.get("tree", {}).get(key, [])
-            ordered_entries: List[Dict[str, Any]] = []
-            added_categories: set[str] = set()
-            added_folders: set[str] = set()
-            if isinstance(tree_order, list):
-                for entry in tree_order:
-                    if not isinstance(entry, dict):
-                        continue
-                    entry_type = entry.get("type")
-                    if entry_type == "category":
-                        name = entry.get("name")
-                        if isinstance(name, str) and name in node["children"] and name not in added_categories:
-                            ordered_entries.append({"type": "category", "name": name})
-                            added_categories.add(name)
-                    elif entry_type == "folder":
-                        folder_path = entry.get("path")
-                        if isinstance(folder_path, str) and folder_path in folder_mapping and folder_path not in added_folders:
-                            folder = folder_mapping[folder_path]
-                            ordered_entries.append({"type": "folder", "name": folder["name"], "path": folder["path"]})
-                            added_folders.add(folder_path)
-
-            for name in child_names:
-                if name not in added_categories:
-                    ordered_entries.append({"type": "category", "name": name})
-                    added_categories.add(name)
-
-            for folder in remaining_folders:
-                if folder["path"] in added_folders:
-                    continue
-                ordered_entries.append({"type": "folder", "name": folder["name"], "path": folder["path"]})
-                added_folders.add(folder["path"])
-
-            for entry in ordered_entries:
-                entry_type = entry["type"]
-                name = entry["name"]
-                if query and query not in name.lower():
-                    continue
-                if entry_type == "category":
-                    child_path = self.selected_category_path + [name]
+            for entry in self.ordered_category_entries(node, self.selected_category_path, order):
+                if entry["type"] == "category":
                     items.append({
                         "type": "category",
-                        "name": name,
-                        "path": child_path,
+                        "name": entry["name"],
+                        "path": self.selected_category_path + [entry["name"]],
                     })
-                elif entry_type == "folder":
-                    folder_path = entry["path"]
-                    folder_item = folder_mapping.get(folder_path)
+                else:
+                    folder = entry["folder"]
                     items.append({
                         "type": "folder",
-                        "name": name,
-                        "path": folder_path,
-                        "categories": self.category_path_for_item(folder_item) if folder_item else [],
+                        "name": folder["name"],
+                        "path": folder["path"],
+                        "categories": self.category_path_for_item(folder),
                     })
 
-        self.folders_table.setRowCount(0)
-
+        entries: List[FolderListEntry] = []
         for item in items:
             item_type = item.get("type")
             name = item["name"]
             path = item["path"]
-            last_date = ""
-            has_unchecked = False
             has_new_subfolder = False
-            missing_folder = False
-            if item_type == "folder":
-                categories = item.get("categories") or []
-                highlight_enabled = (
-                    self.is_category_highlight_enabled_for_path(categories)
-                    and self.is_folder_tree_checked(path)
-                )
-                if highlight_enabled:
-                    has_unchecked = self.folder_has_unchecked_cached(path, force_scan)
-                has_new_subfolder = (
-                    highlight_enabled
-                    and self.folder_key(path) in self.new_folder_highlights
-                )
-                last_date = self.folder_latest_date(path, force_scan)
-                missing_folder = not os.path.isdir(path)
-
-            r = self.folders_table.rowCount()
-            self.folders_table.insertRow(r)
-
+            highlight_enabled = False
             if item_type == "category":
                 category_folder_path = self.category_folder_path_for_path(path)
-                icon_prefix = "📁 " if category_folder_path else "🔖 "
-                it_name = QTableWidgetItem(f"{icon_prefix}{name}")
                 if category_folder_path:
-                    it_name.setToolTip(category_folder_path)
                     highlight_enabled = self.is_category_highlight_enabled_for_path(path)
-                    if highlight_enabled and self.category_path_key(path) in self.new_category_highlights:
-                        has_new_subfolder = True
-                it_name.setData(Qt.UserRole, {"type": "category", "path": path})
-            else:
-                icon_prefix = "📁 "
-                it_name = QTableWidgetItem(f"{icon_prefix}{name}")
-                it_name.setToolTip(path)
-                it_name.setData(Qt.UserRole, path)
-            self.set_item_unchecked_style(it_name, has_unchecked)
-            self.set_item_new_folder_style(it_name, has_new_subfolder)
-            self.set_item_missing_folder_style(it_name, missing_folder)
-
-            self.folders_table.setItem(r, 0, it_name)
-            it_date = QTableWidgetItem(last_date)
-            self.set_item_new_folder_style(it_date, has_new_subfolder)
-            self.set_item_missing_folder_style(it_date, missing_folder)
-            self.folders_table.setItem(r, 1, it_date)
-
-        self.folders_table.repaint()
-        self.folders_table.blockSignals(False)
+                    has_new_subfolder = (
+                        highlight_enabled
+                        and self.category_path_key(path) in self.new_category_highlights
+                    )
+                entries.append(FolderListEntry(
+                    kind="category",
+                    name=name,
+                    path=path,
+                    tooltip=category_folder_path or "",
+                    icon_prefix="📁 " if category_folder_path else "🔖 ",
+                    highlight_enabled=highlight_enabled,
+                    has_new_subfolder=has_new_subfolder,
+                    status=self.category_row_status(path),
+                ))
+                continue
+            categories = item.get("categories") or []
+            highlight_enabled = (
+                self.is_category_highlight_enabled_for_path(categories)
+                and self.is_folder_tree_checked(path)
+            )
+            key = self.folder_key(path)
+            has_new_subfolder = highlight_enabled and key in self.new_folder_highlights
+            self.request_folder_status(path, force_scan, group=FOLDER_TABLE_STATUS_GROUP)
+            entries.append(FolderListEntry(
+                kind="folder",
+                name=name,
+                path=path,
+                key=key,
+                tooltip=path,
+                highlight_enabled=highlight_enabled,
+                has_new_subfolder=has_new_subfolder,
+                status=self.folder_row_status(key, highlight_enabled),
+            ))
+
+        # the view keeps the selection while rows are patched or re-filtered;
+        # only a model reset needs it restored
+        self.folders_table.selectionModel().blockSignals(True)
+        self.folder_model.set_colors(self.new_folder_bg_color(), self.missing_folder_bg_color())
+        self.folder_model.set_entries(entries)
+        self.folder_proxy.set_query(self.search.text())
+        self.folders_table.selectionModel().blockSignals(False)
         if preserve_key:
             if preserve_key[0] == "folder":
                 self.select_folder_in_table(preserve_key[1])
 
     def refresh_category_tree(self):
-        self._category_tree_refreshing = True
-        expanded_paths = self.capture_expanded_category_paths()
-        self.category_tree.blockSignals(True)
-        self.category_tree.clear()
-        order = self.category_order()
-        root = self.build_category_tree_root()
+        self._category_tree_source = None
+        self.sync_unchecked_tally()
+        self.category_model.set_colors(self.new_folder_bg_color())
+        self.category_model.sync()
+        self.sync_folder_watches()
+        self.sync_search_index()
+        self.unchecked_inbox.retain(
+            self.folder_key(item["path"]) for item in self.registry
+            if isinstance(item.get("path"), str) and item["path"]
+        )
 
-        def add_nodes(
-            parent_item: Optional[QTreeWidgetItem],
-            node: Dict[str, Any],
-            path: List[str],
-            highlight_enabled: bool,
-        ) -> bool:
-            key = self.category_path_key(path)
-            has_unchecked = False
-            child_names = self.ordered_list(
-                list(node["children"].keys()),
-                order.get("categories", {}).get(key, []),
-            )
-            folder_order = order.get("folder", {}).get(key, [])
-            folder_mapping = {folder["path"]: folder for folder in node["folders"]}
-            remaining_folders = self.folders_sorted_for_category(node["folders"], folder_order)
-            remaining_categories = list(child_names)
-            added_categories: set[str] = set()
-            added_folders: set[str] = set()
-
-            def add_category(name: str) -> None:
-                nonlocal has_unchecked
+    def category_tree_source(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Registry tree and saved order for the current refresh."""
+        if self._category_tree_source is None:
+            self._category_tree_source = (self.build_category_tree_root(), self.category_order())
+        return self._category_tree_source
+
+    def sync_unchecked_tally(self) -> None:
+        """Mirror the category tree and its check states into ``unchecked_tally``; counts stay as they are."""
+        keys = []
+        stack: List[Tuple[List[str], Dict[str, Any]]] = [([], self.category_tree_source()[0])]
+        while stack:
+            path, node = stack.pop()
+            for folder in node["folders"]:
+                key = self.folder_key(folder["path"])
+                keys.append(key)
+                self.unchecked_tally.set_folder(key, path, self.is_folder_tree_checked(folder["path"]))
+            for name, child in node["children"].items():
+                self.unchecked_tally.set_category_enabled(path + [name], self.is_category_checked(path + [name]))
+                stack.append((path + [name], child))
+        self.unchecked_tally.retain(keys)
+
+    def on_unchecked_changed(self, key: str) -> None:
+        count = self.unchecked_inbox.unchecked_count(key)
+        self.folder_unchecked_cache[key] = count > 0
+        if count != self.unchecked_tally.folder_count(key):
+            self.unchecked_tally.set_count(key, count)
+            # badges show counts, so rows are patched even when the highlight stays
+            self.update_folder_row_status(key)
+            for row in range(self.folder_model.rowCount()):
+                entry = self.folder_model.entry(row)
+                if entry.kind == "category":
+                    self.folder_model.set_status(row, self.category_row_status(entry.path))
+            self.refresh_scheduler.mark_category_tree()
+        self.schedule_inbox_refresh()
+
+    def category_tree_rows(self, path: List[str]) -> List[CategoryTreeRow]:
+        """Children of the category ``path`` for the category tree model."""
+        root, order = self.category_tree_source()
+        node = root
+        for category in path:
+            node = node["children"].get(category)
+            if node is None:
+                return []
+        highlight_enabled = self.is_category_highlight_enabled_for_path(path)
+        rows: List[CategoryTreeRow] = []
+        for entry in self.ordered_category_entries(node, path, order):
+            if entry["type"] == "category":
+                name = entry["name"]
                 child_node = node["children"][name]
                 child_path = path + [name]
                 folder_path = self.category_folder_path_for_path(child_path)
-                icon_prefix = "📁 " if folder_path else "🔖 "
-                child_item = QTreeWidgetItem([f"{icon_prefix}{name}"])
-                child_item.setData(0, Qt.UserRole, {"type": "category", "path": child_path})
-                if folder_path:
-                    child_item.setToolTip(0, folder_path)
-                child_item.setFlags(child_item.flags() | Qt.ItemIsUserCheckable)
                 child_checked = self.is_category_checked(child_path)
-                child_item.setCheckState(0, Qt.Checked if child_checked else Qt.Unchecked)
-                if parent_item is None:
-                    self.category_tree.addTopLevelItem(child_item)
-                else:
-                    parent_item.addChild(child_item)
-                if expanded_paths is not None and self.category_path_key(child_path) in expanded_paths:
-                    child_item.setExpanded(True)
                 child_highlight_enabled = highlight_enabled and child_checked
-                child_unchecked = add_nodes(child_item, child_node, child_path, child_highlight_enabled)
-                if child_highlight_enabled and self.category_path_key(child_path) in self.new_category_highlights:
-                    child_item.setBackground(0, QBrush(self.new_folder_bg_color()))
-                if child_unchecked and child_highlight_enabled:
-                    child_item.setForeground(0, QBrush(UNCHECKED_COLOR))
-                    has_unchecked = True
-
-            def add_folder(folder: Dict[str, str]) -> None:
-                nonlocal has_unchecked
-                folder_item = QTreeWidgetItem([f"📁 {folder['name']}"])
-                folder_item.setToolTip(0, folder["path"])
-                folder_item.setFlags(folder_item.flags() | Qt.ItemIsUserCheckable)
+                unchecked = self.unchecked_tally.category_count(child_path) if child_highlight_enabled else 0
+                rows.append(CategoryTreeRow(
+                    kind="category",
+                    name=name,
+                    path=child_path,
+                    tooltip=folder_path or "",
+                    icon_prefix="📁 " if folder_path else "🔖 ",
+                    checked=child_checked,
+                    has_new=(
+                        child_highlight_enabled
+                        and self.category_path_key(child_path) in self.new_category_highlights
+                    ),
+                    has_unchecked=unchecked > 0,
+                    unchecked_count=unchecked,
+                    has_children=bool(child_node["children"] or child_node["folders"]),
+                ))
+            else:
+                folder = entry["folder"]
                 folder_checked = self.is_folder_tree_checked(folder["path"])
-                folder_item.setCheckState(0, Qt.Checked if folder_checked else Qt.Unchecked)
-                folder_item.setData(0, Qt.UserRole, {
-                    "type": "folder",
-                    "path": folder["path"],
-                    "category_path": path,
-                })
                 folder_highlight_enabled = highlight_enabled and folder_checked
-                if folder_highlight_enabled and self.folder_key(folder["path"]) in self.new_folder_highlights:
-                    folder_item.setBackground(0, QBrush(self.new_folder_bg_color()))
-                if folder_highlight_enabled:
-                    folder_unchecked = self.folder_has_unchecked_cached(folder["path"], False)
-                    if folder_unchecked:
-                        folder_item.setForeground(0, QBrush(UNCHECKED_COLOR))
-                        has_unchecked = True
-                if parent_item is None:
-                    self.category_tree.addTopLevelItem(folder_item)
-                else:
-                    parent_item.addChild(folder_item)
-
-            tree_order = order.get("tree", {}).get(key, [])
-            if isinstance(tree_order, list):
-                for entry in tree_order:
-                    if not isinstance(entry, dict):
-                        continue
-                    entry_type = entry.get("type")
-                    if entry_type == "category":
-                        name = entry.get("name")
-                        if isinstance(name, str) and name in node["children"] and name not in added_categories:
-                            add_category(name)
-                            added_categories.add(name)
-                    elif entry_type == "folder":
-                        folder_path = entry.get("path")
-                        if isinstance(folder_path, str) and folder_path in folder_mapping and folder_path not in added_folders:
-                            add_folder(folder_mapping[folder_path])
-                            added_folders.add(folder_path)
-
-            for name in remaining_categories:
-                if name in added_categories:
-                    continue
-                add_category(name)
-                added_categories.add(name)
-
-            for folder in remaining_folders:
-                if folder["path"] in added_folders:
-                    continue
-                add_folder(folder)
-                added_folders.add(folder["path"])
-            return has_unchecked if highlight_enabled else False
-
-        add_nodes(None, root, [], True)
+                rows.append(CategoryTreeRow(
+                    kind="folder",
+                    name=folder["name"],
+                    path=folder["path"],
+                    category_path=tuple(path),
+                    tooltip=folder["path"],
+                    checked=folder_checked,
+                    has_new=(
+                        folder_highlight_enabled
+                        and self.folder_key(folder["path"]) in self.new_folder_highlights
+                    ),
+                    has_unchecked=(
+                        folder_highlight_enabled
+                        and self.folder_has_unchecked_cached(folder["path"], False)
+                    ),
+                    unchecked_count=(
+                        self.unchecked_tally.folder_count(self.folder_key(folder["path"]))
+                        if folder_highlight_enabled else 0
+                    ),
+                ))
+        return rows
+
+    def apply_refresh(self, request: RefreshRequest) -> None:
+        """Run the merged refresh collected by ``refresh_scheduler``."""
+        current_path = self.current_folder["path"] if self.current_folder else None
+        current_key = self.folder_key(current_path) if current_path else None
+        dirty_keys = {self.folder_key(path) for path in request.folders}
+        for folder_path, rescan in request.folders.items():
+            if rescan:
+                FOLDER_SNAPSHOTS.invalidate(folder_path)
+        if current_key in dirty_keys:
+            self.refresh_files_table()
+        elif current_path:
+            doc_keys: set[str] = set()
+            for folder_path, keys in request.docs.items():
+                if self.folder_key(folder_path) == current_key:
+                    doc_keys |= keys
+            if doc_keys:
+                self.current_meta = scan_folder_cached(current_path, self.ignore_types).meta
+                selected = self.selected_file_index()
+                if 0 <= selected < len(self.current_file_rows) and self.current_file_rows[selected].doc_key in doc_keys:
+                    self.refresh_right_pane_for_doc(self.current_file_rows[selected].doc_key)
+        for folder_path, rescan in request.folders.items():
+            if rescan:
+                self.request_folder_status(folder_path, force_scan=True)
+            self.update_folder_row_status(self.folder_key(folder_path))
+        rescanned_keys = {self.folder_key(path) for path, rescan in request.folders.items() if rescan}
+        tree_dirty = False
+        for change in request.revisions:
+            if self.folder_key(change.folder_path) not in rescanned_keys:
+                tree_dirty = self.apply_revision_change(change) or tree_dirty
+        if request.folder_table:
+            self.refresh_folder_table(force_scan=request.folder_table_force_scan)
+        if request.category_tree or tree_dirty:
+            self.refresh_category_tree()
 
-        self.category_tree.blockSignals(False)
-        self._category_tree_refreshing = False
+    def apply_revision_change(self, change: RevisionChange) -> bool:
+        """
+        Patch the shown rows and status caches with ``change`` instead of
+        rescanning the folder; the folder watcher's background scan settles
+        anything a patch cannot know. True when the tree needs a repaint.
+        """
+        folder_path = change.folder_path
+        key = self.folder_key(folder_path)
+        self.schedule_memo_index(folder_path)
+        had_unchecked = self.folder_unchecked_cache.get(key)
+        if not self.current_folder or self.folder_key(self.current_folder["path"]) != key:
+            # the folder is not shown, so only its inbox entry needs the change
+            self.unchecked_inbox.set_document(
+                key, change.inbox_document(), self.doc_is_checked(folder_path, change.doc_key)
+            )
+        else:
+            # snapshot metas are shared, so swap in copies instead of editing them
+            docs = self.current_meta.get("documents", {})
+            if not isinstance(docs, dict):
+                docs = {}
+            info = dict(docs.get(change.doc_key) or {"title": change.doc_key})
+            info.update(change.doc_fields())
+            self.current_meta = {**self.current_meta, "documents": {**docs, change.doc_key: info}}
+
+            selected = self.selected_file_index()
+            selected_doc_key = (
+                self.current_file_rows[selected].doc_key
+                if 0 <= selected < len(self.current_file_rows) else None
+            )
+            checked = self.doc_is_checked(folder_path, change.doc_key, info)
+            if self.files_model.replace_row(change.file_row(), checked) >= 0 and self._files_sort is not None:
+                self.files_model.sort(*self._files_sort)
+            self.current_file_rows = self.files_model.rows
+            self.update_files_header_check_state()
+            if selected_doc_key == change.doc_key:
+                self.patch_history_pane(change)
+
+            self.update_folder_unchecked_cache_for_folder(folder_path, self.current_meta)
+        self.search_index.set_document(key, change.doc_key, change.filename)
+        if change.file_mtime is not None:
+            last_date = dt.datetime.fromtimestamp(change.file_mtime).strftime("%Y-%m-%d")
+            cached = self.folder_latest_date_cache.get(key, FOLDER_STATUS_PLACEHOLDER)
+            if cached == FOLDER_STATUS_PLACEHOLDER or last_date > cached:
+                self.folder_latest_date_cache[key] = last_date
+        self.update_folder_row_status(key)
+        return self.folder_unchecked_cache.get(key) != had_unchecked
+
+    def patch_history_pane(self, change: RevisionChange) -> None:
+        """Show ``change`` in the history pane without reading the history log again."""
+        entries = self.hist_model.entries()
+        if not entries:
+            self.refresh_right_pane_for_doc(change.doc_key)
+            return
+        latest = {
+            "kind": "最新",
+            "rev": change.rev,
+            "updated_at": change.updated_at,
+            "updated_by": change.updated_by,
+            "memo": change.memo,
+            "file": change.filename,
+        }
+        history = [{"kind": "履歴", **change.previous}] if change.previous else []
+        self.hist_model.set_entries([latest] + history + entries[1:])
+
+    def category_tree_sibling_order(self, parent: QModelIndex) -> Tuple[List[str], List[Dict[str, str]], List[str]]:
+        """(category names, tree order entries, folder paths) of the rows under ``parent``."""
+        category_order: List[str] = []
+        tree_order: List[Dict[str, str]] = []
+        folder_order: List[str] = []
+        for row in self.category_model.child_rows(parent):
+            if row.kind == "category":
+                category_order.append(row.name)
+                tree_order.append({"type": "category", "name": row.name})
+            else:
+                folder_order.append(row.path)
+                tree_order.append({"type": "folder", "path": row.path})
+        return category_order, tree_order, folder_order
 
-    def schedule_category_tree_refresh(self):
-        if self._category_tree_refresh_pending:
+    def update_category_order_from_tree(self, parent: QModelIndex) -> None:
+        """Store the current row order under ``parent``; other levels keep their saved order."""
+        data = parent.data(Qt.UserRole) if parent.isValid() else {"type": "category", "path": []}
+        if not isinstance(data, dict) or data.get("type") != "category":
             return
-        self._category_tree_refresh_pending = True
-        QTimer.singleShot(0, self.apply_category_tree_refresh)
+        key = self.category_path_key(data.get("path", []))
+        category_order, tree_order, folder_order = self.category_tree_sibling_order(parent)
+        order = self.category_order()
+        for section, values in (("categories", category_order), ("folder", folder_order), ("tree", tree_order)):
+            order.setdefault(section, {})
+            if values:
+                order[section][key] = values
+            else:
+                order[section].pop(key, None)
+        self.settings["category_order"] = order
+        self.schedule_settings_save()
 
-    def schedule_folder_table_refresh(self, force_scan: bool = True) -> None:
-        if self._folder_table_refresh_pending:
-            self._folder_table_refresh_force_scan = self._folder_table_refresh_force_scan or force_scan
+    def sync_search_index(self) -> None:
+        """Mirror registered folders and categories into ``search_index``; documents come with scans."""
+        folders = []
+        for item in self.registry:
+            path = item.get("path")
+            if not isinstance(path, str) or not path:
+                continue
+            categories = self.category_path_for_item(item)
+            if self.is_archived_path(categories):
+                continue
+            folders.append((self.folder_key(path), str(item.get("name") or path), path, categories))
+        self.search_index.set_folders(folders)
+        category_paths: List[List[str]] = []
+        stack: List[Tuple[List[str], Dict[str, Any]]] = [([], self.category_tree_source()[0])]
+        while stack:
+            path, node = stack.pop()
+            for name, child in node["children"].items():
+                category_paths.append(path + [name])
+                stack.append((path + [name], child))
+        self.search_index.set_categories(category_paths)
+
+    def index_folder_documents(self, key: str, documents: Any) -> None:
+        """Feed the documents of a ``meta["documents"]`` dict or ``IndexedDocument`` list to the search."""
+        if isinstance(documents, dict):
+            pairs = [
+                (doc_key, str(info.get("current_file", "") or ""))
+                for doc_key, info in documents.items()
+                if isinstance(info, dict) and info.get("current_file")
+            ]
+        else:
+            pairs = [(doc.doc_key, doc.current_file) for doc in documents if doc.current_file]
+        self.search_index.set_documents(key, pairs)
+
+    def schedule_global_search(self, _text: str = "") -> None:
+        self._search_timer.start()
+
+    def run_global_search(self) -> None:
+        self._search_timer.stop()
+        query = self.search.text().strip()
+        hits = self.search_index.search(query, SEARCH_RESULT_LIMIT) if query else []
+        self.search_results_model.set_hits(hits)
+        self.search_results.setVisible(bool(hits))
+
+    def clear_global_search(self) -> None:
+        self._search_timer.stop()
+        self.search.blockSignals(True)
+        self.search.clear()
+        self.search.blockSignals(False)
+        self.apply_folder_filter("")
+        self.search_results_model.set_hits([])
+        self.search_results.setVisible(False)
+
+    def on_search_return_pressed(self) -> None:
+        self.run_global_search()
+        if self.search_results_model.hits:
+            self.jump_to_search_hit(self.search_results_model.hits[0])
+
+    def on_search_result_activated(self, index: QModelIndex) -> None:
+        hit = index.data(Qt.UserRole)
+        if isinstance(hit, SearchHit):
+            self.jump_to_search_hit(hit)
+
+    def jump_to_search_hit(self, hit: SearchHit) -> None:
+        """Show the hit's category, select its folder and, for documents, the document."""
+        self.clear_global_search()
+        category_path = list(hit.category_path)
+        if hit.kind == "category":
+            tree_index = self.find_category_tree_item(category_path)
+        else:
+            tree_index = self.category_model.folder_index(category_path, hit.folder_path)
+        if tree_index.isValid():
+            selection = self.category_tree.selectionModel()
+            selection.blockSignals(True)
+            self.category_tree.setCurrentIndex(tree_index)
+            selection.blockSignals(False)
+            self.category_tree.scrollTo(tree_index)
+        self.scan_pool.cancel_pending(FOLDER_TABLE_STATUS_GROUP)
+        self.selected_category_path = category_path
+        self.refresh_folder_table()
+        if hit.kind == "category":
             return
-        self._folder_table_refresh_pending = True
-        self._folder_table_refresh_force_scan = force_scan
-        QTimer.singleShot(0, self.apply_folder_table_refresh)
-
-    def apply_folder_table_refresh(self) -> None:
-        force_scan = self._folder_table_refresh_force_scan
-        self._folder_table_refresh_pending = False
-        self._folder_table_refresh_force_scan = True
-        self.refresh_folder_table(force_scan=force_scan)
-
-    def apply_category_tree_refresh(self):
-        self._category_tree_refresh_pending = False
-        self.refresh_category_tree()
-
-    def update_category_order_from_tree(self):
-        order = {"categories": {}, "folder": {}, "tree": {}}
+        self.select_folder_in_table(hit.folder_path)
+        if not hit.doc_key or not self.current_folder:
+            return
+        if self.folder_key(self.current_folder["path"]) == self.folder_key(hit.folder_path):
+            self.select_doc_key(hit.doc_key)
 
-        def walk(item: QTreeWidgetItem, path: List[str]):
-            category_order = []
-            folder_order = []
-            tree_order = []
-            for i in range(item.childCount()):
-                child = item.child(i)
-                data = child.data(0, Qt.UserRole) or {}
-                if data.get("type") == "category":
-                    child_path = data.get("path")
-                    if isinstance(child_path, list) and child_path:
-                        name = child_path[-1]
-                    else:
-                        name = self.strip_icon_prefix(child.text(0))
-                    category_order.append(name)
-                    tree_order.append({"type": "category", "name": name})
-                elif data.get("type") == "folder":
-                    folder_path = data.get("path")
-                    if folder_path:
-                        folder_order.append(folder_path)
-                        tree_order.append({"type": "folder", "path": folder_path})
-            if category_order:
-                order["categories"][self.category_path_key(path)] = category_order
-            if folder_order:
-                order["folder"][self.category_path_key(path)] = folder_order
-            if tree_order:
-                order["tree"][self.category_path_key(path)] = tree_order
-            for i in range(item.childCount()):
-                child = item.child(i)
-                data = child.data(0, Qt.UserRole) or {}
-                if data.get("type") == "category":
-                    child_path = data.get("path")
-                    if isinstance(child_path, list) and child_path:
-                        name = child_path[-1]
-                    else:
-                        name = self.strip_icon_prefix(child.text(0))
-                    walk(child, path + [name])
-
-        root_categories = []
-        root_folders = []
-        root_tree = []
-        for i in range(self.category_tree.topLevelItemCount()):
-            top = self.category_tree.topLevelItem(i)
-            data = top.data(0, Qt.UserRole) or {}
-            if data.get("type") == "category":
-                top_path = data.get("path")
-                if isinstance(top_path, list) and top_path:
-                    name = top_path[-1]
-                else:
-                    name = self.strip_icon_prefix(top.text(0))
-                root_categories.append(name)
-                root_tree.append({"type": "category", "name": name})
-                walk(top, [name])
-            elif data.get("type") == "folder":
-                path = data.get("path")
-                if path:
-                    root_folders.append(path)
-                    root_tree.append({"type": "folder", "path": path})
-        if root_categories:
-            order["categories"][self.category_path_key([])] = root_categories
-        if root_folders:
-            order["folder"][self.category_path_key([])] = root_folders
-        if root_tree:
-            order["tree"][self.category_path_key([])] = root_tree
-        self.settings["category_order"] = order
-        save_settings(self.settings)
+    def apply_folder_filter(self, text: str) -> None:
+        """Filter the folder list in place; the rows themselves are not rebuilt."""
+        self.folders_table.selectionModel().blockSignals(True)
+        self.folder_proxy.set_query(text)
+        self.folders_table.selectionModel().blockSignals(False)
+        if self.current_folder:
+            self.select_folder_in_table(self.current_folder["path"])
 
     def select_folder_in_table(self, path: str):
-        for row in range(self.folders_table.rowCount()):
-            item = self.folders_table.item(row, 0)
-            if item and item.data(Qt.UserRole) == path:
-                self.folders_table.selectRow(row)
-                break
+        row = self.folder_model.row_for_key(self.folder_key(path))
+        if row < 0:
+            return
+        index = self.folder_proxy.mapFromSource(self.folder_model.index(row, 0))
+        if not index.isValid():
+            return
+        selection = self.folders_table.selectionModel()
+        if selection.isRowSelected(index.row(), QModelIndex()) and len(selection.selectedRows()) == 1:
+            return
+        self.folders_table.selectRow(index.row())
 
     def select_doc_key(self, doc_key: str):
-        for row in range(self.files_table.rowCount()):
-            item = self.files_table.item(row, 5)
-            if item and item.text() == doc_key:
-                self.files_table.selectRow(row)
-                self.refresh_right_pane_for_doc(doc_key)
-                break
+        row = self.files_model.row_for_doc_key(doc_key)
+        if row < 0:
+            return
+        self.files_table.selectRow(row)
+        self.refresh_right_pane_for_doc(doc_key)
 
     def refresh_files_table(self):
-        self.files_table.blockSignals(True)
-        self.files_table.setUpdatesEnabled(False)
+        selection = self.files_table.selectionModel()
+        selection.blockSignals(True)
         selected_doc_key = None
         selected_index = self.selected_file_index()
         if 0 <= selected_index < len(self.current_file_rows):
             selected_doc_key = self.current_file_rows[selected_index].doc_key
-        self.hist_table.setRowCount(0)
+        self.hist_model.clear()
 
         if not self.current_folder:
+            self.files_model.clear()
             self.update_files_header_check_state()
-            self.files_table.blockSignals(False)
-            self.files_table.setUpdatesEnabled(True)
+            selection.blockSignals(False)
             return
 
         folder_path = self.current_folder["path"]
         if not os.path.isdir(folder_path):
             self.warn("登録フォルダが見つかりません。パスを確認してください。")
             self.update_files_header_check_state()
-            self.files_table.blockSignals(False)
-            self.files_table.setUpdatesEnabled(True)
+            selection.blockSignals(False)
             return
 
-        meta, rows = scan_folder(folder_path, self.ignore_types)
+        snapshot = scan_folder_cached(folder_path, self.ignore_types)
+        meta = snapshot.meta
+        rows = list(snapshot.rows)
         self.current_meta = meta
         self.update_folder_unchecked_cache_for_folder(folder_path, meta)
-        self.current_file_rows = rows
-
-        self.files_table.setRowCount(len(rows))
-        for r, row in enumerate(rows):
-
-            doc_info = self.current_meta.get("documents", {}).get(row.doc_key, {})
-            is_checked = self.doc_is_checked(folder_path, row.doc_key, doc_info if isinstance(doc_info, dict) else None)
-
-            it_check = QTableWidgetItem("")
-            it_check.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable)
-            it_check.setCheckState(Qt.Checked if is_checked else Qt.Unchecked)
-            it_check.setData(Qt.UserRole, row.doc_key)
-            self.files_table.setItem(r, 0, it_check)
-
-            it_fn = QTableWidgetItem(row.filename)
-            it_fn.setToolTip(os.path.join(folder_path, row.filename))
-            self.set_item_unchecked_style(it_fn, not is_checked)
-            if row.missing:
-                it_fn.setBackground(UNCHECKED_COLOR)
-            self.files_table.setItem(r, 1, it_fn)
-            self.files_table.setItem(r, 2, QTableWidgetItem(display_rev(row.rev)))
-            self.files_table.setItem(r, 3, QTableWidgetItem((row.updated_at or "").replace("T", " ")))
-            self.files_table.setItem(r, 4, QTableWidgetItem(row.updated_by or ""))
-            self.files_table.setItem(r, 5, QTableWidgetItem(row.doc_key))
+        self.index_folder_documents(self.folder_key(folder_path), meta.get("documents", {}))
+
+        docs = self.current_meta.get("documents", {})
+        checked = []
+        for row in rows:
+            doc_info = docs.get(row.doc_key, {})
+            checked.append(self.doc_is_checked(folder_path, row.doc_key, doc_info if isinstance(doc_info, dict) else None))
+        self.files_model.set_rows(folder_path, rows, checked)
+        if self._files_sort is not None:
+            self.files_model.sort(*self._files_sort)
+        self.current_file_rows = self.files_model.rows
 
         # hide DocKey column by default (can be useful for debugging)
         self.files_table.setColumnHidden(5, True)
         self.update_files_header_check_state()
         if selected_doc_key:
             self.select_doc_key(selected_doc_key)
-        self.files_table.blockSignals(False)
-        self.files_table.setUpdatesEnabled(True)
+        selection.blockSignals(False)
+
+    def doc_history_items(
+        self,
+        folder_path: str,
+        doc_key: str,
+        info: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, str]]:
+        """History of one document, oldest first, read from the folder's log."""
+        items = read_doc_history(folder_path, doc_key)
+        inline = info.get("history") if isinstance(info, dict) else None
+        if isinstance(inline, list) and inline:
+            items = [history_entry(item) for item in inline if isinstance(item, dict)] + items
+        return items
 
     def refresh_right_pane_for_doc(self, doc_key: str):
-        self.hist_table.setRowCount(0)
+        self.hist_model.clear()
 
-        if not self.current_meta:
+        if not self.current_meta or not self.current_folder:
             return
         docs = self.current_meta.get("documents", {})
         info = docs.get(doc_key)
         if not isinstance(info, dict):
             return
 
-        history = info.get("history", [])
-        if not isinstance(history, list):
-            history = []
+        history = self.doc_history_items(self.current_folder["path"], doc_key, info)
 
         latest_entry = {
             "kind": "最新",
@@ -3181,72 +5713,49 @@ class MainWindow(QMainWindow):
             "memo": info.get("last_memo", "") or "",
             "file": info.get("current_file", "") or "",
         }
-        self.add_history_row(latest_entry)
+        entries = [latest_entry]
 
         # show newest first
-        items = list(history)
-        items.reverse()
-
-        for h in items:
-            entry = {
+        for h in reversed(history):
+            entries.append({
                 "kind": "履歴",
                 "rev": h.get("rev", "") or "",
                 "updated_at": h.get("updated_at", "") or "",
                 "updated_by": h.get("updated_by", "") or "",
                 "memo": h.get("memo", "") or "",
                 "file": h.get("file", "") or "",
-            }
-            self.add_history_row(entry)
-
-    def add_history_row(self, entry: Dict[str, Any]) -> None:
-        r = self.hist_table.rowCount()
-        self.hist_table.insertRow(r)
-        kind_item = QTableWidgetItem(entry.get("kind", "") or "")
-        kind_item.setData(Qt.UserRole, entry)
-        rev_text = display_rev(entry.get("rev", "") or "")
-        updated_text = (entry.get("updated_at", "") or "").replace("T", " ")
-        self.hist_table.setItem(r, 0, kind_item)
-        self.hist_table.setItem(r, 1, QTableWidgetItem(rev_text))
-        self.hist_table.setItem(r, 2, QTableWidgetItem(updated_text))
-        self.hist_table.setItem(r, 3, QTableWidgetItem(entry.get("updated_by", "") or ""))
-        self.hist_table.setItem(r, 4, QTableWidgetItem(entry.get("memo", "") or ""))
+            })
+        self.hist_model.set_entries(entries)
 
     # ---------- events ----------
-    def on_category_tree_order_changed(self):
-        self.update_category_order_from_tree()
+    def on_category_tree_order_changed(self, parent: QModelIndex):
+        self.update_category_order_from_tree(parent)
         self.refresh_category_tree()
 
-    def on_category_tree_item_changed(self, item: QTreeWidgetItem, column: int):
-        if self._category_tree_refreshing:
-            return
-        if column != 0:
+    def on_category_tree_check_toggled(self, data: Any, checked: bool):
+        if not isinstance(data, dict):
             return
-        data = item.data(0, Qt.UserRole) or {}
         item_type = data.get("type")
         if item_type == "category":
             path = data.get("path", [])
             if not isinstance(path, list):
                 return
-            self.set_category_checked(path, item.checkState(0) == Qt.Checked)
+            self.set_category_checked(path, checked)
         elif item_type == "folder":
             folder_path = data.get("path")
             if not isinstance(folder_path, str):
                 return
-            self.set_folder_tree_checked(folder_path, item.checkState(0) == Qt.Checked)
+            self.set_folder_tree_checked(folder_path, checked)
         else:
             return
-        self.schedule_folder_table_refresh(force_scan=False)
-        self.schedule_category_tree_refresh()
+        self.refresh_scheduler.mark_folder_table()
+        self.refresh_scheduler.mark_category_tree()
 
     def on_folders_table_context_menu(self, pos):
-        item = self.folders_table.itemAt(pos)
-        if not item:
-            return
-        row = item.row()
-        path_item = self.folders_table.item(row, 0)
-        if not path_item:
+        index = self.folders_table.indexAt(pos)
+        if not index.isValid():
             return
-        path = path_item.data(Qt.UserRole)
+        path = self.folder_row_data(self.folder_proxy.mapToSource(index).row())
         if not isinstance(path, str) or not path:
             return
 
@@ -3267,8 +5776,8 @@ class MainWindow(QMainWindow):
     def selected_category_tree_paths(self) -> Tuple[List[List[str]], List[str]]:
         category_paths: List[List[str]] = []
         folder_paths: List[str] = []
-        for item in self.category_tree.selectedItems():
-            data = item.data(0, Qt.UserRole) or {}
+        for index in self.category_tree.selectionModel().selectedRows():
+            data = index.data(Qt.UserRole) or {}
             item_type = data.get("type")
             if item_type == "category":
                 path = data.get("path", [])
@@ -3310,15 +5819,13 @@ class MainWindow(QMainWindow):
             self.info("削除しました。")
 
     def on_category_tree_context_menu(self, pos):
-        item = self.category_tree.itemAt(pos)
-        if not item:
+        item = self.category_tree.indexAt(pos)
+        if not item.isValid():
             return
-        if not item.isSelected():
-            self.category_tree.clearSelection()
-            item.setSelected(True)
-            self.category_tree.setCurrentItem(item)
-        selected_items = self.category_tree.selectedItems()
-        if len(selected_items) > 1:
+        selection = self.category_tree.selectionModel()
+        if not selection.isSelected(item):
+            selection.setCurrentIndex(item, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+        if len(selection.selectedRows()) > 1:
             category_paths, folder_paths = self.selected_category_tree_paths()
             if not category_paths and not folder_paths:
                 return
@@ -3333,7 +5840,7 @@ class MainWindow(QMainWindow):
             elif action == act_archive:
                 self.archive_selected_category_paths(category_paths)
             return
-        data = item.data(0, Qt.UserRole) or {}
+        data = item.data(Qt.UserRole) or {}
         item_type = data.get("type")
 
         menu = QMenu(self)
@@ -3390,7 +5897,7 @@ class MainWindow(QMainWindow):
             else:
                 path = data.get("path")
                 if not isinstance(path, str):
-                    path = item.toolTip(0)
+                    path = item.data(Qt.ToolTipRole)
                 if path:
                     self.edit_registered_folder(path)
         elif action == act_register_as_category:
@@ -3401,41 +5908,7 @@ class MainWindow(QMainWindow):
                 return
             if not isinstance(category_path, list):
                 category_path = []
-            parent_item = item.parent()
-            current_category_order = []
-            current_tree_order = []
-            if parent_item is None:
-                for i in range(self.category_tree.topLevelItemCount()):
-                    top = self.category_tree.topLevelItem(i)
-                    top_data = top.data(0, Qt.UserRole) or {}
-                    if top_data.get("type") == "category":
-                        top_path = top_data.get("path")
-                        if isinstance(top_path, list) and top_path:
-                            name = top_path[-1]
-                        else:
-                            name = self.strip_icon_prefix(top.text(0))
-                        current_category_order.append(name)
-                        current_tree_order.append({"type": "category", "name": name})
-                    elif top_data.get("type") == "folder":
-                        top_path = top_data.get("path")
-                        if top_path:
-                            current_tree_order.append({"type": "folder", "path": top_path})
-            else:
-                for i in range(parent_item.childCount()):
-                    child = parent_item.child(i)
-                    child_data = child.data(0, Qt.UserRole) or {}
-                    if child_data.get("type") == "category":
-                        child_path = child_data.get("path")
-                        if isinstance(child_path, list) and child_path:
-                            name = child_path[-1]
-                        else:
-                            name = self.strip_icon_prefix(child.text(0))
-                        current_category_order.append(name)
-                        current_tree_order.append({"type": "category", "name": name})
-                    elif child_data.get("type") == "folder":
-                        child_path = child_data.get("path")
-                        if child_path:
-                            current_tree_order.append({"type": "folder", "path": child_path})
+            current_category_order, current_tree_order, _folders = self.category_tree_sibling_order(item.parent())
             base_categories = normalize_category_path(category_path)
             if not self.run_batch_register(root_path, 1, base_categories=base_categories):
                 return
@@ -3453,7 +5926,7 @@ class MainWindow(QMainWindow):
             if removed_item_name:
                 folder_name = removed_item_name
             if not folder_name:
-                folder_name = self.strip_icon_prefix(item.text(0).strip())
+                folder_name = self.strip_icon_prefix(str(item.data(Qt.DisplayRole) or "").strip())
             if not folder_name:
                 folder_name = self.root_category_name(root_path)
             category_folder_path = root_path
@@ -3485,7 +5958,7 @@ class MainWindow(QMainWindow):
                 order.setdefault("tree", {})
                 order["tree"][key] = updated_tree
             self.settings["category_order"] = order
-            save_settings(self.settings)
+            self.schedule_settings_save()
             new_category_path = normalize_category_path(category_path + [folder_name])
             self.set_category_folder_path(new_category_path, category_folder_path)
             self.refresh_folder_table()
@@ -3494,7 +5967,7 @@ class MainWindow(QMainWindow):
         elif action == act_delete:
             path = data.get("path")
             if item_type == "folder" and not isinstance(path, str):
-                path = item.toolTip(0)
+                path = item.data(Qt.ToolTipRole)
             if not path:
                 return
             if item_type == "folder":
@@ -3529,6 +6002,8 @@ class MainWindow(QMainWindow):
         if not doc_keys:
             self.warn("対象ファイル（最新）を選択してください。")
             return
+        if self.file_operation_pending(self.current_folder["path"]):
+            return
         action_label = "アーカイブ" if archive else "削除"
         if not self.ask(f"選択したファイル {len(doc_keys)} 件を{action_label}しますか？"):
             return
@@ -3568,8 +6043,8 @@ class MainWindow(QMainWindow):
                     errors.append(f"{doc_key}: {e}")
                     continue
             if not archive:
-                history_items = info.get("history", [])
-                if isinstance(history_items, list):
+                history_items = self.doc_history_items(folder_path, doc_key, info)
+                if history_items:
                     history_dir = ensure_history_dir(folder_path)
                     for entry in history_items:
                         if not isinstance(entry, dict):
@@ -3587,22 +6062,22 @@ class MainWindow(QMainWindow):
             removed_keys.add(doc_key)
 
         if removed_keys:
+            save_history_ops(folder_path, [drop_doc_op(doc_key) for doc_key in sorted(removed_keys)])
             meta["documents"] = docs
             save_meta(folder_path, meta)
             self.remove_user_checks_for_docs(folder_path, removed_keys)
             if self.current_folder and os.path.normcase(self.current_folder["path"]) == os.path.normcase(folder_path):
                 self.current_meta = meta
-            self.refresh_files_table()
-            self.refresh_folder_table()
-            self.refresh_category_tree()
+            self.refresh_scheduler.mark_folder(folder_path)
+            self.refresh_scheduler.mark_category_tree()
             self.info(f"{action_label}しました。")
 
         if errors:
             self.warn("処理時に一部エラーが発生しました:\n" + "\n".join(errors))
 
     def on_files_table_context_menu(self, pos):
-        item = self.files_table.itemAt(pos)
-        if not item:
+        item = self.files_table.indexAt(pos)
+        if not item.isValid():
             return
         row = item.row()
         if row < 0 or row >= len(self.current_file_rows):
@@ -3623,6 +6098,10 @@ class MainWindow(QMainWindow):
             act_rollback = menu.addAction("差し戻し")
             act_history_clear = menu.addAction("History Clear")
             menu.addSeparator()
+        elif selected_count > 1:
+            act_update = menu.addAction(f"一括更新（{selected_count}件）")
+            act_replace = menu.addAction(f"一括差し替え（{selected_count}件）")
+            menu.addSeparator()
         act_delete = menu.addAction("削除")
         act_archive = menu.addAction("アーカイブ")
         action = menu.exec(self.files_table.viewport().mapToGlobal(pos))
@@ -3650,11 +6129,10 @@ class MainWindow(QMainWindow):
             self.warn(f"ファイルを開けませんでした: {e}")
             return
         self.mark_doc_checked(folder_path, doc_key)
-        self.refresh_files_table()
-        self.refresh_folder_table()
-        self.refresh_category_tree()
+        self.refresh_scheduler.mark_folder(folder_path, rescan=False)
+        self.refresh_scheduler.mark_category_tree()
 
-    def on_file_double_clicked(self, item: QTableWidgetItem):
+    def on_file_double_clicked(self, item: QModelIndex):
         row = item.row()
         if row < 0 or row >= len(self.current_file_rows):
             return
@@ -3663,88 +6141,85 @@ class MainWindow(QMainWindow):
         row_info = self.current_file_rows[row]
         self.open_current_file(self.current_folder["path"], row_info.filename, row_info.doc_key)
 
-    def on_file_check_changed(self, item: QTableWidgetItem):
-        if item.column() != 0:
-            return
+    def on_file_check_changed(self, doc_key: str, checked: bool):
         if not self.current_folder:
             return
-        doc_key = item.data(Qt.UserRole)
         if not doc_key:
             return
-        checked = item.checkState() == Qt.Checked
         self.set_doc_checked(self.current_folder["path"], doc_key, checked)
-        name_item = self.files_table.item(item.row(), 1)
-        if name_item:
-            self.set_item_unchecked_style(name_item, not checked)
         self.update_files_header_check_state()
-        self.update_folder_unchecked_cache_for_folder(self.current_folder["path"], self.current_meta)
-        self.schedule_folder_table_refresh(force_scan=False)
-        self.schedule_category_tree_refresh()
+        key = self.folder_key(self.current_folder["path"])
+        self.folder_unchecked_cache[key] = self.unchecked_inbox.has_unchecked(key)
+        self.refresh_scheduler.mark_folder_table()
+        self.refresh_scheduler.mark_category_tree()
 
     def on_files_header_clicked(self, logical_index: int):
         if logical_index != 0:
+            self.sort_files_table(logical_index)
             return
-        header_item = self.files_table.horizontalHeaderItem(0)
-        if not header_item:
-            return
-        if self.files_table.rowCount() == 0:
-            header_item.setCheckState(Qt.Unchecked)
+        if self.files_model.rowCount() == 0:
+            self.files_model.set_header_check_state(Qt.Unchecked)
             return
-        next_state = Qt.Unchecked if header_item.checkState() == Qt.Checked else Qt.Checked
-        header_item.setCheckState(next_state)
+        next_state = Qt.Unchecked if self.files_model.header_check_state() == Qt.Checked else Qt.Checked
+        self.files_model.set_header_check_state(next_state)
         if not self.current_folder:
             return
         folder_path = self.current_folder["path"]
-        self.files_table.blockSignals(True)
-        for row in range(self.files_table.rowCount()):
-            item = self.files_table.item(row, 0)
-            if not item:
-                continue
-            doc_key = item.data(Qt.UserRole)
-            if not doc_key:
-                continue
-            checked = next_state == Qt.Checked
-            item.setCheckState(next_state)
-            self.set_doc_checked(folder_path, doc_key, checked)
-            name_item = self.files_table.item(row, 1)
-            if name_item:
-                self.set_item_unchecked_style(name_item, not checked)
-        self.files_table.blockSignals(False)
+        checked = next_state == Qt.Checked
+        self.files_model.set_all_checked(checked)
+        for row in self.files_model.rows:
+            if row.doc_key:
+                self.set_doc_checked(folder_path, row.doc_key, checked)
         self.update_folder_unchecked_cache_for_folder(folder_path, self.current_meta)
-        self.schedule_folder_table_refresh(force_scan=False)
-        self.schedule_category_tree_refresh()
+        self.refresh_scheduler.mark_folder_table()
+        self.refresh_scheduler.mark_category_tree()
 
     def folder_has_unchecked_cached(self, folder_path: str, force_scan: bool) -> bool:
-        key = self.folder_key(folder_path)
-        if not force_scan and key in self.folder_unchecked_cache:
-            return self.folder_unchecked_cache[key]
-        result = self.folder_has_unchecked(folder_path)
-        self.folder_unchecked_cache[key] = result
-        return result
+        if force_scan or self.folder_key(folder_path) not in self.folder_unchecked_cache:
+            self.request_folder_status(folder_path, force_scan)
+        return self.folder_unchecked_cache.get(self.folder_key(folder_path), False)
+
+    def request_folder_status(self, folder_path: str, force_scan: bool, group: str = "") -> None:
+        """Queue a snapshot of ``folder_path``; the row updates when it lands.
 
-    def folder_latest_date(self, folder_path: str, force_scan: bool) -> str:
+        Without ``force_scan`` a folder whose status is already cached is not
+        queued again. Queued jobs are deduplicated per folder by the pool.
+        """
         key = self.folder_key(folder_path)
-        if not force_scan and key in self.folder_latest_date_cache:
-            return self.folder_latest_date_cache[key]
-        last_date = ""
-        if os.path.isdir(folder_path):
-            try:
-                files = safe_list_files(folder_path, self.ignore_types)
-                latest_mtime = None
-                for filename in files:
-                    file_path = os.path.join(folder_path, filename)
-                    try:
-                        mtime = os.path.getmtime(file_path)
-                    except Exception:
-                        continue
-                    if latest_mtime is None or mtime > latest_mtime:
-                        latest_mtime = mtime
-                if latest_mtime is not None:
-                    last_date = dt.datetime.fromtimestamp(latest_mtime).strftime("%Y-%m-%d")
-            except Exception:
-                pass
-        self.folder_latest_date_cache[key] = last_date
-        return last_date
+        if not force_scan and key in self.folder_missing_cache:
+            return
+        if self.postpone_folder_scan(folder_path):
+            return
+        self.scan_pool.submit(key, scan_folder_cached, folder_path, dict(self.ignore_types), group=group)
+
+    def postpone_folder_scan(self, folder_path: str) -> bool:
+        """While a file operation owns the folder, rebuild it after the operation instead of now."""
+        if not self.file_ops.is_busy(folder_path):
+            return False
+        self._rescan_after_file_ops[self.folder_key(folder_path)] = folder_path
+        return True
+
+    def folder_row_status(self, key: str, highlight_enabled: bool) -> FolderRowStatus:
+        has_unchecked = highlight_enabled and self.folder_unchecked_cache.get(key, False)
+        return FolderRowStatus(
+            last_date=self.folder_latest_date_cache.get(key, FOLDER_STATUS_PLACEHOLDER),
+            has_unchecked=has_unchecked,
+            unchecked_count=self.unchecked_tally.folder_count(key) if has_unchecked else 0,
+            missing=self.folder_missing_cache.get(key, False),
+        )
+
+    def category_row_status(self, path: List[str]) -> FolderRowStatus:
+        if not self.is_category_highlight_enabled_for_path(path):
+            return FolderRowStatus()
+        count = self.unchecked_tally.category_count(path)
+        return FolderRowStatus(has_unchecked=count > 0, unchecked_count=count)
+
+    def update_folder_row_status(self, key: str) -> None:
+        row = self.folder_model.row_for_key(key)
+        entry = self.folder_model.entry(row)
+        if entry is None:
+            return
+        self.folder_model.set_status(row, self.folder_row_status(key, entry.highlight_enabled))
 
     def update_folder_unchecked_cache_for_folder(
         self,
@@ -3759,22 +6234,46 @@ class MainWindow(QMainWindow):
         docs = meta.get("documents", {}) if isinstance(meta, dict) else {}
         if not isinstance(docs, dict):
             return
-        has_unchecked = False
-        for doc_key, info in docs.items():
-            if not isinstance(info, dict) or not info.get("current_file"):
-                continue
-            if not self.doc_is_checked(folder_path, doc_key, info):
-                has_unchecked = True
-                break
-        self.folder_unchecked_cache[self.folder_key(folder_path)] = has_unchecked
+        key = self.folder_key(folder_path)
+        self.unchecked_inbox.set_folder(
+            key,
+            folder_path,
+            (
+                InboxDocument(
+                    doc_key,
+                    str(info.get("current_file", "") or ""),
+                    str(info.get("current_rev", "") or ""),
+                    str(info.get("updated_at", "") or ""),
+                    str(info.get("updated_by", "") or ""),
+                )
+                for doc_key, info in docs.items()
+                if isinstance(info, dict)
+            ),
+            lambda doc_key: self.doc_is_checked(folder_path, doc_key, docs.get(doc_key)),
+        )
+        self.folder_unchecked_cache[key] = self.unchecked_inbox.has_unchecked(key)
 
     def schedule_settings_save(self) -> None:
         if self._settings_save_pending:
             return
         self._settings_save_pending = True
-        QTimer.singleShot(200, self.apply_settings_save)
+        if not self._settings_batch_depth:
+            QTimer.singleShot(200, self.apply_settings_save)
+
+    @contextmanager
+    def settings_batch(self) -> Iterator[None]:
+        """Defer settings writes until the outermost batch ends, then write once."""
+        self._settings_batch_depth += 1
+        try:
+            yield
+        finally:
+            self._settings_batch_depth -= 1
+            if not self._settings_batch_depth:
+                self.apply_settings_save()
 
     def apply_settings_save(self) -> None:
+        if not self._settings_save_pending or self._settings_batch_depth:
+            return
         self._settings_save_pending = False
         save_settings(self.settings)
 
@@ -3789,33 +6288,45 @@ class MainWindow(QMainWindow):
         save_user_checks(self.user_checks)
 
     def closeEvent(self, event):  # noqa: N802
+        self.folder_watcher.stop()
+        # uncommitted copies stop at their next chunk; committed ones finish
+        self.file_ops.shutdown()
+        self.scan_pool.shutdown()
+        self.flush_scan_index()
+        self.scan_index.close()
+        # a folder being written finishes first; the queued ones are dropped
+        self.memo_pool.shutdown(wait=True)
+        self.memo_index.close()
         if self._settings_save_pending:
             self._settings_save_pending = False
             save_settings(self.settings)
         if self._user_checks_save_pending:
             self._user_checks_save_pending = False
             save_user_checks(self.user_checks)
+        print(f"[INFO] Storage writes this session: {WRITE_STATS.summary()}")
         super().closeEvent(event)
 
     def update_files_header_check_state(self):
-        header_item = self.files_table.horizontalHeaderItem(0)
-        if not header_item:
-            return
-        total_rows = self.files_table.rowCount()
-        if total_rows == 0:
-            header_item.setCheckState(Qt.Unchecked)
-            return
-        checked_rows = 0
-        for row in range(total_rows):
-            item = self.files_table.item(row, 0)
-            if item and item.checkState() == Qt.Checked:
-                checked_rows += 1
-        if checked_rows == 0:
-            header_item.setCheckState(Qt.Unchecked)
+        total_rows = self.files_model.rowCount()
+        checked_rows = self.files_model.checked_count()
+        if total_rows == 0 or checked_rows == 0:
+            self.files_model.set_header_check_state(Qt.Unchecked)
         elif checked_rows == total_rows:
-            header_item.setCheckState(Qt.Checked)
+            self.files_model.set_header_check_state(Qt.Checked)
         else:
-            header_item.setCheckState(Qt.PartiallyChecked)
+            self.files_model.set_header_check_state(Qt.PartiallyChecked)
+
+    def sort_files_table(self, column: int) -> None:
+        """Sort by ``column``; clicking the same column again reverses the order."""
+        order = Qt.AscendingOrder
+        if self._files_sort is not None and self._files_sort == (column, Qt.AscendingOrder):
+            order = Qt.DescendingOrder
+        self._files_sort = (column, order)
+        self.files_model.sort(column, order)
+        self.current_file_rows = self.files_model.rows
+        header = self.files_table.horizontalHeader()
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(column, order)
 
     def open_register_dialog(self, initial_categories: Optional[List[str]] = None):
         category_options = self.category_options()
@@ -3894,28 +6405,29 @@ class MainWindow(QMainWindow):
 
         selected_items = preview_dialog.selected_items()
         preview_counts = self.preview_subfolder_counts(root_path, items)
-        for folder_path, count in preview_counts.items():
-            self.set_folder_subfolder_count(folder_path, count)
+        with self.settings_batch():
+            for folder_path, count in preview_counts.items():
+                self.set_folder_subfolder_count(folder_path, count)
+            if selected_items:
+                self.registry.extend(selected_items)
+                save_registry(self.registry)
+                for item in selected_items:
+                    folder_path = item.get("path")
+                    if isinstance(folder_path, str):
+                        count = preview_counts.get(folder_path)
+                        if count is not None:
+                            self.set_folder_subfolder_count(folder_path, count)
+                        else:
+                            self.record_folder_subfolder_count(folder_path)
+                        self.mark_all_docs_checked(folder_path)
+            self.update_new_folder_highlights()
 
         if not selected_items:
-            self.update_new_folder_highlights()
             self.refresh_folder_table()
             self.refresh_category_tree()
             self.info("登録を行いませんでした。")
             return True
 
-        self.registry.extend(selected_items)
-        save_registry(self.registry)
-        for item in selected_items:
-            folder_path = item.get("path")
-            if isinstance(folder_path, str):
-                count = preview_counts.get(folder_path)
-                if count is not None:
-                    self.set_folder_subfolder_count(folder_path, count)
-                else:
-                    self.record_folder_subfolder_count(folder_path)
-                self.mark_all_docs_checked(folder_path)
-        self.update_new_folder_highlights()
         self.refresh_folder_table()
         self.refresh_category_tree()
         self.info(f"{len(selected_items)} 件を一括登録しました。")
@@ -3936,11 +6448,7 @@ class MainWindow(QMainWindow):
         if idx < 0:
             self.warn("フォルダを選択してください。")
             return
-        it = self.folders_table.item(idx, 0)
-        if not it:
-            self.warn("登録情報が見つかりません。")
-            return
-        path = it.data(Qt.UserRole)
+        path = self.folder_row_data(idx)
         if not path:
             self.warn("登録情報が見つかりません。")
             return
@@ -3951,11 +6459,7 @@ class MainWindow(QMainWindow):
         if idx < 0:
             self.warn("フォルダを選択してください。")
             return
-        it = self.folders_table.item(idx, 0)
-        if not it:
-            self.warn("登録情報が見つかりません。")
-            return
-        path = it.data(Qt.UserRole)
+        path = self.folder_row_data(idx)
         if not isinstance(path, str):
             self.warn("フォルダを選択してください。")
             return
@@ -3994,7 +6498,7 @@ class MainWindow(QMainWindow):
             target_root = dest_folder if rel_root == "." else os.path.join(dest_folder, rel_root)
             os.makedirs(target_root, exist_ok=True)
             for filename in filenames:
-                if filename.lower() == META_FILENAME.lower():
+                if filename.lower() in (META_FILENAME.lower(), HISTORY_LOG_FILENAME.lower()):
                     continue
                 if filename.lower() == LEGACY_META_FILENAME.lower():
                     continue
@@ -4006,7 +6510,7 @@ class MainWindow(QMainWindow):
                     skipped.append(os.path.relpath(dest_path, dest_folder))
                     continue
                 try:
-                    shutil.copy2(src_path, dest_path)
+                    copy_file(src_path, dest_path)
                 except Exception as e:
                     errors.append(f"{os.path.relpath(src_path, src_folder)}: {e}")
         return skipped, errors
@@ -4017,15 +6521,13 @@ class MainWindow(QMainWindow):
             self.current_folder = None
             self.current_meta = None
             self.current_file_rows = []
-            self.files_table.setRowCount(0)
+            self.files_model.clear()
             return
 
-        # Determine which registry item matches current filtered table row:
-        # we stored path in tooltip/userrole for the name item
-        it = self.folders_table.item(idx, 0)
-        if not it:
+        # the name column carries the folder path (or the category dict) in UserRole
+        data = self.folder_row_data(idx)
+        if data is None:
             return
-        data = it.data(Qt.UserRole)
         if isinstance(data, dict) and data.get("type") == "category":
             path = data.get("path", [])
             if not isinstance(path, list):
@@ -4033,51 +6535,53 @@ class MainWindow(QMainWindow):
             self.current_folder = None
             self.current_meta = None
             self.current_file_rows = []
-            self.files_table.setRowCount(0)
+            self.files_model.clear()
             tree_item = self.find_category_tree_item(path)
-            if tree_item:
-                self.category_tree.setCurrentItem(tree_item)
-                tree_item.setExpanded(True)
+            if tree_item.isValid():
+                self.category_tree.setCurrentIndex(tree_item)
+                self.category_tree.expand(tree_item)
             return
 
         path = data
-        name = it.text()
+        name = self.folder_model.index(idx, 0).data(Qt.DisplayRole)
         self.current_folder = {"name": name, "path": path}
         self.refresh_files_table()
 
-    def on_folder_double_clicked(self, item: QTableWidgetItem):
-        if item.column() != 0:
+    def on_folder_double_clicked(self, index: QModelIndex):
+        if index.column() != 0:
             return
-        data = item.data(Qt.UserRole)
+        data = index.data(Qt.UserRole)
         if isinstance(data, dict) and data.get("type") == "category":
             path = data.get("path", [])
             if not isinstance(path, list):
                 return
             tree_item = self.find_category_tree_item(path)
-            if tree_item:
-                self.category_tree.setCurrentItem(tree_item)
-                tree_item.setExpanded(True)
+            if tree_item.isValid():
+                self.category_tree.setCurrentIndex(tree_item)
+                self.category_tree.expand(tree_item)
             return
         path = data
         if path and os.path.isdir(path):
             self.open_in_explorer(path)
 
     def on_category_tree_selected(self):
-        items = self.category_tree.selectedItems()
-        if not items:
+        rows = self.category_tree.selectionModel().selectedRows()
+        if not rows:
             return
-        data = items[0].data(0, Qt.UserRole) or {}
+        data = rows[0].data(Qt.UserRole) or {}
         item_type = data.get("type")
         if item_type == "category":
+            self.scan_pool.cancel_pending(FOLDER_TABLE_STATUS_GROUP)
             self.selected_category_path = data.get("path", [])
             self.refresh_folder_table()
         elif item_type == "folder":
+            self.scan_pool.cancel_pending(FOLDER_TABLE_STATUS_GROUP)
             self.selected_category_path = data.get("category_path", [])
             self.refresh_folder_table()
             self.select_folder_in_table(data.get("path", ""))
 
-    def on_category_tree_double_clicked(self, item: QTreeWidgetItem):
-        data = item.data(0, Qt.UserRole) or {}
+    def on_category_tree_double_clicked(self, item: QModelIndex):
+        data = item.data(Qt.UserRole) or {}
         if data.get("type") != "folder":
             return
         path = data.get("path")
@@ -4093,12 +6597,8 @@ class MainWindow(QMainWindow):
         row = self.current_file_rows[idx]
         self.refresh_right_pane_for_doc(row.doc_key)
 
-    def on_history_item_double_clicked(self, item: QTableWidgetItem):
-        row = item.row()
-        data_item = self.hist_table.item(row, 0)
-        if not data_item:
-            return
-        entry = data_item.data(Qt.UserRole)
+    def on_history_item_double_clicked(self, item: QModelIndex):
+        entry = self.hist_model.entry(item.row())
         if not isinstance(entry, dict):
             return
         file_idx = self.selected_file_index()
@@ -4113,6 +6613,8 @@ class MainWindow(QMainWindow):
             self.warn("フォルダを選択してください。")
             return False
         folder_path = self.current_folder["path"]
+        if self.file_operation_pending(folder_path):
+            return False
         meta = load_meta(folder_path)
         docs = meta.get("documents", {})
         info = docs.get(doc_key)
@@ -4122,55 +6624,407 @@ class MainWindow(QMainWindow):
         if entry.get("kind") == "最新":
             info["last_memo"] = memo
         else:
-            history = info.get("history", [])
-            if not isinstance(history, list):
-                self.warn("履歴が見つかりません。")
-                return False
+            rev = entry.get("rev", "")
+            file = entry.get("file", "")
+            inline = info.get("history")
             found = False
-            for item in history:
-                if not isinstance(item, dict):
-                    continue
-                if item.get("rev") == entry.get("rev") and item.get("file") == entry.get("file"):
-                    item["memo"] = memo
-                    found = True
-                    break
+            if isinstance(inline, list):
+                # not yet migrated (e.g. the log could not be written)
+                for item in inline:
+                    if isinstance(item, dict) and item.get("rev") == rev and item.get("file") == file:
+                        item["memo"] = memo
+                        found = True
+                        break
             if not found:
-                self.warn("対象の履歴が見つかりません。")
-                return False
+                if not any(
+                    item["rev"] == rev and item["file"] == file
+                    for item in read_doc_history(folder_path, doc_key)
+                ):
+                    self.warn("対象の履歴が見つかりません。")
+                    return False
+                save_history_ops(folder_path, [memo_op(doc_key, rev, file, memo)])
+                self.schedule_memo_index(folder_path)
+                self.refresh_right_pane_for_doc(doc_key)
+                return True
         docs[doc_key] = info
         meta["documents"] = docs
         save_meta(folder_path, meta)
+        self.schedule_memo_index(folder_path)
         self.current_meta = meta
         self.refresh_right_pane_for_doc(doc_key)
         self.refresh_files_table()
         return True
 
     def on_rescan(self):
+        FOLDER_SNAPSHOTS.invalidate()
         self.update_new_folder_highlights()
         self.refresh_folder_table()
         self.refresh_files_table()
         self.refresh_category_tree()
 
     def startup_rescan(self):
+        self._startup_scan_active = True
+        ignore_types = dict(self.ignore_types)
+        registered_keys: set[str] = set()
+        indexed = self._indexed_folders
+        self._indexed_folders = {}
         for item in self.registry:
             path = item.get("path", "")
-            if path and os.path.isdir(path):
-                scan_folder(path, self.ignore_types)
+            if path:
+                key = self.folder_key(path)
+                registered_keys.add(key)
+                entry = indexed.get(key)
+                if entry is not None:
+                    self.scan_pool.submit(key, revalidate_indexed_folder, path, ignore_types, entry)
+                else:
+                    self.scan_pool.submit(key, scan_folder_cached, path, ignore_types)
+        self.scan_index.retain(registered_keys)
+        for folder_path in self.category_folder_paths().values():
+            key = self.folder_key(folder_path) if folder_path else ""
+            if key and key not in registered_keys:
+                self.scan_pool.submit(key, scan_directory, folder_path)
+        if self.scan_pool.pending_count() == 0:
+            self.on_background_scan_idle()
+
+    def on_background_task_finished(self, key: str, result: Any) -> None:
+        folder_path = self._watch_rescan.pop(key, None)
+        if folder_path is not None:
+            # the result may predate the change; only a scan started after it counts
+            self.on_watched_folder_changed(folder_path)
+            return
+        watched = key in self._watch_pending
+        self._watch_pending.discard(key)
+        if isinstance(result, FolderSnapshot):
+            # queued before the operation started; it left the meta alone
+            self.postpone_folder_scan(result.folder_path)
+            if self.apply_folder_snapshot(result):
+                self.schedule_progressive_refresh()
+            self.update_folder_row_status(key)
+            if watched:
+                self.apply_watched_folder_result(result.folder_path, result.exists, result.subfolder_count)
+        elif isinstance(result, IndexEntry):
+            # indexed folder is unchanged; its cached columns are already shown
+            if self._startup_scan_active:
+                self.scanned_subfolder_counts[key] = result.subfolder_count
+        elif isinstance(result, DirScan):
+            if result.exists and self._startup_scan_active:
+                self.scanned_subfolder_counts[key] = count_scan_subfolders(result)
+            if watched:
+                self.apply_watched_folder_result(result.path, result.exists, count_scan_subfolders(result))
+
+    def on_background_scan_idle(self) -> None:
+        if not self._startup_scan_active:
+            return
+        self._startup_scan_active = False
         self.update_new_folder_highlights()
-        self.refresh_folder_table()
+        self.scanned_subfolder_counts.clear()
+        self._progressive_refresh_timer.stop()
+        self.refresh_folder_table(force_scan=False)
+        self.refresh_category_tree()
+        self._search_warm_timer.start()
+        self.index_all_memos()
+
+    def warm_search_index(self) -> None:
+        if self.search_index.index_pending(SEARCH_WARM_FOLDERS_PER_TICK):
+            self._search_warm_timer.start()
+
+    def apply_folder_snapshot(self, snapshot: FolderSnapshot) -> bool:
+        """Store a snapshot's status columns; True when the tree needs a repaint."""
+        key = self.folder_key(snapshot.folder_path)
+        if snapshot.exists and self._startup_scan_active:
+            self.scanned_subfolder_counts[key] = snapshot.subfolder_count
+        last_date = ""
+        if snapshot.latest_mtime is not None:
+            last_date = dt.datetime.fromtimestamp(snapshot.latest_mtime).strftime("%Y-%m-%d")
+        self.folder_latest_date_cache[key] = last_date
+        self.folder_missing_cache[key] = not snapshot.exists
+        had_unchecked = self.folder_unchecked_cache.get(key)
+        self.update_folder_unchecked_cache_for_folder(snapshot.folder_path, snapshot.meta)
+        self.index_folder_documents(key, snapshot.meta.get("documents", {}))
+        if not self._startup_scan_active:
+            # the startup pass indexes every folder once the scan is done
+            self.schedule_memo_index(snapshot.folder_path)
+        self._scan_index_pending[key] = index_entry_from_snapshot(snapshot)
+        if not self._scan_index_timer.isActive():
+            self._scan_index_timer.start()
+        return self.folder_unchecked_cache.get(key) != had_unchecked
+
+    def apply_index_entry(self, key: str, entry: IndexEntry) -> None:
+        last_date = ""
+        if entry.latest_mtime is not None:
+            last_date = dt.datetime.fromtimestamp(entry.latest_mtime).strftime("%Y-%m-%d")
+        self.folder_latest_date_cache[key] = last_date
+        self.folder_missing_cache[key] = not entry.exists
+        self.unchecked_inbox.set_folder(
+            key,
+            entry.folder_path,
+            (
+                InboxDocument(doc.doc_key, doc.current_file, doc.current_rev, doc.updated_at, doc.updated_by)
+                for doc in entry.documents
+            ),
+            lambda doc_key: self.doc_is_checked(entry.folder_path, doc_key),
+        )
+        self.folder_unchecked_cache[key] = self.unchecked_inbox.has_unchecked(key)
+        self.index_folder_documents(key, entry.documents)
+
+    def index_all_memos(self) -> None:
+        """Bring the memo index up to date with every registered folder."""
+        paths = [
+            item["path"] for item in self.registry
+            if isinstance(item.get("path"), str) and item["path"]
+        ]
+        self.memo_pool.submit(":retain", self.memo_index.retain, {self.folder_key(path) for path in paths})
+        for path in paths:
+            self.schedule_memo_index(path)
+        if self.memo_search_dialog is not None:
+            self.memo_search_dialog.set_building(self.memo_pool.pending_count() > 0)
+
+    def schedule_memo_index(self, folder_path: str) -> None:
+        key = self.folder_key(folder_path)
+        if not self.memo_pool.submit(key, index_folder_memos, self.memo_index, folder_path):
+            # already queued or running; look again once it reports
+            self._memo_reindex[key] = folder_path
+
+    def on_memo_index_finished(self, key: str, result: Any) -> None:
+        folder_path = self._memo_reindex.pop(key, None)
+        if folder_path is not None:
+            self.schedule_memo_index(folder_path)
+        if result is True and self.memo_search_dialog is not None:
+            self.memo_search_dialog.schedule_search()
+        if result is True and self.recent_changes_dialog is not None and self.recent_changes_dialog.isVisible():
+            self._recent_changes_timer.start()
+
+    def on_memo_index_idle(self) -> None:
+        if self.memo_search_dialog is not None:
+            self.memo_search_dialog.set_building(False)
+
+    def memo_record_entries(self, records: List[MemoRecord]) -> List[Dict[str, Any]]:
+        """History-row dicts for memo index records of registered folders."""
+        names = {
+            self.folder_key(item["path"]): str(item.get("name") or item["path"])
+            for item in self.registry
+            if isinstance(item.get("path"), str) and item["path"]
+        }
+        entries = []
+        for record in records:
+            key = self.folder_key(record.folder_path)
+            if key not in names:
+                continue
+            entries.append({
+                "kind": "最新" if record.latest else "履歴",
+                "folder_path": record.folder_path,
+                "folder_name": names[key],
+                "doc_key": record.doc_key,
+                "rev": record.rev,
+                "file": record.file,
+                "updated_at": record.updated_at,
+                "updated_by": record.updated_by,
+                "memo": record.memo,
+            })
+        return entries
+
+    def search_memos(self, text: str, user: str) -> List[Dict[str, Any]]:
+        return self.memo_record_entries(self.memo_index.search(text, user, MEMO_SEARCH_LIMIT))
+
+    def recent_changes_page(
+        self,
+        since: str,
+        after: Optional[Tuple[str, int]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        records, cursor = self.memo_index.recent_changes(since, RECENT_CHANGES_PAGE_SIZE, after)
+        return self.memo_record_entries(records), cursor
+
+    def on_recent_changes(self) -> None:
+        if self.recent_changes_dialog is None:
+            self.recent_changes_dialog = RecentChangesDialog(
+                self.recent_changes_page,
+                self.memo_index.count_changes,
+                self,
+            )
+            self.recent_changes_dialog.open_requested.connect(self.jump_to_document_entry)
+        self.recent_changes_dialog.reload()
+        self.recent_changes_dialog.show()
+        self.recent_changes_dialog.raise_()
+        self.recent_changes_dialog.activateWindow()
+
+    def reload_recent_changes(self) -> None:
+        # a page further down would shift under the user; only the first page follows new revisions
+        if self.recent_changes_dialog is not None and self.recent_changes_dialog.on_first_page():
+            self.recent_changes_dialog.reload()
+
+    def on_memo_search(self) -> None:
+        if self.memo_search_dialog is None:
+            self.memo_search_dialog = MemoSearchDialog(self.search_memos, self)
+            self.memo_search_dialog.open_requested.connect(self.jump_to_document_entry)
+        self.memo_search_dialog.set_building(self.memo_pool.pending_count() > 0)
+        self.memo_search_dialog.show()
+        self.memo_search_dialog.raise_()
+        self.memo_search_dialog.activateWindow()
+
+    def jump_to_document_entry(self, entry: Dict[str, Any]) -> None:
+        """Select the entry's folder and document, then its row in the history pane."""
+        key = self.folder_key(entry["folder_path"])
+        item = next(
+            (
+                item for item in self.registry
+                if isinstance(item.get("path"), str) and item["path"] and self.folder_key(item["path"]) == key
+            ),
+            None,
+        )
+        if item is None:
+            return
+        self.jump_to_search_hit(SearchHit(
+            "document",
+            entry["doc_key"],
+            folder_path=item["path"],
+            category_path=tuple(self.category_path_for_item(item)),
+            doc_key=entry["doc_key"],
+        ))
+        for row in range(self.hist_model.rowCount()):
+            shown = self.hist_model.entry(row)
+            if shown and shown.get("rev") == entry["rev"] and shown.get("file") == entry["file"]:
+                self.hist_table.selectRow(row)
+                break
+
+    def schedule_inbox_refresh(self) -> None:
+        if self.inbox_dialog is not None and self.inbox_dialog.isVisible():
+            self._inbox_timer.start()
+
+    def inbox_entries(self) -> List[Dict[str, Any]]:
+        """Unchecked documents of registered, non-archived folders, newest first."""
+        folders: Dict[str, Tuple[str, List[str]]] = {}
+        for item in self.registry:
+            path = item.get("path")
+            if not isinstance(path, str) or not path:
+                continue
+            categories = self.category_path_for_item(item)
+            if not self.is_archived_path(categories):
+                folders[self.folder_key(path)] = (str(item.get("name") or path), categories)
+        entries = []
+        for folder_path, doc in self.unchecked_inbox.unchecked():
+            folder = folders.get(self.folder_key(folder_path))
+            if folder is None:
+                continue
+            entries.append({
+                "kind": "最新",
+                "folder_path": folder_path,
+                "folder_name": folder[0],
+                "category": " / ".join(folder[1]),
+                "doc_key": doc.doc_key,
+                "file": doc.current_file,
+                "rev": doc.current_rev,
+                "updated_at": doc.updated_at,
+                "updated_by": doc.updated_by,
+            })
+        entries.sort(key=lambda entry: (entry["updated_at"], entry["folder_name"], entry["file"]), reverse=True)
+        return entries
+
+    def refresh_inbox_dialog(self) -> None:
+        self._inbox_timer.stop()
+        if self.inbox_dialog is not None:
+            self.inbox_dialog.set_entries(self.inbox_entries())
+
+    def on_unchecked_inbox(self) -> None:
+        if self.inbox_dialog is None:
+            self.inbox_dialog = UncheckedInboxDialog(self)
+            self.inbox_dialog.open_requested.connect(self.jump_to_document_entry)
+            self.inbox_dialog.check_off_requested.connect(self.check_off_documents)
+        self.refresh_inbox_dialog()
+        self.inbox_dialog.show()
+        self.inbox_dialog.raise_()
+        self.inbox_dialog.activateWindow()
+
+    def check_off_documents(self, entries: List[Dict[str, Any]]) -> None:
+        """Mark many documents checked with a single ``user_checks`` write."""
+        touched: Dict[str, str] = {}
+        for entry in entries:
+            folder_path = entry["folder_path"]
+            key = self.folder_key(folder_path)
+            folder_checks = self.user_checks.get(key)
+            if not isinstance(folder_checks, dict):
+                folder_checks = {}
+                self.user_checks[key] = folder_checks
+            folder_checks[entry["doc_key"]] = True
+            self.unchecked_inbox.set_checked(key, entry["doc_key"], True)
+            touched[key] = folder_path
+        if not touched:
+            return
+        self.schedule_user_checks_save()
+        for key, folder_path in touched.items():
+            self.folder_unchecked_cache[key] = self.unchecked_inbox.has_unchecked(key)
+            self.update_folder_row_status(key)
+            if self.current_folder and self.folder_key(self.current_folder["path"]) == key:
+                self.refresh_scheduler.mark_folder(folder_path, rescan=False)
+        self.refresh_scheduler.mark_category_tree()
+
+    def flush_scan_index(self) -> None:
+        self._scan_index_timer.stop()
+        pending = self._scan_index_pending
+        self._scan_index_pending = {}
+        self.scan_index.put_many(pending)
+
+    def sync_folder_watches(self) -> None:
+        registered = [
+            item["path"] for item in self.registry
+            if isinstance(item.get("path"), str) and item["path"]
+        ]
+        others = [
+            folder_path for folder_path in self.category_folder_paths().values()
+            if isinstance(folder_path, str) and folder_path
+        ]
+        signature = (tuple(registered), tuple(others))
+        if signature == self._watch_signature:
+            return
+        self._watch_signature = signature
+        self._watched_registered_keys = {self.folder_key(path) for path in registered}
+        self.folder_watcher.set_folders(registered, others)
+
+    def on_watched_folder_changed(self, folder_path: str) -> None:
+        key = self.folder_key(folder_path)
+        self._watch_pending.add(key)
+        if key in self._watched_registered_keys:
+            FOLDER_SNAPSHOTS.invalidate(folder_path)
+            if self.postpone_folder_scan(folder_path):
+                return
+            submitted = self.scan_pool.submit(key, scan_folder_cached, folder_path, dict(self.ignore_types))
+        else:
+            submitted = self.scan_pool.submit(key, scan_directory, folder_path)
+        if not submitted:
+            # already queued or running; look again once it reports
+            self._watch_rescan[key] = folder_path
+
+    def apply_watched_folder_result(self, folder_path: str, exists: bool, subfolder_count: int) -> None:
+        if exists and self.update_new_folder_highlight(folder_path, subfolder_count):
+            self.refresh_scheduler.mark_folder_table()
+            self.refresh_scheduler.mark_category_tree()
+        if (
+            exists
+            and self.current_folder
+            and self.folder_key(self.current_folder["path"]) == self.folder_key(folder_path)
+        ):
+            # another client may have rewritten the meta or touched _History
+            self.refresh_files_table()
+
+    def schedule_progressive_refresh(self) -> None:
+        if not self._progressive_refresh_timer.isActive():
+            self._progressive_refresh_timer.start()
+
+    def apply_progressive_refresh(self) -> None:
         self.refresh_category_tree()
 
     def on_options(self):
-        dlg = OptionsDialog(self.memo_timeout_min, self.ignore_types, self.version_rules, self)
+        dlg = OptionsDialog(self.memo_timeout_min, self.ignore_types, self.version_rules, self.history_dedup, self)
         if dlg.exec() != QDialog.Accepted:
             return
         self.memo_timeout_min = dlg.get_timeout_min()
         self.ignore_types = normalize_ignore_types(dlg.get_ignore_types())
         self.version_rules = normalize_version_rules(dlg.get_version_rules())
+        self.history_dedup = dlg.get_history_dedup()
         self.settings["memo_timeout_min"] = self.memo_timeout_min
         self.settings["ignore_types"] = self.ignore_types
         self.settings["version_rules"] = self.version_rules
-        save_settings(self.settings)
+        self.settings["history_dedup"] = self.history_dedup
+        self.schedule_settings_save()
         self.refresh_folder_table()
         self.refresh_files_table()
         self.info("設定を保存しました。")
@@ -4204,6 +7058,44 @@ class MainWindow(QMainWindow):
         self.refresh_files_table()
         self.info(f"キャッシュクリアが完了しました。settings: {settings_removed}件, user_checks: {user_checks_removed}件")
 
+    def on_history_store_report(self) -> List[FileOperation]:
+        """
+        Measure ``_History`` of every registered folder on the file-operation
+        queue, sharing identical files first when the option is on, and show
+        the space saved per folder once all are done.
+        """
+        targets = [
+            (item.get("name", "") or item["path"], item["path"])
+            for item in self.registry
+            if isinstance(item.get("path"), str) and os.path.isdir(os.path.join(item["path"], "_History"))
+        ]
+        if not targets:
+            self.info("履歴のあるフォルダがありません。")
+            return []
+        applied = self.history_dedup
+        results: Dict[str, Any] = {}
+
+        def report_ready(folder_path: str, report: Any) -> None:
+            results[folder_path] = report
+            if len(results) == len(targets):
+                rows = [(name, results[folder_path]) for name, folder_path in targets]
+                HistoryStoreReportDialog(rows, applied, self).exec()
+
+        ops = []
+        for name, folder_path in targets:
+            history_dir = os.path.join(folder_path, "_History")
+            op = FileOperation(
+                folder_path,
+                f"履歴の容量: {name}",
+                0,
+                lambda op, history_dir=history_dir: dedupe_history(history_dir, dry_run=not applied),
+                on_done=lambda report, folder_path=folder_path: report_ready(folder_path, report),
+                on_error=lambda error, folder_path=folder_path: report_ready(folder_path, error),
+            )
+            self.file_ops.submit(op)
+            ops.append(op)
+        return ops
+
     # ---------- core operations ----------
     def _get_selected_doc(self) -> Optional[Tuple[str, str, Dict[str, Any]]]:
         """
@@ -4258,15 +7150,14 @@ class MainWindow(QMainWindow):
                 skipped_files.append(dest_name)
                 continue
             try:
-                shutil.copy2(path, dest_path)
+                copy_file(path, dest_path)
                 added_files.append(dest_name)
             except Exception as e:
                 error_messages.append(f"{dest_name}: {e}")
 
         if added_files:
-            self.refresh_files_table()
-            self.refresh_folder_table()
-            self.refresh_category_tree()
+            self.refresh_scheduler.mark_folder(folder_path)
+            self.refresh_scheduler.mark_category_tree()
         if skipped_files:
             self.warn("同名ファイルが存在するため追加できませんでした:\n" + "\n".join(sorted(set(skipped_files))))
         if error_messages:
@@ -4284,11 +7175,16 @@ class MainWindow(QMainWindow):
     def on_files_dropped(self, paths: List[str]):
         self.add_files_to_current_folder(paths)
 
-    def on_update(self):
+    def on_update(self) -> Optional[FileOperation]:
+        if len(self.selected_file_doc_keys()) > 1:
+            self.on_batch_revision("update")
+            return None
         sel = self._get_selected_doc()
         if not sel:
             return
         folder_path, doc_key, info = sel
+        if self.file_operation_pending(folder_path, doc_key):
+            return
 
         cur_fn = info.get("current_file", "")
         cur_rev = info.get("current_rev", "")
@@ -4311,8 +7207,6 @@ class MainWindow(QMainWindow):
         new_rev = format_rev(A, B, C, today_yyyymmdd())
         new_fn = f"{doc_base_no_ext}_{new_rev}{ext}"
 
-        history_dir = ensure_history_dir(folder_path)
-
         cur_path = os.path.join(folder_path, cur_fn)
         new_path = os.path.join(folder_path, new_fn)
 
@@ -4323,72 +7217,178 @@ class MainWindow(QMainWindow):
             self.warn("新規ファイル名が既に存在します。再度実行してください（Cが進みます）。")
             return
 
-        try:
-            # 1) copy current -> new
-            shutil.copy2(cur_path, new_path)
-
-            # 2) move old current -> _History
-            hist_name = cur_fn
-            hist_path = os.path.join(history_dir, hist_name)
-            # avoid collision in _History
-            if os.path.exists(hist_path):
-                ts = dt.datetime.now().strftime("%Y%m%d%H%M%S")
-                hist_name = f"{split_name_ext(cur_fn)[0]}_{ts}{split_name_ext(cur_fn)[1]}"
-                hist_path = os.path.join(history_dir, hist_name)
-            shutil.move(cur_path, hist_path)
-
-            # 3) update meta
-            meta = load_meta(folder_path)
-            docs = meta.get("documents", {})
-            if doc_key not in docs:
-                docs[doc_key] = {
-                    "title": doc_key,
-                    "current_file": new_fn,
-                    "current_rev": new_rev,
-                    "updated_at": now_iso(),
-                    "updated_by": user_name(),
-                    "last_memo": submission_memo,
-                    "history": [],
-                }
-            else:
-                d = docs[doc_key]
-                # push previous current into history list
-                prev_entry = {
-                    "rev": cur_rev,
-                    "file": hist_name,
-                    "updated_at": d.get("updated_at", ""),
-                    "updated_by": d.get("updated_by", ""),
-                    "memo": d.get("last_memo", ""),
-                }
-                d.setdefault("history", [])
-                if isinstance(d["history"], list):
-                    d["history"].append(prev_entry)
-
-                d["current_file"] = new_fn
-                d["current_rev"] = new_rev
-                d["updated_at"] = now_iso()
-                d["updated_by"] = user_name()
-                d["last_memo"] = submission_memo
+        # copy current -> new, move old current -> _History, update meta
+        return self.submit_revision_plan(RevisionPlan(
+            kind="update",
+            folder_path=folder_path,
+            doc_key=doc_key,
+            current_file=cur_fn,
+            current_rev=cur_rev,
+            source_path=cur_path,
+            new_file=new_fn,
+            new_rev=new_rev,
+            memo=submission_memo,
+            open_after=not submission_checked,
+        ))
+
+    def on_batch_revision(self, mode: str) -> List[FileOperation]:
+        """Update or replace every selected document with one version bump and memo."""
+        if not self.current_folder or not self.current_meta:
+            self.warn("フォルダを選択してください。")
+            return []
+        folder_path = self.current_folder["path"]
+        docs = self.current_meta.get("documents", {})
+        entries = []
+        for doc_key in self.selected_file_doc_keys():
+            info = docs.get(doc_key)
+            if isinstance(info, dict) and info.get("current_file"):
+                entries.append((doc_key, info))
+        if not entries:
+            self.warn("対象ファイル（最新）を選択してください。")
+            return []
+        if any(self.file_ops.is_busy(folder_path, doc_key) for doc_key, _info in entries):
+            self.warn("選択した文書の処理が完了するまでお待ちください。")
+            return []
 
-            meta["documents"] = docs
-            save_meta(folder_path, meta)
-            self.mark_doc_checked(folder_path, doc_key)
+        dlg = BatchRevisionDialog(entries, self.version_rules, mode, self)
+        if dlg.exec() != QDialog.Accepted:
+            return []
+        mode = dlg.selected_mode()
+        bump = dlg.selected_bump()
+        memo = dlg.memo_text()
+        today = today_yyyymmdd()
 
-            # Refresh
-            self.refresh_files_table()
-            self.refresh_folder_table()
-            self.refresh_category_tree()
+        plans: List[RevisionPlan] = []
+        skipped: List[str] = []
+        for doc_key, info in entries:
+            cur_fn = info.get("current_file", "")
+            cur_rev = info.get("current_rev", "")
+            cur_path = os.path.join(folder_path, cur_fn)
+            source_path = cur_path if mode == "update" else dlg.incoming.get(doc_key, "")
+            if not os.path.exists(cur_path):
+                skipped.append(f"{cur_fn}: 現行ファイルが見つかりません")
+                continue
+            if not source_path or not os.path.exists(source_path):
+                skipped.append(f"{cur_fn}: 差し替えるファイルが選択されていません")
+                continue
+            doc_base, _ver_tuple, _rev_str = parse_rev_from_filename(cur_fn)
+            doc_base_no_ext, ext = split_name_ext(doc_base)
+            new_rev = format_rev(*next_rev_with_bump(cur_rev, bump), today)
+            new_fn = f"{doc_base_no_ext}_{new_rev}{ext}"
+            if os.path.exists(os.path.join(folder_path, new_fn)):
+                skipped.append(f"{cur_fn}: 新規ファイル名 {new_fn} が既に存在します")
+                continue
+            plans.append(RevisionPlan(
+                kind=mode,
+                folder_path=folder_path,
+                doc_key=doc_key,
+                current_file=cur_fn,
+                current_rev=cur_rev,
+                source_path=source_path,
+                new_file=new_fn,
+                new_rev=new_rev,
+                memo=memo,
+                open_after=False,
+            ))
+        if skipped:
+            message = "次のファイルは処理できません:\n" + "\n".join(skipped)
+            if not plans:
+                self.warn(message)
+                return []
+            if not self.ask(f"{message}\n\n残り {len(plans)} 件を処理しますか？"):
+                return []
+        return self.submit_revision_plans(plans)
+
+    def recover_journal(self) -> None:
+        """Finish or undo the operations a crash interrupted; reads only the journal."""
+        results: Dict[str, int] = {}
+        for entry in self.journal.pending():
+            if entry.data.get("kind") != "revision":
+                continue
+            try:
+                result = recover_revision(entry)
+            except Exception as e:
+                # kept for the next start, e.g. while the synced drive is offline
+                print(f"[WARN] Failed to recover interrupted operation: {entry.path} ({e})")
+                continue
+            results[result] = results.get(result, 0) + 1
+        if results:
+            print(
+                "[INFO] Recovered interrupted operations: "
+                f"rolled_forward={results.get('rolled_forward', 0)}, rolled_back={results.get('rolled_back', 0)}"
+            )
 
-            if not submission_checked:
-                # Open the new file for convenience
+    def file_operation_pending(self, folder_path: str, doc_key: Optional[str] = None) -> bool:
+        """Warn and return True while a queued operation still owns the document (or the folder)."""
+        if not self.file_ops.is_busy(folder_path, doc_key):
+            return False
+        target = "この文書" if doc_key is not None else "このフォルダ"
+        self.warn(f"{target}の処理が完了するまでお待ちください。")
+        return True
+
+    def submit_revision_plan(self, plan: RevisionPlan) -> FileOperation:
+        """Queue ``plan`` on the file-operation queue; rows are patched when it completes."""
+        return self.submit_revision_plans([plan])[0]
+
+    def submit_revision_plans(self, plans: List[RevisionPlan]) -> List[FileOperation]:
+        """Queue one operation per folder; each copies concurrently and writes its meta once."""
+        groups: Dict[str, List[RevisionPlan]] = {}
+        for plan in plans:
+            groups.setdefault(normalize_folder_key(plan.folder_path), []).append(plan)
+        ops = []
+        for group in groups.values():
+            total_bytes = 0
+            for plan in group:
                 try:
-                    os.startfile(new_path)  # type: ignore[attr-defined]
-                except Exception:
+                    total_bytes += os.path.getsize(plan.source_path)
+                except OSError:
                     pass
-                self.start_file_lock_watch(new_path, folder_path, doc_key)
+            verb = REVISION_VERBS.get(group[0].kind, group[0].kind)
+            target = group[0].doc_key if len(group) == 1 else f"{len(group)}件"
+            op = FileOperation(
+                group[0].folder_path,
+                f"{verb}: {target}",
+                total_bytes,
+                lambda op, group=group: run_revision_plans(group, op, self.journal, self.history_dedup),
+                on_done=lambda changes, group=group: self.on_revision_plans_done(group, changes),
+                on_error=lambda error, group=group: self.on_revision_plan_failed(group[0], error),
+                doc_keys=[plan.doc_key for plan in group],
+            )
+            self.file_ops.submit(op)
+            ops.append(op)
+        return ops
+
+    def on_revision_plans_done(self, plans: List[RevisionPlan], changes: List[RevisionChange]) -> None:
+        # the check marks are saved by one deferred write, the rows by one scheduler pass
+        for plan in plans:
+            self.mark_doc_checked(plan.folder_path, plan.doc_key)
+        for change in changes:
+            self.refresh_scheduler.mark_revision(change)
+        for plan in plans:
+            if not plan.open_after:
+                continue
+            # Open the new file for convenience
+            try:
+                os.startfile(plan.new_path)  # type: ignore[attr-defined]
+            except Exception:
+                pass
+            self.start_file_lock_watch(plan.new_path, plan.folder_path, plan.doc_key)
 
-        except Exception as e:
-            self.warn(f"更新に失敗しました: {e}")
+    def on_revision_plan_failed(self, plan: RevisionPlan, error: BaseException) -> None:
+        if isinstance(error, OperationCancelled):
+            return
+        self.warn(f"{REVISION_VERBS.get(plan.kind, plan.kind)}に失敗しました: {error}")
+
+    def on_file_operation_finished(self, op: FileOperation) -> None:
+        if op.state == "cancelled":
+            self.statusBar().showMessage(f"{op.label} を中止しました", 5000)
+        elif op.state == "done":
+            self.statusBar().showMessage(f"{op.label} が完了しました", 5000)
+        key = self.folder_key(op.folder_path)
+        if key in self._rescan_after_file_ops and not self.file_ops.is_busy(op.folder_path):
+            folder_path = self._rescan_after_file_ops.pop(key)
+            FOLDER_SNAPSHOTS.invalidate(folder_path)
+            self.scan_pool.submit(key, scan_folder_cached, folder_path, dict(self.ignore_types))
 
     def on_view(self):
         sel = self._get_selected_doc()
@@ -4401,11 +7401,16 @@ class MainWindow(QMainWindow):
             return
         self.open_current_file(folder_path, cur_fn, doc_key)
 
-    def on_replace(self):
+    def on_replace(self) -> Optional[FileOperation]:
+        if len(self.selected_file_doc_keys()) > 1:
+            self.on_batch_revision("replace")
+            return None
         sel = self._get_selected_doc()
         if not sel:
             return
         folder_path, doc_key, info = sel
+        if self.file_operation_pending(folder_path, doc_key):
+            return
 
         cur_fn = info.get("current_file", "")
         cur_rev = info.get("current_rev", "")
@@ -4421,8 +7426,6 @@ class MainWindow(QMainWindow):
             self.warn("差し替えるファイルを選択してください。")
             return
 
-        history_dir = ensure_history_dir(folder_path)
-
         cur_path = os.path.join(folder_path, cur_fn)
         if not os.path.exists(cur_path):
             self.warn("現行ファイルが見つかりません。")
@@ -4441,70 +7444,29 @@ class MainWindow(QMainWindow):
             self.warn("新規ファイル名が既に存在します。再度実行してください（Cが進みます）。")
             return
 
-        try:
-            # 1) move old current -> _History
-            hist_name = cur_fn
-            hist_path = os.path.join(history_dir, hist_name)
-            if os.path.exists(hist_path):
-                ts = dt.datetime.now().strftime("%Y%m%d%H%M%S")
-                hist_name = f"{split_name_ext(cur_fn)[0]}_{ts}{split_name_ext(cur_fn)[1]}"
-                hist_path = os.path.join(history_dir, hist_name)
-            shutil.move(cur_path, hist_path)
-
-            # 2) copy incoming -> dest
-            shutil.copy2(incoming_path, dest_path)
-
-            # 3) update meta
-            meta = load_meta(folder_path)
-            docs = meta.get("documents", {})
-            d = docs.get(doc_key, {
-                "title": doc_key,
-                "current_file": dest_fn,
-                "current_rev": new_rev,
-                "updated_at": now_iso(),
-                "updated_by": user_name(),
-                "last_memo": memo,
-                "history": [],
-            })
-
-            prev_entry = {
-                "rev": cur_rev,
-                "file": hist_name,
-                "updated_at": d.get("updated_at", ""),
-                "updated_by": d.get("updated_by", ""),
-                "memo": d.get("last_memo", ""),
-            }
-            d.setdefault("history", [])
-            if isinstance(d["history"], list):
-                d["history"].append(prev_entry)
-
-            d["current_file"] = dest_fn
-            d["current_rev"] = new_rev
-            d["updated_at"] = now_iso()
-            d["updated_by"] = user_name()
-            d["last_memo"] = memo
-
-            docs[doc_key] = d
-            meta["documents"] = docs
-            save_meta(folder_path, meta)
-            self.mark_doc_checked(folder_path, doc_key)
-
-            # Refresh
-            self.refresh_files_table()
-            self.refresh_folder_table()
-            self.refresh_category_tree()
-
-        except Exception as e:
-            self.warn(f"差し替えに失敗しました: {e}")
-
-    def on_rollback(self):
+        # copy incoming -> dest, move old current -> _History, update meta
+        return self.submit_revision_plan(RevisionPlan(
+            kind="replace",
+            folder_path=folder_path,
+            doc_key=doc_key,
+            current_file=cur_fn,
+            current_rev=cur_rev,
+            source_path=incoming_path,
+            new_file=dest_fn,
+            new_rev=new_rev,
+            memo=memo,
+        ))
+
+    def on_rollback(self) -> Optional[FileOperation]:
         sel = self._get_selected_doc()
         if not sel:
             return
         folder_path, doc_key, info = sel
+        if self.file_operation_pending(folder_path, doc_key):
+            return
 
-        history_items = info.get("history", [])
-        if not isinstance(history_items, list) or not history_items:
+        history_items = self.doc_history_items(folder_path, doc_key, info)
+        if not history_items:
             self.warn("差し戻し対象の履歴がありません。")
             return
 
@@ -4540,76 +7502,34 @@ class MainWindow(QMainWindow):
         new_rev = format_rev(A, B, C, today_yyyymmdd())
         new_fn = f"{doc_base_no_ext}_{new_rev}{ext}"
         new_path = os.path.join(folder_path, new_fn)
-        cur_path = os.path.join(folder_path, cur_fn)
 
         if os.path.exists(new_path):
             self.warn("新規ファイル名が既に存在します。再度実行してください（Cが進みます）。")
             return
 
-        try:
-            # 1) move old current -> _History
-            hist_name = cur_fn
-            hist_path = os.path.join(history_dir, hist_name)
-            if os.path.exists(hist_path):
-                ts = dt.datetime.now().strftime("%Y%m%d%H%M%S")
-                hist_name = f"{split_name_ext(cur_fn)[0]}_{ts}{split_name_ext(cur_fn)[1]}"
-                hist_path = os.path.join(history_dir, hist_name)
-            shutil.move(cur_path, hist_path)
-
-            # 2) copy selected history -> new current
-            shutil.copy2(history_path, new_path)
-
-            # 3) update meta
-            meta = load_meta(folder_path)
-            docs = meta.get("documents", {})
-            d = docs.get(doc_key, {
-                "title": doc_key,
-                "current_file": new_fn,
-                "current_rev": new_rev,
-                "updated_at": now_iso(),
-                "updated_by": user_name(),
-                "last_memo": "",
-                "history": [],
-            })
-
-            prev_entry = {
-                "rev": cur_rev,
-                "file": hist_name,
-                "updated_at": d.get("updated_at", ""),
-                "updated_by": d.get("updated_by", ""),
-                "memo": d.get("last_memo", ""),
-            }
-            d.setdefault("history", [])
-            if isinstance(d["history"], list):
-                d["history"].append(prev_entry)
-
-            d["current_file"] = new_fn
-            d["current_rev"] = new_rev
-            d["updated_at"] = now_iso()
-            d["updated_by"] = user_name()
-            rollback_rev = history_entry.get("rev", "")
-            d["last_memo"] = f"差し戻し: {display_rev(rollback_rev)}"
-
-            docs[doc_key] = d
-            meta["documents"] = docs
-            save_meta(folder_path, meta)
-            self.mark_doc_checked(folder_path, doc_key)
-
-            self.refresh_files_table()
-            self.refresh_folder_table()
-            self.refresh_category_tree()
-            self.refresh_right_pane_for_doc(doc_key)
-
-        except Exception as e:
-            self.warn(f"差し戻しに失敗しました: {e}")
+        # copy selected history -> new current, move old current -> _History, update meta
+        rollback_rev = history_entry.get("rev", "")
+        return self.submit_revision_plan(RevisionPlan(
+            kind="rollback",
+            folder_path=folder_path,
+            doc_key=doc_key,
+            current_file=cur_fn,
+            current_rev=cur_rev,
+            source_path=history_path,
+            new_file=new_fn,
+            new_rev=new_rev,
+            memo=f"差し戻し: {display_rev(rollback_rev)}",
+        ))
 
     def on_history_clear(self):
         sel = self._get_selected_doc()
         if not sel:
             return
         folder_path, doc_key, info = sel
-        history_items = info.get("history", [])
-        if not isinstance(history_items, list) or not history_items:
+        if self.file_operation_pending(folder_path, doc_key):
+            return
+        history_items = self.doc_history_items(folder_path, doc_key, info)
+        if not history_items:
             self.warn("削除できる履歴がありません。")
             return
         history_dir = ensure_history_dir(folder_path)
@@ -4645,6 +7565,8 @@ class MainWindow(QMainWindow):
                 errors.append(f"{fname}: {e}")
 
         if deleted_files:
+            # blobs whose last history file went are removed with it
+            collect_garbage(history_dir)
             self.refresh_right_pane_for_doc(doc_key)
 
         if errors:
@@ -4772,9 +7694,7 @@ class MainWindow(QMainWindow):
             docs[watch_state.doc_key] = doc
             meta["documents"] = docs
             save_meta(watch_state.folder_path, meta)
-            self.refresh_files_table()
-            self.refresh_folder_table()
-            self.refresh_right_pane_for_doc(watch_state.doc_key)
+            self.refresh_scheduler.mark_doc(watch_state.folder_path, watch_state.doc_key)
 
 
     def on_copy_bug_report(self):
@@ -4786,6 +7706,7 @@ class MainWindow(QMainWindow):
             f"config_dir: {config_dir()}",
             f"logs_dir: {logs_dir()}",
             f"cache_dir: {cache_dir()}",
+            f"storage_writes: {WRITE_STATS.summary()}",
         ]
         report = "\n".join(report_lines)
         clipboard = QApplication.clipboard()
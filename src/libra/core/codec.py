@@ -0,0 +1,55 @@
+"""JSON encoding/decoding with an optional fast backend.
+
+``orjson`` is used when it is importable; otherwise, and for any value orjson
+refuses (non-string keys, integers beyond 64 bits), the stdlib ``json``
+module is used. Pretty output is byte-identical between the two backends for
+strings, integers, booleans, lists and dicts, so files written by either
+compare equal on disk. Floats are not: orjson writes ``1e16`` and ``1.5e-7``
+where the stdlib writes ``1e+16`` and ``1.5e-07``, so payloads containing a
+float are always encoded by the stdlib.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, List, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # let the stdlib decide (and report) on anything orjson rejects
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def _contains_float(data: Any) -> bool:
+    stack: List[Any] = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def dumps_indented(data: Any) -> bytes:
+    """UTF-8, two-space indented JSON with ``\\n`` line breaks."""
+    if orjson is not None and not _contains_float(data):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
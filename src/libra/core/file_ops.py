@@ -0,0 +1,184 @@
+"""Cancellable file copies with progress for the update/replace/rollback pipelines.
+
+A copy reports the bytes written so far through ``progress`` and asks
+``cancelled`` between chunks. A cancelled or failed copy removes the partial
+target it created and raises, so the folder is left as it was before the
+operation started.
+
+The data is moved by the cheapest primitive the platform and file system
+accept, tried in ``COPY_METHODS`` order:
+
+- ``clone``: a reflink (``FICLONE``) on Btrfs, XFS and other CoW file
+  systems; the new file shares the source's blocks until either is written.
+- ``copy_file_range``: an in-kernel copy, server-side on NFS 4.2 and SMB3.
+- ``sendfile``: an in-kernel copy without user-space buffers.
+- ``buffered``: plain reads and writes, which work everywhere.
+
+A method that is refused is skipped before it wrote anything; one that
+fails halfway hands over to the next at the current offset. Metadata is
+copied afterwards with ``shutil.copystat``, as ``shutil.copy2`` does.
+"""
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Optional, Sequence
+
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+COPY_METHODS = ("clone", "copy_file_range", "sendfile", "buffered")
+
+# _IOW(0x94, 9, int) from linux/fs.h
+_FICLONE = 0x40049409
+# errors meaning "not here", as opposed to a failing disk or a full volume
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+    errno.ENOTTY,
+    errno.ENOTSOCK,
+    errno.EPERM,
+}
+
+ProgressCallback = Callable[[int], None]
+
+
+class OperationCancelled(Exception):
+    """Raised inside a pipeline when the user cancelled it before its commit point."""
+
+
+@dataclass(frozen=True)
+class CopyResult:
+    size: int
+    method: str  # the method that wrote the last bytes
+
+
+def _unsupported(error: OSError) -> bool:
+    return error.errno in _UNSUPPORTED_ERRNOS
+
+
+def _clone(fsrc: BinaryIO, fdst: BinaryIO) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError as e:
+        if _unsupported(e):
+            return False
+        raise
+    return True
+
+
+def _kernel_copy(
+    fsrc: BinaryIO,
+    fdst: BinaryIO,
+    method: str,
+    done: int,
+    step: Callable[[int], None],
+    chunk_size: int,
+) -> int:
+    """Copy from the current offsets until EOF; returns the new offset, or raises ``OSError`` when refused."""
+    src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+    while True:
+        step(done)
+        if method == "copy_file_range":
+            n = os.copy_file_range(src_fd, dst_fd, chunk_size)
+        else:
+            n = os.sendfile(dst_fd, src_fd, None, chunk_size)
+        if not n:
+            return done
+        done += n
+
+
+def _buffered_copy(
+    fsrc: BinaryIO,
+    fdst: BinaryIO,
+    done: int,
+    step: Callable[[int], None],
+    chunk_size: int,
+) -> int:
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        step(done)
+        n = fsrc.readinto(buffer)
+        if not n:
+            return done
+        written = 0
+        while written < n:
+            written += fdst.write(view[written:n])
+        done += n
+
+
+def copy_file(
+    src: str,
+    dst: str,
+    progress: Optional[ProgressCallback] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+    chunk_size: int = COPY_CHUNK_SIZE,
+    methods: Sequence[str] = COPY_METHODS,
+) -> CopyResult:
+    """
+    Copy ``src`` to the new file ``dst`` like ``shutil.copy2``. ``dst`` must
+    not exist yet; it is never overwritten. ``methods`` restricts the
+    primitives tried; ``"buffered"`` is always the last resort.
+    """
+    created = False
+    reported = -1
+
+    def step(done: int) -> None:
+        nonlocal reported
+        if progress is not None and done != reported:
+            reported = done
+            progress(done)
+        if cancelled is not None and cancelled():
+            raise OperationCancelled(dst)
+
+    try:
+        # unbuffered, so the kernel copies and the reads share one file offset
+        with open(src, "rb", buffering=0) as fsrc, open(dst, "xb", buffering=0) as fdst:
+            created = True
+            size = os.fstat(fsrc.fileno()).st_size
+            done = 0
+            method = "buffered"
+            for candidate in methods:
+                if candidate == "buffered":
+                    break
+                if candidate == "clone":
+                    step(0)
+                    if _clone(fsrc, fdst):
+                        done, method = size, "clone"
+                        break
+                    continue
+                if not hasattr(os, candidate):
+                    continue
+                try:
+                    done = _kernel_copy(fsrc, fdst, candidate, done, step, chunk_size)
+                except OSError as e:
+                    if not _unsupported(e):
+                        raise
+                    # resume from the offsets the failed method left behind
+                    done = fsrc.tell()
+                    fdst.seek(done)
+                    continue
+                method = candidate
+                break
+            if method == "buffered":
+                done = _buffered_copy(fsrc, fdst, done, step, chunk_size)
+            step(done)
+        shutil.copystat(src, dst)
+    except BaseException:
+        if created:
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+        raise
+    return CopyResult(done, method)
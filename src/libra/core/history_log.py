@@ -0,0 +1,188 @@
+"""Append-only revision history per folder.
+
+History used to live inline in ``.libra_meta.json`` and was rewritten on every
+revision. It now lives in ``.libra_history.jsonl`` next to the meta, one JSON
+operation per line:
+
+``{"op": "append", "doc": <doc_key>, "entry": {rev, file, updated_at, updated_by, memo}}``
+    a revision moved to ``_History``
+``{"op": "memo", "doc": <doc_key>, "rev": ..., "file": ..., "memo": ...}``
+    the memo of an existing entry was edited
+``{"op": "drop_doc", "doc": <doc_key>}``
+    the document was removed; its earlier entries no longer apply
+
+Readers replay the operations of one document only; lines that do not
+mention the document are skipped before parsing. Memo edits and dropped
+documents leave stale lines behind, which ``compact_history_log`` folds away.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from .codec import loads
+from .storage import write_bytes_atomic
+
+HISTORY_LOG_FILENAME = ".libra_history.jsonl"
+# rewrite the log once this many memo/drop lines have piled up
+HISTORY_COMPACT_STALE_LINES = 64
+
+HISTORY_ENTRY_FIELDS = ("rev", "file", "updated_at", "updated_by", "memo")
+
+
+def history_log_path(folder_path: str) -> str:
+    return os.path.join(folder_path, HISTORY_LOG_FILENAME)
+
+
+def history_entry(data: Dict[str, Any]) -> Dict[str, str]:
+    return {field: str(data.get(field, "") or "") for field in HISTORY_ENTRY_FIELDS}
+
+
+def append_op(doc_key: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {"op": "append", "doc": doc_key, "entry": history_entry(entry)}
+
+
+def memo_op(doc_key: str, rev: str, file: str, memo: str) -> Dict[str, Any]:
+    return {"op": "memo", "doc": doc_key, "rev": rev, "file": file, "memo": memo}
+
+
+def drop_doc_op(doc_key: str) -> Dict[str, Any]:
+    return {"op": "drop_doc", "doc": doc_key}
+
+
+def _encode_line(op: Dict[str, Any]) -> bytes:
+    return (json.dumps(op, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def append_history_ops(folder_path: str, ops: Iterable[Dict[str, Any]]) -> None:
+    """Append ``ops`` with a single write; raises ``OSError`` on failure."""
+    data = b"".join(_encode_line(op) for op in ops)
+    if not data:
+        return
+    path = history_log_path(folder_path)
+    with open(path, "ab") as f:
+        if f.tell() > 0:
+            # a crash may have left a partial last line; never glue onto it
+            with open(path, "rb") as tail:
+                tail.seek(-1, os.SEEK_END)
+                if tail.read(1) != b"\n":
+                    data = b"\n" + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_lines(folder_path: str) -> List[bytes]:
+    try:
+        with open(history_log_path(folder_path), "rb") as f:
+            return f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        print(f"[WARN] Failed to read history log: {history_log_path(folder_path)} ({e})")
+        return []
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        op = loads(line)
+    except ValueError:
+        return None
+    if not isinstance(op, dict) or not isinstance(op.get("doc"), str):
+        return None
+    return op
+
+
+def _apply(history: List[Dict[str, str]], op: Dict[str, Any]) -> List[Dict[str, str]]:
+    kind = op.get("op")
+    if kind == "append" and isinstance(op.get("entry"), dict):
+        history.append(history_entry(op["entry"]))
+    elif kind == "memo":
+        for item in history:
+            if item["rev"] == op.get("rev") and item["file"] == op.get("file"):
+                item["memo"] = str(op.get("memo", "") or "")
+                break
+    elif kind == "drop_doc":
+        return []
+    return history
+
+
+def read_doc_history(folder_path: str, doc_key: str) -> List[Dict[str, str]]:
+    """Return the history of ``doc_key``, oldest first."""
+    needle = json.dumps(doc_key, ensure_ascii=False).encode("utf-8")
+    history: List[Dict[str, str]] = []
+    for line in _read_lines(folder_path):
+        if needle not in line:
+            continue
+        op = _parse(line)
+        if op is not None and op["doc"] == doc_key:
+            history = _apply(history, op)
+    return history
+
+
+def read_all_history(folder_path: str) -> Dict[str, List[Dict[str, str]]]:
+    histories: Dict[str, List[Dict[str, str]]] = {}
+    for line in _read_lines(folder_path):
+        op = _parse(line)
+        if op is None:
+            continue
+        histories[op["doc"]] = _apply(histories.get(op["doc"], []), op)
+    return {doc_key: items for doc_key, items in histories.items() if items}
+
+
+def history_log_needs_compaction(folder_path: str) -> bool:
+    stale = 0
+    for line in _read_lines(folder_path):
+        if b'"op": "append"' not in line:
+            stale += 1
+    return stale >= HISTORY_COMPACT_STALE_LINES
+
+
+def compact_history_log(folder_path: str) -> None:
+    """Rewrite the log as plain appends of the surviving entries."""
+    histories = read_all_history(folder_path)
+    data = b"".join(
+        _encode_line(append_op(doc_key, entry))
+        for doc_key, items in histories.items()
+        for entry in items
+    )
+    write_bytes_atomic(history_log_path(folder_path), data)
+
+
+def migrate_inline_history(folder_path: str, docs: Dict[str, Any]) -> bool:
+    """
+    Move ``history`` lists still stored in the meta into the log.
+    Entries already present in the log are not appended twice, so an
+    interrupted migration can simply run again. Returns True when ``docs``
+    was changed and the meta needs saving.
+    """
+    # an empty inline list is harmless and not worth a meta rewrite
+    pending = {
+        doc_key: info["history"]
+        for doc_key, info in docs.items()
+        if isinstance(info, dict) and info.get("history")
+    }
+    if not pending:
+        return False
+    logged = read_all_history(folder_path)
+    ops: List[Dict[str, Any]] = []
+    for doc_key, items in pending.items():
+        if not isinstance(items, list):
+            continue
+        seen = {(e["rev"], e["file"]) for e in logged.get(doc_key, [])}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            entry = history_entry(item)
+            if (entry["rev"], entry["file"]) in seen:
+                continue
+            ops.append(append_op(doc_key, entry))
+    try:
+        append_history_ops(folder_path, ops)
+    except OSError as e:
+        print(f"[WARN] Failed to migrate history: {history_log_path(folder_path)} ({e})")
+        return False
+    for doc_key in pending:
+        docs[doc_key].pop("history", None)
+    return True
@@ -0,0 +1,167 @@
+"""Content-addressed store that shares identical files in ``_History``.
+
+Many history files are byte-identical: a rollback copies a history file back
+as the current one, and an update copies the current file unchanged, so the
+same content reaches ``_History`` again under another name. The store keeps
+one blob per content in ``_History/.store``, named by its SHA-256, and turns
+every history file with that content into a hardlink to the blob.
+
+History files stay ordinary files under their own names, so the history log,
+rollback, History Clear and export read them as before. Deleting a history
+file only drops one link; ``collect_garbage`` removes blobs no history file
+links to any more.
+
+Hardlinks only save space on the volume itself. OneDrive/SharePoint sync does
+not know them: every link and every blob is uploaded as a separate file, so
+on a synced folder the store costs cloud space instead of saving it. The
+store is therefore opt-in; ``dedupe_history(..., dry_run=True)`` reports what
+it would save without touching the folder.
+"""
+from __future__ import annotations
+
+import errno
+import filecmp
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Set, Tuple
+
+STORE_DIR_NAME = ".store"
+HASH_CHUNK_SIZE = 1024 * 1024
+_LINK_SUFFIX = ".libra-link"
+# errors meaning "this volume has no hardlinks", as opposed to a failing disk
+_UNSUPPORTED_ERRNOS = {errno.EPERM, errno.EINVAL, errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS, errno.EMLINK}
+
+
+@dataclass
+class StoreReport:
+    files: int = 0  # history files examined
+    total_bytes: int = 0  # their size as listed
+    stored_bytes: int = 0  # their size on disk, shared content counted once
+    linked: int = 0  # files this pass turned into links
+    supported: bool = True  # False when the volume refused hardlinks
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.total_bytes - self.stored_bytes
+
+
+def store_dir(history_dir: str) -> str:
+    return os.path.join(history_dir, STORE_DIR_NAME)
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb", buffering=0) as f:
+        buffer = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def _history_files(history_dir: str) -> List[os.DirEntry]:
+    try:
+        with os.scandir(history_dir) as it:
+            return [
+                entry for entry in it
+                if entry.is_file(follow_symlinks=False) and not entry.name.endswith(_LINK_SUFFIX)
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def _stat(entry: os.DirEntry) -> os.stat_result:
+    # DirEntry.stat() leaves st_ino, st_dev and st_nlink zero on Windows
+    return os.stat(entry.path, follow_symlinks=False)
+
+
+def _blobs(history_dir: str) -> Dict[Tuple[int, int], str]:
+    """Blob digest per (device, inode), so linked history files are not hashed again."""
+    blobs: Dict[Tuple[int, int], str] = {}
+    for entry in _history_files(store_dir(history_dir)):
+        st = _stat(entry)
+        blobs[(st.st_dev, st.st_ino)] = entry.name
+    return blobs
+
+
+def _link_to_blob(blob: str, path: str) -> None:
+    """Replace ``path`` by a link to ``blob`` in one rename, so it never goes missing."""
+    tmp = path + _LINK_SUFFIX
+    os.link(blob, tmp)
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _try_link(report: StoreReport, link: Callable[[str, str], None], src: str, dst: str) -> bool:
+    """Run ``link(src, dst)``; False, and the report marked unsupported, when the volume has no hardlinks."""
+    try:
+        link(src, dst)
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_ERRNOS:
+            raise
+        report.supported = False
+        return False
+    return True
+
+
+def dedupe_history(history_dir: str, dry_run: bool = False) -> StoreReport:
+    """
+    Link every history file in ``history_dir`` to the blob of its content,
+    adding blobs for new content. With ``dry_run`` nothing is changed and
+    the report tells what the store would save.
+    """
+    report = StoreReport()
+    blobs = _blobs(history_dir)
+    blob_by_digest = {digest: content for content, digest in blobs.items()}
+    counted: Set[object] = set()
+    link = not dry_run
+    for entry in _history_files(history_dir):
+        st = _stat(entry)
+        report.files += 1
+        report.total_bytes += st.st_size
+        content: object = (st.st_dev, st.st_ino)
+        if content not in blobs and st.st_size > 0:
+            digest = file_digest(entry.path)
+            blob = os.path.join(store_dir(history_dir), digest)
+            if not link:
+                content = blob_by_digest.get(digest, digest)
+            elif digest in blob_by_digest:
+                # a digest match is not trusted blindly: the blob may have been edited in place
+                if filecmp.cmp(blob, entry.path, shallow=False) and _try_link(report, _link_to_blob, blob, entry.path):
+                    report.linked += 1
+                    content = blob_by_digest[digest]
+            else:
+                os.makedirs(store_dir(history_dir), exist_ok=True)
+                if _try_link(report, os.link, entry.path, blob):
+                    blobs[content] = digest
+                    blob_by_digest[digest] = content
+            link = link and report.supported
+        if content not in counted:
+            counted.add(content)
+            report.stored_bytes += st.st_size
+    if not dry_run:
+        collect_garbage(history_dir)
+    return report
+
+
+def collect_garbage(history_dir: str) -> int:
+    """Remove blobs that no history file links to any more; returns the bytes freed."""
+    freed = 0
+    for entry in _history_files(store_dir(history_dir)):
+        st = _stat(entry)
+        if st.st_nlink > 1:
+            continue
+        try:
+            os.remove(entry.path)
+        except OSError as e:
+            print(f"[WARN] Failed to remove unused history blob: {entry.path} ({e})")
+            continue
+        freed += st.st_size
+    return freed
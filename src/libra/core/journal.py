@@ -0,0 +1,123 @@
+"""Write-ahead journal for multi-step file operations.
+
+An operation that copies, moves and then writes the meta cannot be made
+atomic on a synced folder, so it records what it is about to do instead.
+Each running operation owns one small JSON file in the journal directory;
+its ``phase`` is rewritten (atomically, fsync'ed) before every step that
+changes the folder, and the file is removed once the operation finished or
+was rolled back. After a crash the files left over are exactly the
+operations to repair, so startup recovery reads one directory instead of
+rescanning every registered folder.
+
+The journal lives in the local app data rather than in the folders: a
+synced folder would hand a half-done operation to other machines.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from .codec import loads as json_loads
+from .storage import write_json_atomic
+
+JOURNAL_SUFFIX = ".journal.json"
+
+
+class JournalEntry:
+    """One operation's record; ``data["phase"]`` is the last step it announced."""
+
+    def __init__(self, journal: "OperationJournal", path: Optional[str], data: Dict[str, Any]):
+        self._journal = journal
+        self.path = path
+        self.data = data
+
+    @property
+    def phase(self) -> str:
+        return str(self.data.get("phase", ""))
+
+    def advance(self, phase: str, **fields: Any) -> None:
+        """Record ``phase`` (and ``fields``) before running the step it names."""
+        self.data.update(fields)
+        self.data["phase"] = phase
+        self._journal._write(self)
+
+    def finish(self) -> None:
+        """The operation completed or was rolled back; forget it."""
+        self._journal._remove(self)
+
+
+class OperationJournal:
+    """
+    Journal files in ``directory``. Writes that fail are reported once and
+    the operation carries on unjournaled, as it did before the journal
+    existed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._warned = False
+
+    def _warn(self, action: str, path: str, error: OSError) -> None:
+        with self._lock:
+            if self._warned:
+                return
+            self._warned = True
+        print(f"[WARN] Failed to {action} operation journal: {path} ({error})")
+
+    def begin(self, kind: str, **fields: Any) -> JournalEntry:
+        """Record a new operation; the entry is on disk before the caller's first step."""
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}{JOURNAL_SUFFIX}")
+        data = {"kind": kind, "started_at": time.time(), **fields}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            self._warn("create", self.directory, e)
+            return JournalEntry(self, None, data)
+        entry = JournalEntry(self, path, data)
+        self._write(entry)
+        return entry
+
+    def pending(self) -> List[JournalEntry]:
+        """Entries left by operations that never finished, oldest first."""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(JOURNAL_SUFFIX)]
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            self._warn("read", self.directory, e)
+            return []
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    data = json_loads(f.read())
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Skipped unreadable journal entry: {path} ({e})")
+                continue
+            if isinstance(data, dict):
+                entries.append(JournalEntry(self, path, data))
+        entries.sort(key=lambda entry: entry.data.get("started_at", 0))
+        return entries
+
+    def _write(self, entry: JournalEntry) -> None:
+        if entry.path is None:
+            return
+        try:
+            write_json_atomic(entry.path, entry.data)
+        except OSError as e:
+            self._warn("write", entry.path, e)
+
+    def _remove(self, entry: JournalEntry) -> None:
+        if entry.path is None:
+            return
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self._warn("remove", entry.path, e)
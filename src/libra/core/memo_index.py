@@ -0,0 +1,324 @@
+"""Persistent full-text index over revision memos.
+
+Every revision of every registered folder (the current one from the meta and
+the ones in the history log) is stored as a row together with its memo, rev
+and ``updated_by``. The searchable text is normalized (NFKC, casefolded) and
+split into tokens: runs of letters and digits become words, runs of kana and
+kanji become overlapping bigrams plus their single characters, since
+Japanese memos have no spaces and a one-character query must find a
+character wherever it sits in a run.
+
+A query looks up its most selective token by prefix and verifies every term
+as a substring of the candidates' text, so ``"Rev-B 図面"`` finds memos that
+contain both ``rev-b`` and ``図面`` regardless of how they were tokenized.
+Folders are replaced as a whole, keyed by the meta and history log stamps
+they were read from, so unchanged folders are skipped on the next pass.
+
+Since every revision carries its ``updated_at``, the same rows also serve
+the recent-changes feed: an index on ``updated_at`` pages through "changes
+since T" newest first without touching any meta.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Set, Tuple
+
+from .scan import Stamp, join_stamp, split_stamp
+
+SCHEMA_VERSION = 2
+
+# (updated_at, row id) of the last row on a page of recent changes
+ChangeCursor = Tuple[str, int]
+
+_CJK = "\u3005\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_RE = re.compile(f"[{_CJK}]+|[^\\W_{_CJK}]+")
+_CJK_RE = re.compile(f"[{_CJK}]")
+# upper bound for prefix ranges over the token index
+_MAX_CHAR = "\U0010ffff"
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def tokenize(text: str) -> Set[str]:
+    """Words, CJK bigrams and CJK characters of already normalized ``text``."""
+    tokens: Set[str] = set()
+    for run in _TOKEN_RE.findall(text):
+        if len(run) > 1 and _CJK_RE.match(run):
+            tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+            tokens.update(run)
+        else:
+            tokens.add(run)
+    return tokens
+
+
+@dataclass(frozen=True)
+class MemoRecord:
+    folder_path: str
+    doc_key: str
+    rev: str
+    file: str
+    updated_at: str
+    updated_by: str
+    memo: str
+    latest: bool = False
+
+    def search_text(self) -> str:
+        return normalize_text(f"{self.memo}\n{self.rev}\n{self.updated_by}")
+
+
+class MemoIndex:
+    """
+    SQLite-backed memo index keyed by normalized folder path. It is filled
+    from a worker thread and queried from the GUI thread; one lock
+    serializes both, and a folder is written in a single transaction.
+    Failures are reported once and turn the index into a no-op.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._warned = False
+
+    def _warn(self, action: str, error: sqlite3.Error) -> None:
+        if not self._warned:
+            self._warned = True
+            print(f"[WARN] Failed to {action} memo index: {self.path} ({error})")
+
+    def open(self) -> bool:
+        try:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.executescript(
+                    "DROP TABLE IF EXISTS tokens; DROP TABLE IF EXISTS revisions; DROP TABLE IF EXISTS folders;"
+                )
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS folders (
+                    key TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    meta_mtime_ns INTEGER,
+                    meta_size INTEGER,
+                    log_mtime_ns INTEGER,
+                    log_size INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS revisions (
+                    id INTEGER PRIMARY KEY,
+                    folder_key TEXT NOT NULL,
+                    folder_path TEXT NOT NULL,
+                    doc_key TEXT NOT NULL,
+                    rev TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    updated_by TEXT NOT NULL,
+                    memo TEXT NOT NULL,
+                    latest INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    user_text TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS revisions_folder ON revisions (folder_key);
+                CREATE INDEX IF NOT EXISTS revisions_updated ON revisions (updated_at);
+                CREATE TABLE IF NOT EXISTS tokens (
+                    token TEXT NOT NULL,
+                    revision_id INTEGER NOT NULL,
+                    PRIMARY KEY (token, revision_id)
+                ) WITHOUT ROWID;
+                """
+            )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[WARN] Failed to open memo index: {self.path} ({e})")
+            return False
+        self._conn = conn
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stamps(self, key: str) -> Optional[Tuple[Stamp, Stamp]]:
+        """``(meta_stamp, log_stamp)`` the folder was indexed from, or None."""
+        with self._lock:
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT meta_mtime_ns, meta_size, log_mtime_ns, log_size FROM folders WHERE key = ?",
+                    (key,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._warn("read", e)
+                return None
+        if row is None:
+            return None
+        return join_stamp(row[0], row[1]), join_stamp(row[2], row[3])
+
+    def replace_folder(
+        self,
+        key: str,
+        folder_path: str,
+        meta_stamp: Stamp,
+        log_stamp: Stamp,
+        records: Iterable[MemoRecord],
+    ) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._delete_folder(key)
+                    self._conn.execute(
+                        "INSERT INTO folders VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, folder_path, *split_stamp(meta_stamp), *split_stamp(log_stamp)),
+                    )
+                    tokens: List[Tuple[str, int]] = []
+                    for record in records:
+                        text = record.search_text()
+                        cursor = self._conn.execute(
+                            "INSERT INTO revisions (folder_key, folder_path, doc_key, rev, file, updated_at,"
+                            " updated_by, memo, latest, text, user_text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (
+                                key,
+                                folder_path,
+                                record.doc_key,
+                                record.rev,
+                                record.file,
+                                record.updated_at,
+                                record.updated_by,
+                                record.memo,
+                                int(record.latest),
+                                text,
+                                normalize_text(record.updated_by),
+                            ),
+                        )
+                        tokens.extend((token, cursor.lastrowid) for token in tokenize(text))
+                    self._conn.executemany("INSERT OR IGNORE INTO tokens VALUES (?, ?)", tokens)
+            except sqlite3.Error as e:
+                self._warn("write", e)
+
+    def _delete_folder(self, key: str) -> None:
+        # tokens are found again from the stored text, which spares an index on revision_id
+        rows = self._conn.execute("SELECT id, text FROM revisions WHERE folder_key = ?", (key,)).fetchall()
+        self._conn.executemany(
+            "DELETE FROM tokens WHERE token = ? AND revision_id = ?",
+            [(token, revision_id) for revision_id, text in rows for token in tokenize(text)],
+        )
+        self._conn.execute("DELETE FROM revisions WHERE folder_key = ?", (key,))
+        self._conn.execute("DELETE FROM folders WHERE key = ?", (key,))
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Drop folders that are no longer registered."""
+        keep = set(keys)
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                stored = [row[0] for row in self._conn.execute("SELECT key FROM folders")]
+                stale = [key for key in stored if key not in keep]
+                if stale:
+                    with self._conn:
+                        for key in stale:
+                            self._delete_folder(key)
+            except sqlite3.Error as e:
+                self._warn("prune", e)
+
+    def _token_count(self, token: str) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM tokens WHERE token >= ? AND token < ?",
+            (token, token + _MAX_CHAR),
+        ).fetchone()[0]
+
+    def search(self, query: str, user: str = "", limit: int = 500) -> List[MemoRecord]:
+        """
+        Revisions whose memo, rev or ``updated_by`` contain every
+        whitespace-separated term of ``query`` and whose ``updated_by``
+        contains ``user``; newest first.
+        """
+        terms = normalize_text(query).split()
+        user = normalize_text(user).strip()
+        if not terms and not user:
+            return []
+        tokens = set()
+        for term in terms + ([user] if user else []):
+            tokens.update(tokenize(term))
+        clauses: List[str] = []
+        params: List[object] = []
+        with self._lock:
+            if self._conn is None:
+                return []
+            try:
+                if tokens:
+                    # one range lookup narrows the rows; the substring checks decide
+                    best = min(tokens, key=self._token_count)
+                    clauses.append("id IN (SELECT revision_id FROM tokens WHERE token >= ? AND token < ?)")
+                    params += [best, best + _MAX_CHAR]
+                for term in terms:
+                    clauses.append("instr(text, ?) > 0")
+                    params.append(term)
+                if user:
+                    clauses.append("instr(user_text, ?) > 0")
+                    params.append(user)
+                rows = self._conn.execute(
+                    "SELECT folder_path, doc_key, rev, file, updated_at, updated_by, memo, latest"
+                    f" FROM revisions WHERE {' AND '.join(clauses)}"
+                    " ORDER BY updated_at DESC, id DESC LIMIT ?",
+                    (*params, limit),
+                ).fetchall()
+            except sqlite3.Error as e:
+                self._warn("read", e)
+                return []
+        return [MemoRecord(*row[:7], latest=bool(row[7])) for row in rows]
+
+    def count_changes(self, since: str) -> int:
+        with self._lock:
+            if self._conn is None:
+                return 0
+            try:
+                return self._conn.execute(
+                    "SELECT COUNT(*) FROM revisions WHERE updated_at >= ?", (since,)
+                ).fetchone()[0]
+            except sqlite3.Error as e:
+                self._warn("read", e)
+                return 0
+
+    def recent_changes(
+        self,
+        since: str,
+        limit: int,
+        after: Optional[ChangeCursor] = None,
+    ) -> Tuple[List[MemoRecord], Optional[ChangeCursor]]:
+        """
+        Revisions with ``updated_at >= since``, newest first, one page at a
+        time. Pass the returned cursor as ``after`` for the next page; it is
+        None on the last page.
+        """
+        clauses = ["updated_at >= ?"]
+        params: List[object] = [since]
+        if after is not None:
+            clauses.append("(updated_at, id) < (?, ?)")
+            params += list(after)
+        with self._lock:
+            if self._conn is None:
+                return [], None
+            try:
+                rows = self._conn.execute(
+                    "SELECT folder_path, doc_key, rev, file, updated_at, updated_by, memo, latest, id"
+                    f" FROM revisions WHERE {' AND '.join(clauses)}"
+                    " ORDER BY updated_at DESC, id DESC LIMIT ?",
+                    (*params, limit + 1),
+                ).fetchall()
+            except sqlite3.Error as e:
+                self._warn("read", e)
+                return [], None
+        cursor = (rows[limit - 1][4], rows[limit - 1][8]) if len(rows) > limit else None
+        return [MemoRecord(*row[:7], latest=bool(row[7])) for row in rows[:limit]], cursor
@@ -44,6 +44,19 @@ def user_checks_path() -> Path:
     return cache_dir() / "user_checks.json"
 
 
+def scan_index_path() -> Path:
+    return cache_dir() / "scan_index.sqlite3"
+
+
+def memo_index_path() -> Path:
+    return cache_dir() / "memo_index.sqlite3"
+
+
+def journal_dir() -> Path:
+    # not under cache_dir: a cache clear must never drop unfinished operations
+    return appdata_root() / "journal"
+
+
 def runtime_libra_dir() -> Path:
     if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
         return Path(getattr(sys, "_MEIPASS")) / "libra"
@@ -0,0 +1,100 @@
+"""Single-pass directory scanning.
+
+Every listing Libra needs (document names, the file/folder split, sizes and
+modification times) is taken from one ``os.scandir`` pass so that synced or
+network folders are not stat'ed once per question.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# (mtime_ns, size) of a path, or None when it is missing
+Stamp = Optional[Tuple[int, int]]
+
+@dataclass(frozen=True)
+class FileStat:
+    size: int
+    mtime: float
+
+
+@dataclass
+class DirScan:
+    path: str
+    exists: bool
+    files: Dict[str, FileStat] = field(default_factory=dict)
+    dirs: List[str] = field(default_factory=list)
+
+
+def latest_mtime(files: Dict[str, FileStat]) -> Optional[float]:
+    latest: Optional[float] = None
+    for stat in files.values():
+        if latest is None or stat.mtime > latest:
+            latest = stat.mtime
+    return latest
+
+
+def _entry_stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    try:
+        return entry.stat()
+    except OSError:
+        pass
+    try:
+        # broken symlinks still count as files, like os.listdir + os.path.isdir did
+        return entry.stat(follow_symlinks=False)
+    except OSError:
+        return None
+
+
+def scan_directory(folder_path: str) -> DirScan:
+    """List ``folder_path`` once, splitting files from folders.
+
+    Sizes and mtimes come from the ``DirEntry`` cache (free on Windows, one
+    ``stat`` per file elsewhere). A missing folder yields ``exists=False``;
+    other listing errors yield an existing but empty scan.
+    """
+    files: Dict[str, FileStat] = {}
+    dirs: List[str] = []
+    try:
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    dirs.append(entry.name)
+                    continue
+                st = _entry_stat(entry)
+                if st is None:
+                    files[entry.name] = FileStat(size=0, mtime=0.0)
+                else:
+                    files[entry.name] = FileStat(size=st.st_size, mtime=st.st_mtime)
+    except (FileNotFoundError, NotADirectoryError):
+        return DirScan(path=folder_path, exists=False)
+    except OSError:
+        return DirScan(path=folder_path, exists=os.path.isdir(folder_path))
+    return DirScan(path=folder_path, exists=True, files=files, dirs=dirs)
+
+
+def path_stamp(path: str) -> Stamp:
+    """Return ``(mtime_ns, size)`` for ``path``, or ``None`` when it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def split_stamp(stamp: Stamp) -> Tuple[Optional[int], Optional[int]]:
+    """``stamp`` as two nullable columns."""
+    if stamp is None:
+        return None, None
+    return stamp[0], stamp[1]
+
+
+def join_stamp(mtime_ns: Optional[int], size: Optional[int]) -> Stamp:
+    if mtime_ns is None or size is None:
+        return None
+    return int(mtime_ns), int(size)
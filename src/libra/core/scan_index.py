@@ -0,0 +1,158 @@
+"""Persistent per-folder scan index.
+
+What a folder scan derives (document list, latest mtime, subfolder count) is
+kept in an SQLite file together with the directory and meta stamps it was
+derived from, so a warm start can render before any folder is rescanned and
+only folders whose stamps moved need a real scan.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from .scan import Stamp, join_stamp, split_stamp
+
+SCHEMA_VERSION = 2
+
+
+@dataclass(frozen=True)
+class IndexedDocument:
+    doc_key: str
+    current_file: str
+    current_rev: str
+    updated_at: str = ""
+    updated_by: str = ""
+
+
+@dataclass
+class IndexEntry:
+    folder_path: str
+    exists: bool
+    dir_stamp: Stamp
+    meta_stamp: Stamp
+    ignore_key: str
+    latest_mtime: Optional[float]
+    subfolder_count: int
+    documents: List[IndexedDocument] = field(default_factory=list)
+
+
+class ScanIndex:
+    """
+    SQLite-backed store of ``IndexEntry`` rows keyed by normalized folder path.
+    Failures are reported once and turn the index into a no-op, so a broken
+    cache file never blocks startup.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def open(self) -> bool:
+        try:
+            conn = sqlite3.connect(self.path)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS folders")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS folders (
+                    key TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    folder_exists INTEGER NOT NULL,
+                    dir_mtime_ns INTEGER,
+                    dir_size INTEGER,
+                    meta_mtime_ns INTEGER,
+                    meta_size INTEGER,
+                    ignore_key TEXT NOT NULL,
+                    latest_mtime REAL,
+                    subfolder_count INTEGER NOT NULL,
+                    documents TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[WARN] Failed to open scan index: {self.path} ({e})")
+            return False
+        self._conn = conn
+        return True
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load_all(self) -> Dict[str, IndexEntry]:
+        if self._conn is None:
+            return {}
+        try:
+            rows = self._conn.execute(
+                "SELECT key, path, folder_exists, dir_mtime_ns, dir_size, meta_mtime_ns, meta_size,"
+                " ignore_key, latest_mtime, subfolder_count, documents FROM folders"
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"[WARN] Failed to read scan index: {self.path} ({e})")
+            return {}
+        entries: Dict[str, IndexEntry] = {}
+        for row in rows:
+            try:
+                documents = [IndexedDocument(*doc) for doc in json.loads(row[10])]
+            except (ValueError, TypeError):
+                continue
+            entries[row[0]] = IndexEntry(
+                folder_path=row[1],
+                exists=bool(row[2]),
+                dir_stamp=join_stamp(row[3], row[4]),
+                meta_stamp=join_stamp(row[5], row[6]),
+                ignore_key=row[7],
+                latest_mtime=row[8],
+                subfolder_count=int(row[9]),
+                documents=documents,
+            )
+        return entries
+
+    def put_many(self, entries: Dict[str, IndexEntry]) -> None:
+        if self._conn is None or not entries:
+            return
+        params = []
+        for key, entry in entries.items():
+            documents = json.dumps(
+                [[d.doc_key, d.current_file, d.current_rev, d.updated_at, d.updated_by] for d in entry.documents],
+                ensure_ascii=False,
+            )
+            params.append((
+                key,
+                entry.folder_path,
+                int(entry.exists),
+                *split_stamp(entry.dir_stamp),
+                *split_stamp(entry.meta_stamp),
+                entry.ignore_key,
+                entry.latest_mtime,
+                entry.subfolder_count,
+                documents,
+            ))
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    params,
+                )
+        except sqlite3.Error as e:
+            print(f"[WARN] Failed to write scan index: {self.path} ({e})")
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Drop entries for folders that are no longer registered."""
+        if self._conn is None:
+            return
+        keep = set(keys)
+        try:
+            stored = [row[0] for row in self._conn.execute("SELECT key FROM folders")]
+            stale = [(key,) for key in stored if key not in keep]
+            if stale:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM folders WHERE key = ?", stale)
+        except sqlite3.Error as e:
+            print(f"[WARN] Failed to prune scan index: {self.path} ({e})")
@@ -0,0 +1,255 @@
+"""In-memory search over registered folders, categories and documents.
+
+Every searchable text is normalized (NFKC, casefolded) and split into
+trigrams over the text padded with ``\\0`` on both ends. A query term of three
+or more characters intersects the posting sets of its trigrams; shorter terms
+take the union of the grams that contain them, so one or two kanji still
+work. The padded grams double as a prefix index: ``"\\0" + term[:2]`` lists
+the texts that start with the term, which rank first.
+
+Documents are matched by doc key (the file name without its rev part) and
+are indexed lazily, by ``index_pending`` or on the next search, so feeding
+thousands of folders at startup only stores their document lists.
+"""
+from __future__ import annotations
+
+import heapq
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+KIND_ORDER = {"folder": 0, "category": 1, "document": 2}
+_PAD = "\0"
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"{_PAD}{text}{_PAD}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str  # "folder", "category" or "document"
+    label: str
+    folder_path: str = ""
+    category_path: Tuple[str, ...] = ()
+    doc_key: str = ""
+
+
+@dataclass
+class _Entry:
+    hit: SearchHit
+    text: str
+    order: Tuple[int, int, str, int]
+
+
+class SearchIndex:
+    """
+    Trigram index of ``SearchHit`` targets. Folders are keyed by their
+    normalized path; their documents are replaced as a whole whenever a scan
+    of the folder lands. Not thread-safe; the GUI thread owns it.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, _Entry] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._next_id = 0
+        self._folders: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        self._folder_ids: Dict[str, int] = {}
+        self._category_ids: Dict[Tuple[str, ...], int] = {}
+        self._documents: Dict[str, Dict[str, str]] = {}  # folder key -> doc key -> file
+        self._document_ids: Dict[str, List[int]] = {}
+        self._stale_documents: Set[str] = set()
+
+    def __len__(self) -> int:
+        self.index_pending()
+        return len(self._entries)
+
+    # ---------- maintenance ----------
+    def _add(self, hit: SearchHit, text: str) -> int:
+        entry_id = self._next_id
+        self._next_id += 1
+        normalized = normalize_text(text)
+        order = (KIND_ORDER.get(hit.kind, len(KIND_ORDER)), len(hit.label), hit.label, entry_id)
+        self._entries[entry_id] = _Entry(hit, normalized, order)
+        postings = self._postings
+        for gram in trigrams(normalized):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {entry_id}
+            else:
+                ids.add(entry_id)
+        return entry_id
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for gram in trigrams(entry.text):
+            ids = self._postings.get(gram)
+            if ids is None:
+                continue
+            ids.discard(entry_id)
+            if not ids:
+                del self._postings[gram]
+
+    def set_folders(self, folders: Iterable[Tuple[str, str, str, Iterable[str]]]) -> None:
+        """
+        Replace the folder set with ``(key, name, path, category_path)``
+        tuples. Unchanged folders keep their entries; folders that are gone
+        lose their documents too.
+        """
+        wanted: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        for key, name, path, category_path in folders:
+            wanted[key] = (name, path, tuple(category_path))
+        for key in list(self._folders):
+            if key not in wanted:
+                self.remove_folder(key)
+        for key, value in wanted.items():
+            if self._folders.get(key) == value:
+                continue
+            self._remove(self._folder_ids.pop(key, -1))
+            name, path, category_path = value
+            self._folders[key] = value
+            self._folder_ids[key] = self._add(
+                SearchHit("folder", name, folder_path=path, category_path=category_path),
+                name,
+            )
+            # document hits carry the folder's path and categories
+            if key in self._documents:
+                self._stale_documents.add(key)
+
+    def remove_folder(self, key: str) -> None:
+        self._folders.pop(key, None)
+        self._remove(self._folder_ids.pop(key, -1))
+        self._drop_document_entries(key)
+        self._documents.pop(key, None)
+        self._stale_documents.discard(key)
+
+    def set_categories(self, paths: Iterable[Iterable[str]]) -> None:
+        wanted = {tuple(path) for path in paths if path}
+        for path in list(self._category_ids):
+            if path not in wanted:
+                self._remove(self._category_ids.pop(path))
+        for path in wanted:
+            if path not in self._category_ids:
+                self._category_ids[path] = self._add(
+                    SearchHit("category", " / ".join(path), category_path=path),
+                    " ".join(path),
+                )
+
+    def set_documents(self, folder_key: str, documents: Iterable[Tuple[str, str]]) -> None:
+        """Replace the ``(doc_key, current_file)`` pairs of one folder."""
+        documents = dict(documents)
+        if self._documents.get(folder_key) == documents:
+            return
+        self._documents[folder_key] = documents
+        self._stale_documents.add(folder_key)
+
+    def set_document(self, folder_key: str, doc_key: str, filename: str) -> None:
+        documents = dict(self._documents.get(folder_key, {}))
+        documents[doc_key] = filename
+        self.set_documents(folder_key, documents.items())
+
+    def _drop_document_entries(self, folder_key: str) -> None:
+        for entry_id in self._document_ids.pop(folder_key, []):
+            self._remove(entry_id)
+
+    def index_pending(self, max_folders: Optional[int] = None) -> bool:
+        """
+        Index the documents reported since the last search, at most
+        ``max_folders`` folders of them; True while some are still pending.
+        """
+        ready = [key for key in self._stale_documents if key in self._folders]
+        if max_folders is not None:
+            ready = ready[:max_folders]
+        for folder_key in ready:
+            self._stale_documents.discard(folder_key)
+            self._drop_document_entries(folder_key)
+            _name, path, category_path = self._folders[folder_key]
+            self._document_ids[folder_key] = [
+                self._add(
+                    SearchHit(
+                        "document",
+                        filename or doc_key,
+                        folder_path=path,
+                        category_path=category_path,
+                        doc_key=doc_key,
+                    ),
+                    doc_key,
+                )
+                for doc_key, filename in self._documents[folder_key].items()
+            ]
+        # documents of unregistered folders wait until the folder is registered
+        return any(key in self._folders for key in self._stale_documents)
+
+    # ---------- queries ----------
+    def _candidates(self, term: str) -> Set[int]:
+        if len(term) >= 3:
+            posting_sets = sorted(
+                (self._postings.get(gram, set()) for gram in trigrams(term) if _PAD not in gram),
+                key=len,
+            )
+            result = set(posting_sets[0])
+            for ids in posting_sets[1:]:
+                result &= ids
+                if not result:
+                    break
+            return result
+        result: Set[int] = set()
+        for gram, ids in self._postings.items():
+            if term in gram:
+                result |= ids
+        return result
+
+    def _prefix_candidates(self, term: str) -> Set[int]:
+        if len(term) >= 2:
+            return self._postings.get(_PAD + term[:2], set())
+        result: Set[int] = set()
+        for gram, ids in self._postings.items():
+            if gram[0] == _PAD and gram[1] == term:
+                result |= ids
+        return result
+
+    def search(self, query: str, limit: int = 50) -> List[SearchHit]:
+        """
+        Hits whose text contains every whitespace-separated term of ``query``;
+        texts starting with the first term come first, then folders before
+        categories before documents, then shorter labels.
+        """
+        terms = normalize_text(query).split()
+        if not terms:
+            return []
+        self.index_pending()
+        distinct = sorted(set(terms), key=len, reverse=True)
+        candidates: Set[int] = set()
+        for n, term in enumerate(distinct):
+            ids = self._candidates(term)
+            candidates = ids if n == 0 else candidates & ids
+            if not candidates:
+                return []
+        entries = self._entries
+        first = terms[0]
+        prefixed = candidates & self._prefix_candidates(first)
+        if len(first) > 2:
+            prefixed = {entry_id for entry_id in prefixed if entries[entry_id].text.startswith(first)}
+        # grams of up to three characters match exactly; longer terms only
+        # guarantee that all of their grams occur somewhere in the text
+        needs_check = [term for term in distinct if len(term) > 3]
+
+        def matching(ids: Iterable[int]) -> Iterator[int]:
+            if not needs_check:
+                return iter(ids)
+            return (i for i in ids if all(term in entries[i].text for term in needs_check))
+
+        def order(entry_id: int) -> Tuple[int, int, str, int]:
+            return entries[entry_id].order
+
+        ranked = heapq.nsmallest(limit, matching(prefixed), key=order)
+        if len(ranked) < limit:
+            ranked += heapq.nsmallest(limit - len(ranked), matching(candidates - prefixed), key=order)
+        return [entries[entry_id].hit for entry_id in ranked]
@@ -0,0 +1,111 @@
+"""Crash-safe JSON writes for meta, registry, settings and user checks.
+
+Files are written to a sibling temp file, fsync'ed and moved over the target
+with ``os.replace``, so readers (and sync clients) only ever see the old or
+the new content. A write whose serialized bytes equal the file on disk is
+skipped, which keeps synced folders from uploading unchanged metadata.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from .codec import dumps_indented
+
+REPLACE_RETRIES = 3
+REPLACE_RETRY_DELAY = 0.05
+_ATOMIC_TEMP_RE = re.compile(r"^\..+\.[0-9a-f]{8}\.tmp$")
+
+
+@dataclass
+class WriteStats:
+    written: int = 0
+    skipped: int = 0
+    bytes_written: int = 0
+    bytes_skipped: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"written={self.written} ({self.bytes_written} bytes), "
+            f"unchanged_skipped={self.skipped} ({self.bytes_skipped} bytes)"
+        )
+
+
+WRITE_STATS = WriteStats()
+_STATS_LOCK = threading.Lock()
+
+
+def is_atomic_temp_name(name: str) -> bool:
+    """True for the short-lived temp files ``write_bytes_atomic`` leaves in folders."""
+    return bool(_ATOMIC_TEMP_RE.match(name))
+
+
+def dump_json_bytes(data: Any) -> bytes:
+    # same layout json.dump produced through a text-mode file
+    encoded = dumps_indented(data)
+    if os.linesep != "\n":
+        encoded = encoded.replace(b"\n", os.linesep.encode("ascii"))
+    return encoded
+
+
+def _same_content(path: str, data: bytes) -> bool:
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def _replace(src: str, dst: str) -> None:
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            # Windows refuses while a scanner or sync client holds the target
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(REPLACE_RETRY_DELAY)
+
+
+def write_bytes_atomic(path: str, data: bytes) -> bool:
+    """Atomically replace ``path`` with ``data``; False when it already matched."""
+    if _same_content(path, data):
+        with _STATS_LOCK:
+            WRITE_STATS.skipped += 1
+            WRITE_STATS.bytes_skipped += len(data)
+        return False
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except OSError:
+            pass
+        _replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    with _STATS_LOCK:
+        WRITE_STATS.written += 1
+        WRITE_STATS.bytes_written += len(data)
+    return True
+
+
+def write_json_atomic(path: str, data: Any) -> bool:
+    return write_bytes_atomic(path, dump_json_bytes(data))
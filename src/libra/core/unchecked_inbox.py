@@ -0,0 +1,218 @@
+"""Unchecked current documents across all registered folders.
+
+The inbox keeps every folder's current documents together with the subset
+the user has not checked yet. Scan results replace a folder's documents as a
+whole; revisions and check toggles replace or flip single entries. Neither needs the folder to be
+listed or its meta to be read again.
+
+``CategoryTally`` sums the per-folder counts up the category tree. A
+category's total covers only the sub-categories and folders whose tree check
+is on, like the red highlighting does, and every change walks the path to
+the root once, so a toggle or a scan costs O(depth) instead of a recount.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class InboxDocument:
+    doc_key: str
+    current_file: str
+    current_rev: str = ""
+    updated_at: str = ""
+    updated_by: str = ""
+
+
+class UncheckedInbox:
+    """
+    Per-folder document lists keyed by normalized folder path.
+    ``on_change(key)`` is called after the unchecked set of a folder changed.
+    Not thread-safe; the GUI thread owns it.
+    """
+
+    def __init__(self, on_change: Optional[Callable[[str], None]] = None):
+        self._paths: Dict[str, str] = {}
+        self._documents: Dict[str, Dict[str, InboxDocument]] = {}
+        self._unchecked: Dict[str, Set[str]] = {}
+        self._total = 0
+        self._on_change = on_change
+
+    def __len__(self) -> int:
+        return self._total
+
+    def _changed(self, key: str) -> None:
+        if self._on_change is not None:
+            self._on_change(key)
+
+    def set_folder(
+        self,
+        key: str,
+        folder_path: str,
+        documents: Iterable[InboxDocument],
+        is_checked: Callable[[str], bool],
+    ) -> None:
+        """Replace the documents of one folder; ``is_checked(doc_key)`` decides which are unchecked."""
+        docs = {doc.doc_key: doc for doc in documents if doc.current_file}
+        unchecked = {doc_key for doc_key in docs if not is_checked(doc_key)}
+        self._replace(key, folder_path, docs, unchecked)
+
+    def set_document(self, key: str, document: InboxDocument, checked: bool) -> bool:
+        """
+        Replace one document of a folder, as an update or replace leaves it.
+        A folder no scan has reported yet is left to that scan; False then.
+        """
+        if key not in self._documents:
+            return False
+        docs = dict(self._documents[key])
+        unchecked = set(self._unchecked[key])
+        docs.pop(document.doc_key, None)
+        unchecked.discard(document.doc_key)
+        if document.current_file:
+            docs[document.doc_key] = document
+            if not checked:
+                unchecked.add(document.doc_key)
+        self._replace(key, self._paths[key], docs, unchecked)
+        return True
+
+    def _replace(self, key: str, folder_path: str, docs: Dict[str, InboxDocument], unchecked: Set[str]) -> None:
+        if (
+            self._documents.get(key) == docs
+            and self._unchecked.get(key, set()) == unchecked
+            and self._paths.get(key) == folder_path
+        ):
+            return
+        self._total += len(unchecked) - len(self._unchecked.get(key, ()))
+        self._paths[key] = folder_path
+        self._documents[key] = docs
+        self._unchecked[key] = unchecked
+        self._changed(key)
+
+    def set_checked(self, key: str, doc_key: str, checked: bool) -> bool:
+        """Flip one document; True when the unchecked set changed."""
+        if doc_key not in self._documents.get(key, {}):
+            return False
+        unchecked = self._unchecked[key]
+        if checked == (doc_key not in unchecked):
+            return False
+        if checked:
+            unchecked.discard(doc_key)
+            self._total -= 1
+        else:
+            unchecked.add(doc_key)
+            self._total += 1
+        self._changed(key)
+        return True
+
+    def remove_folder(self, key: str) -> None:
+        if key not in self._documents:
+            return
+        self._total -= len(self._unchecked.pop(key, ()))
+        self._documents.pop(key, None)
+        self._paths.pop(key, None)
+        self._changed(key)
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Forget folders that are no longer registered."""
+        keep = set(keys)
+        for key in [key for key in self._documents if key not in keep]:
+            self.remove_folder(key)
+
+    def has_unchecked(self, key: str) -> bool:
+        return bool(self._unchecked.get(key))
+
+    def unchecked_count(self, key: str) -> int:
+        return len(self._unchecked.get(key, ()))
+
+    def unchecked(self) -> List[Tuple[str, InboxDocument]]:
+        """``(folder_path, document)`` for every unchecked document."""
+        return [
+            (self._paths[key], self._documents[key][doc_key])
+            for key, doc_keys in self._unchecked.items()
+            for doc_key in doc_keys
+        ]
+
+
+CategoryPath = Tuple[str, ...]
+
+
+class CategoryTally:
+    """
+    Unchecked counts per folder and per category. ``set_folder`` and
+    ``set_category_enabled`` describe the tree; ``set_count`` reports a
+    folder's count. Every update adds the difference along the folder's
+    category path and stops at the first disabled category.
+    """
+
+    def __init__(self):
+        self._folders: Dict[str, Tuple[CategoryPath, bool]] = {}  # key -> (category path, enabled)
+        self._counts: Dict[str, int] = {}
+        self._disabled: Set[CategoryPath] = set()
+        self._totals: Dict[CategoryPath, int] = {}
+
+    def _propagate(self, path: CategoryPath, delta: int) -> None:
+        if not delta:
+            return
+        while True:
+            self._totals[path] = self._totals.get(path, 0) + delta
+            if not path or path in self._disabled:
+                return
+            path = path[:-1]
+
+    def _contribution(self, key: str) -> int:
+        folder = self._folders.get(key)
+        return self._counts.get(key, 0) if folder is not None and folder[1] else 0
+
+    def set_folder(self, key: str, category_path: Iterable[str], enabled: bool = True) -> None:
+        """Place a folder under ``category_path``; moving or toggling it moves its count."""
+        folder = (tuple(category_path), enabled)
+        old = self._folders.get(key)
+        if old == folder:
+            return
+        if old is not None:
+            self._propagate(old[0], -self._contribution(key))
+        self._folders[key] = folder
+        self._propagate(folder[0], self._contribution(key))
+
+    def set_folder_enabled(self, key: str, enabled: bool) -> None:
+        folder = self._folders.get(key)
+        if folder is not None:
+            self.set_folder(key, folder[0], enabled)
+
+    def remove_folder(self, key: str) -> None:
+        old = self._folders.pop(key, None)
+        if old is not None and old[1]:
+            self._propagate(old[0], -self._counts.get(key, 0))
+
+    def retain(self, keys: Iterable[str]) -> None:
+        keep = set(keys)
+        for key in [key for key in self._folders if key not in keep]:
+            self.remove_folder(key)
+
+    def set_category_enabled(self, path: Iterable[str], enabled: bool) -> None:
+        """Include or exclude the category's total from its parent's."""
+        path = tuple(path)
+        if not path or enabled == (path not in self._disabled):
+            return
+        total = self._totals.get(path, 0)
+        if enabled:
+            self._disabled.discard(path)
+            self._propagate(path[:-1], total)
+        else:
+            self._propagate(path[:-1], -total)
+            self._disabled.add(path)
+
+    def set_count(self, key: str, count: int) -> None:
+        old = self._contribution(key)
+        self._counts[key] = count
+        folder = self._folders.get(key)
+        if folder is not None:
+            self._propagate(folder[0], self._contribution(key) - old)
+
+    def folder_count(self, key: str) -> int:
+        return self._counts.get(key, 0)
+
+    def category_count(self, path: Iterable[str]) -> int:
+        """Unchecked documents below ``path`` through enabled categories and folders."""
+        return self._totals.get(tuple(path), 0)
@@ -0,0 +1,65 @@
+import gc
+import os
+import sys
+import time
+
+import pytest
+
+TESTS_DIR = os.path.dirname(__file__)
+SRC_DIR = os.path.abspath(os.path.join(TESTS_DIR, "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+@pytest.fixture(autouse=True)
+def collect_released_widgets():
+    """
+    Windows a test drops are freed here, on the GUI thread. Left to the cyclic
+    collector, they could be freed on whichever scan worker happens to trigger
+    a collection, and destroying widgets off the GUI thread crashes Qt.
+    """
+    yield
+    gc.collect()
+
+
+@pytest.fixture(autouse=True)
+def isolated_app_paths(monkeypatch, tmp_path_factory):
+    """
+    Point the per-user files of the app at a scratch directory. A window
+    recovers the operation journal at startup, which moves and deletes files
+    in the folders it names, so a test must never see the developer's own.
+    """
+    try:
+        from libra import app as app_mod
+    except ImportError:  # PySide6 is not installed
+        return
+    root = tmp_path_factory.mktemp("appdata")
+    monkeypatch.setattr(app_mod, "REGISTRY_PATH", str(root / "registry.json"))
+    monkeypatch.setattr(app_mod, "SETTINGS_PATH", str(root / "settings.json"))
+    monkeypatch.setattr(app_mod, "USER_CHECKS_PATH", str(root / "user_checks.json"))
+    monkeypatch.setattr(app_mod, "SCAN_INDEX_PATH", str(root / "scan_index.sqlite3"))
+    monkeypatch.setattr(app_mod, "MEMO_INDEX_PATH", str(root / "memo_index.sqlite3"))
+    monkeypatch.setattr(app_mod, "JOURNAL_DIR", str(root / "journal"))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def wait_until(qapp):
+    """Process Qt events until ``predicate()`` holds or ``timeout`` seconds pass."""
+
+    def wait(predicate, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            qapp.processEvents()
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return predicate()
+
+    return wait
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+from PySide6.QtCore import QModelIndex, Qt
+
+from libra import app as app_mod
+
+
+def category(path, has_children=True):
+    return app_mod.CategoryTreeRow(kind="category", name=path[-1], path=list(path), has_children=has_children)
+
+
+def folder(path, category_path):
+    return app_mod.CategoryTreeRow(
+        kind="folder",
+        name=os.path.basename(path),
+        path=path,
+        category_path=tuple(category_path),
+    )
+
+
+class FakeTree:
+    def __init__(self):
+        self.children = {
+            (): [category(["A"]), category(["B"])],
+            ("A",): [folder("/a1", ["A"]), folder("/a2", ["A"])],
+            ("B",): [category(["B", "C"])],
+            ("B", "C"): [folder("/c1", ["B", "C"])],
+        }
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(tuple(path))
+        return list(self.children.get(tuple(path), []))
+
+
+def record_signals(model):
+    events = []
+    model.modelReset.connect(lambda: events.append("reset"))
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("insert", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(("remove", first, last)))
+    model.layoutChanged.connect(lambda *args: events.append("layout"))
+    model.dataChanged.connect(lambda top, bottom, roles=(): events.append(("changed", top.row())))
+    return events
+
+
+def test_children_are_fetched_only_on_demand(qapp):
+    tree = FakeTree()
+    model = app_mod.CategoryTreeModel(tree)
+    model.sync()
+    assert tree.calls == [()]
+    a = model.index(0, 0)
+    assert model.hasChildren(a)
+    assert model.rowCount(a) == 0
+    assert model.canFetchMore(a)
+    model.fetchMore(a)
+    assert model.rowCount(a) == 2
+    assert tree.calls == [(), ("A",)]
+
+    c = model.category_index(["B", "C"])
+    assert c.isValid()
+    assert c.data(Qt.UserRole) == {"type": "category", "path": ["B", "C"]}
+    assert tree.calls == [(), ("A",), ("B",)]
+
+
+def test_sync_applies_targeted_changes(qapp):
+    tree = FakeTree()
+    model = app_mod.CategoryTreeModel(tree)
+    model.sync()
+    a = model.index(0, 0)
+    model.fetchMore(a)
+    events = record_signals(model)
+
+    tree.children[("A",)] = [folder("/a2", ["A"]), folder("/a3", ["A"])]
+    tree.children[()] = [category(["B"]), category(["A"])]
+    model.sync()
+
+    assert "reset" not in events
+    assert ("remove", 0, 0) in events
+    assert ("insert", 1, 1) in events
+    assert "layout" in events
+    assert [row.name for row in model.child_rows()] == ["B", "A"]
+    a = model.category_index(["A"])
+    assert [row.path for row in model.child_rows(a)] == ["/a2", "/a3"]
+
+    events.clear()
+    tree.children[()] = [category(["B"]), app_mod.CategoryTreeRow(
+        kind="category", name="A", path=["A"], has_children=True, has_unchecked=True
+    )]
+    model.sync()
+    assert events == [("changed", 1)]
+    assert model.category_index(["A"]).data(Qt.ForegroundRole) is not None
+
+
+def test_move_rows_keeps_moved_rows_addressable(qapp):
+    tree = FakeTree()
+    model = app_mod.CategoryTreeModel(tree)
+    model.sync()
+    a = model.index(0, 0)
+    model.fetchMore(a)
+    assert model.move_rows(a, [1], 0)
+    assert [row.path for row in model.child_rows(a)] == ["/a2", "/a1"]
+    moved = model.index(0, 0, a)
+    assert moved.parent() == a
+    assert moved.data(Qt.UserRole)["path"] == "/a2"
+
+
+def test_drag_reorder_saves_only_that_level(wait_until, monkeypatch, tmp_path: Path):
+    registry = []
+    for name in ("alpha", "beta"):
+        path = tmp_path / name
+        path.mkdir()
+        registry.append({"name": name, "path": str(path), "categories": ["Cat"]})
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        model = window.category_model
+        cat = window.find_category_tree_item(["Cat"])
+        assert cat.isValid()
+        model.fetchMore(cat)
+        assert [row.path for row in model.child_rows(cat)] == [registry[0]["path"], registry[1]["path"]]
+
+        model.move_rows(cat, [1], 0)
+        window.on_category_tree_order_changed(cat)
+
+        key = window.category_path_key(["Cat"])
+        assert window.category_order()["folder"][key] == [registry[1]["path"], registry[0]["path"]]
+        cat = window.find_category_tree_item(["Cat"])
+        assert [row.path for row in model.child_rows(cat)] == [registry[1]["path"], registry[0]["path"]]
+
+        first = model.index(0, 0, cat)
+        model.setData(first, Qt.Unchecked, Qt.CheckStateRole)
+        assert window.is_folder_tree_checked(registry[1]["path"]) is False
+    finally:
+        window.close()
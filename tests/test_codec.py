@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from libra.core import codec
+
+SAMPLE = {
+    "documents": {
+        "設計書.docx": {
+            "current_file": "設計書_rev1.0.0_20260101.docx",
+            "history": [],
+            "flags": [True, False, None, 3],
+        }
+    },
+    "category_folder_paths": {"A\u001fB": "C:/Docs \"x\""},
+    "empty": {},
+}
+
+
+@pytest.mark.parametrize("backend", ["default", "stdlib"])
+def test_pretty_output_matches_stdlib_layout(monkeypatch, backend):
+    if backend == "stdlib":
+        monkeypatch.setattr(codec, "orjson", None)
+    expected = json.dumps(SAMPLE, ensure_ascii=False, indent=2).encode("utf-8")
+
+    assert codec.dumps_indented(SAMPLE) == expected
+    assert codec.loads(expected) == SAMPLE
+    assert codec.loads(expected.decode("utf-8")) == SAMPLE
+
+
+def test_floats_are_written_like_the_stdlib():
+    data = {"started_at": 1e16, "ratios": [0.1, 1.5e-7, {"n": float(2**53)}]}
+    expected = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    assert codec.dumps_indented(data) == expected
+    assert codec.loads(expected) == data
+
+
+def test_values_orjson_rejects_fall_back_to_stdlib():
+    data = {1: 2**70}
+    assert codec.dumps_indented(data) == json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    assert codec.loads(b'{"n": 1180591620717411303424}') == {"n": 2**70}
+    with pytest.raises(ValueError):
+        codec.loads(b'{"truncated": ')
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from libra.core.file_ops import COPY_METHODS, OperationCancelled, copy_file
+
+
+def test_copy_reports_progress_and_cleans_up_when_cancelled(tmp_path: Path):
+    src = tmp_path / "drawing.pdf"
+    src.write_bytes(os.urandom(10_000))
+    os.utime(src, (1767225600, 1767225600))
+    done = []
+
+    for method in COPY_METHODS:
+        done = []
+        target = tmp_path / f"copy_{method}.pdf"
+        result = copy_file(str(src), str(target), done.append, chunk_size=4096, methods=[method])
+        assert result.size == 10_000 and done[-1] == 10_000
+        assert target.read_bytes() == src.read_bytes()
+        assert os.stat(target).st_mtime == 1767225600
+    assert done == [0, 4096, 8192, 10_000]  # buffered
+
+    done = []
+    with pytest.raises(OperationCancelled):
+        copy_file(str(src), str(tmp_path / "partial.pdf"), done.append, lambda: len(done) > 2, 4096, ["buffered"])
+    assert not (tmp_path / "partial.pdf").exists()
+
+    (tmp_path / "existing.pdf").write_bytes(b"keep")
+    with pytest.raises(FileExistsError):
+        copy_file(str(src), str(tmp_path / "existing.pdf"))
+    assert (tmp_path / "existing.pdf").read_bytes() == b"keep"
+
+
+def test_revisions_run_in_background_serialized_per_folder(wait_until, monkeypatch, tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "a_rev0.0.1_20260101.docx").write_bytes(b"old")
+    incoming = tmp_path / "incoming.docx"
+    incoming.write_bytes(b"new" * 1000)
+    registry = [{"name": "docs", "path": str(folder), "categories": ["Cat"]}]
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        window.current_folder = {"name": "docs", "path": str(folder)}
+        window.refresh_files_table()
+        plan = app_mod.RevisionPlan(
+            kind="replace",
+            folder_path=str(folder),
+            doc_key="a.docx",
+            current_file="a_rev0.0.1_20260101.docx",
+            current_rev="rev0.0.1_20260101",
+            source_path=str(incoming),
+            new_file="a_rev0.0.2_20260102.docx",
+            new_rev="rev0.0.2_20260102",
+            memo="new drawing",
+        )
+
+        release = threading.Event()
+        blocker = app_mod.FileOperation(str(folder), "block", 0, lambda op: release.wait(5))
+        window.file_ops.submit(blocker)
+        queued = window.submit_revision_plan(plan)
+        assert queued.state == "queued" and window.file_ops.is_busy(str(folder), "a.docx")
+        # a watcher rebuild would race the operation's meta write; it waits for the queue
+        window.on_watched_folder_changed(str(folder))
+        assert window.scan_pool.pending_count() == 0
+        assert app_mod.FILE_OP_FOLDERS.owned(str(folder))
+        assert not window.file_ops_panel.isHidden()
+        assert window.file_ops.cancel(queued) and queued.state == "cancelled"
+        release.set()
+        assert wait_until(lambda: window.file_ops.pending_count() == 0)
+        assert blocker.state == "done" and not app_mod.FILE_OP_FOLDERS.owned(str(folder))
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0 and not window._rescan_after_file_ops)
+        assert sorted(os.listdir(folder)) == [".libra_meta.json", "a_rev0.0.1_20260101.docx"]
+
+        op = window.submit_revision_plan(plan)
+        assert wait_until(lambda: op.state == "done" and not window.refresh_scheduler.is_pending())
+        assert window.file_ops_panel.isHidden()
+        assert (folder / "a_rev0.0.2_20260102.docx").read_bytes() == incoming.read_bytes()
+        assert (folder / "_History" / "a_rev0.0.1_20260101.docx").read_bytes() == b"old"
+        assert app_mod.load_meta(str(folder))["documents"]["a.docx"]["last_memo"] == "new drawing"
+        row = window.files_model.row_for_doc_key("a.docx")
+        assert window.current_file_rows[row].filename == "a_rev0.0.2_20260102.docx"
+        assert not window.file_ops.cancel(op)
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+    finally:
+        window.close()
+
+
+def test_snapshot_leaves_meta_to_a_running_file_operation(tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "a_rev0.0.1_20260101.docx").write_bytes(b"x")
+    key = app_mod.normalize_folder_key(str(folder))
+
+    app_mod.FILE_OP_FOLDERS.claim(key)
+    try:
+        snapshot = app_mod.build_folder_snapshot(str(folder))
+    finally:
+        app_mod.FILE_OP_FOLDERS.release(key)
+    assert [row.doc_key for row in snapshot.rows] == ["a.docx"] and snapshot.racy
+    assert not (folder / app_mod.META_FILENAME).exists()
+
+    app_mod.build_folder_snapshot(str(folder))
+    assert "a.docx" in app_mod.load_meta(str(folder))["documents"]
+
+
+def test_interrupted_revisions_are_rolled_back_or_forward(monkeypatch, tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+    from libra.core.history_log import read_doc_history
+    from libra.core.journal import JournalEntry, OperationJournal
+
+    class Crash(Exception):
+        pass
+
+    def crash(*_args, **_kwargs):
+        raise Crash()
+
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "a_rev0.0.1_20260101.docx").write_bytes(b"old")
+    app_mod.save_meta(str(folder), {"documents": {"a.docx": {
+        "title": "a.docx",
+        "current_file": "a_rev0.0.1_20260101.docx",
+        "current_rev": "rev0.0.1_20260101",
+        "updated_at": "2026-01-01T09:00:00",
+        "updated_by": "yamada",
+        "last_memo": "first",
+    }}})
+    incoming = tmp_path / "incoming.docx"
+    incoming.write_bytes(b"new")
+    journal = OperationJournal(str(tmp_path / "journal"))
+
+    def plan(rev: str) -> "app_mod.RevisionPlan":
+        current = app_mod.load_meta(str(folder))["documents"]["a.docx"]
+        return app_mod.RevisionPlan(
+            kind="replace",
+            folder_path=str(folder),
+            doc_key="a.docx",
+            current_file=current["current_file"],
+            current_rev=current["current_rev"],
+            source_path=str(incoming),
+            new_file=f"a_{rev}.docx",
+            new_rev=rev,
+            memo=rev,
+        )
+
+    def run(p: "app_mod.RevisionPlan") -> None:
+        op = app_mod.FileOperation(str(folder), "run", 0, lambda _op: None)
+        app_mod.run_revision_plans([p], op, journal)
+
+    def die_while_copying(_src, dst, *_args, **_kwargs):
+        Path(dst).write_bytes(b"ne")
+        raise Crash()
+
+    # died while copying: the partial copy goes, the current file stays
+    copying = plan("rev0.0.2_20260102")
+    with monkeypatch.context() as m:
+        m.setattr(app_mod, "copy_file", die_while_copying)
+        # a dead process cleans nothing up
+        m.setattr(JournalEntry, "finish", lambda _entry: None)
+        with pytest.raises(Crash):
+            run(copying)
+    assert (folder / copying.new_file).exists()
+    [entry] = journal.pending()
+    assert entry.phase == "copying"
+    assert app_mod.recover_revision(entry) == "rolled_back"
+    assert not (folder / copying.new_file).exists() and journal.pending() == []
+
+    # died after the commit point, before the meta was read
+    interrupted = plan("rev0.0.2_20260102")
+    with monkeypatch.context() as m:
+        m.setattr(app_mod, "load_meta", crash)
+        with pytest.raises(Crash):
+            run(interrupted)
+    [entry] = journal.pending()
+    assert entry.phase == "moved"
+    assert app_mod.recover_revision(entry) == "rolled_forward"
+    assert app_mod.load_meta(str(folder))["documents"]["a.docx"]["current_file"] == "a_rev0.0.2_20260102.docx"
+    assert (folder / "_History" / "a_rev0.0.1_20260101.docx").read_bytes() == b"old"
+
+    # died between the history log and the meta: the log is not appended twice
+    interrupted = plan("rev0.0.3_20260103")
+    with monkeypatch.context() as m:
+        m.setattr(app_mod, "save_meta", crash)
+        with pytest.raises(Crash):
+            run(interrupted)
+    [entry] = journal.pending()
+    assert entry.phase == "meta"
+    assert app_mod.recover_revision(entry) == "rolled_forward"
+    doc = app_mod.load_meta(str(folder))["documents"]["a.docx"]
+    assert (doc["current_rev"], doc["last_memo"]) == ("rev0.0.3_20260103", "rev0.0.3_20260103")
+    assert [h["rev"] for h in read_doc_history(str(folder), "a.docx")] == ["rev0.0.1_20260101", "rev0.0.2_20260102"]
+    assert sorted(os.listdir(folder / "_History")) == ["a_rev0.0.1_20260101.docx", "a_rev0.0.2_20260102.docx"]
+    assert journal.pending() == []
+
+
+def test_batch_revision_copies_together_and_writes_meta_once(monkeypatch, tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+    from libra.core.history_log import read_doc_history
+    from libra.core.journal import OperationJournal
+
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    docs = {}
+    for name in ("a", "b", "c"):
+        (folder / f"{name}_rev0.0.1_20260101.docx").write_bytes(name.encode() * 1000)
+        docs[f"{name}.docx"] = {
+            "title": f"{name}.docx",
+            "current_file": f"{name}_rev0.0.1_20260101.docx",
+            "current_rev": "rev0.0.1_20260101",
+        }
+    app_mod.save_meta(str(folder), {"documents": docs})
+    journal = OperationJournal(str(tmp_path / "journal"))
+
+    def plans(names, rev: str, sources=None):
+        return [
+            app_mod.RevisionPlan(
+                kind="update",
+                folder_path=str(folder),
+                doc_key=f"{name}.docx",
+                current_file=app_mod.load_meta(str(folder))["documents"][f"{name}.docx"]["current_file"],
+                current_rev=app_mod.load_meta(str(folder))["documents"][f"{name}.docx"]["current_rev"],
+                source_path=(sources or {}).get(name) or str(folder / app_mod.load_meta(str(folder))["documents"][f"{name}.docx"]["current_file"]),
+                new_file=f"{name}_{rev}.docx",
+                new_rev=rev,
+                memo="submittal",
+            )
+            for name in names
+        ]
+
+    # one source is gone: none of the copies stay, nothing moves
+    failing = plans("abc", "rev0.1.0_20260102", {"b": str(tmp_path / "missing.docx")})
+    op = app_mod.FileOperation(str(folder), "batch", 0, lambda _op: None)
+    with pytest.raises(FileNotFoundError):
+        app_mod.run_revision_plans(failing, op, journal)
+    assert sorted(os.listdir(folder)) == [
+        ".libra_meta.json", "a_rev0.0.1_20260101.docx", "b_rev0.0.1_20260101.docx", "c_rev0.0.1_20260101.docx",
+    ]
+    assert journal.pending() == []
+
+    meta_writes = []
+    save_meta = app_mod.save_meta
+    monkeypatch.setattr(app_mod, "save_meta", lambda path, meta: meta_writes.append(path) or save_meta(path, meta))
+    op = app_mod.FileOperation(str(folder), "batch", 0, lambda _op: None)
+    changes = app_mod.run_revision_plans(plans("abc", "rev0.1.0_20260102"), op, journal)
+    assert meta_writes == [str(folder)]
+    assert [change.doc_key for change in changes] == ["a.docx", "b.docx", "c.docx"]
+    assert op.done_bytes == 3000 and len(op.copied_paths) == 3
+    meta_docs = app_mod.load_meta(str(folder))["documents"]
+    for name in "abc":
+        assert meta_docs[f"{name}.docx"]["current_file"] == f"{name}_rev0.1.0_20260102.docx"
+        assert meta_docs[f"{name}.docx"]["last_memo"] == "submittal"
+        assert (folder / f"{name}_rev0.1.0_20260102.docx").read_bytes() == name.encode() * 1000
+        assert (folder / "_History" / f"{name}_rev0.0.1_20260101.docx").exists()
+        assert [h["rev"] for h in read_doc_history(str(folder), f"{name}.docx")] == ["rev0.0.1_20260101"]
+    assert journal.pending() == []
+
+
+def test_revision_of_a_document_missing_from_meta_writes_no_history(tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+    from libra.core.history_log import read_doc_history
+    from libra.core.journal import OperationJournal
+
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "a_rev0.0.1_20260101.docx").write_bytes(b"old")
+    (tmp_path / "new.docx").write_bytes(b"new")
+    app_mod.save_meta(str(folder), {"documents": {}})
+    plan = app_mod.RevisionPlan(
+        kind="replace",
+        folder_path=str(folder),
+        doc_key="a.docx",
+        current_file="a_rev0.0.1_20260101.docx",
+        current_rev="rev0.0.1_20260101",
+        source_path=str(tmp_path / "new.docx"),
+        new_file="a_rev0.1.0_20260102.docx",
+        new_rev="rev0.1.0_20260102",
+        memo="first tracked",
+    )
+    op = app_mod.FileOperation(str(folder), "replace", 0, lambda _op: None)
+    changes = app_mod.run_revision_plans([plan], op, OperationJournal(str(tmp_path / "journal")))
+
+    assert read_doc_history(str(folder), "a.docx") == []
+    assert (folder / "_History" / "a_rev0.0.1_20260101.docx").exists()
+    d = app_mod.load_meta(str(folder))["documents"]["a.docx"]
+    assert d["current_file"] == "a_rev0.1.0_20260102.docx"
+    assert d["last_memo"] == "first tracked"
+    assert [change.doc_key for change in changes] == ["a.docx"]
+
+def test_incoming_files_match_documents_by_name():
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+
+    current = {"a.docx": "a_rev0.0.1_20260101.docx", "B.xlsx": "B.xlsx"}
+    matched, unmatched = app_mod.match_incoming_files(
+        current, ["/in/a_rev0.3.0_20260301.docx", "/in/B.xlsx", "/in/c.docx", "/in/a.pdf"],
+    )
+    assert matched == {"a.docx": "/in/a_rev0.3.0_20260301.docx", "B.xlsx": "/in/B.xlsx"}
+    assert unmatched == ["/in/c.docx", "/in/a.pdf"]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+from PySide6.QtCore import Qt
+
+from libra import app as app_mod
+
+
+def file_row(name: str, rev: str) -> app_mod.FileRow:
+    return app_mod.FileRow(
+        filename=f"{name}_{rev}.docx",
+        doc_key=f"{name}.docx",
+        rev=rev,
+        updated_at="2026-01-01T09:00:00",
+        updated_by="yamada",
+        memo="",
+    )
+
+
+def test_sort_by_rev_uses_version_numbers(qapp):
+    model = app_mod.FilesTableModel()
+    rows = [
+        file_row("a", "rev1.10.0_20260101"),
+        file_row("b", "rev1.9.0_20260101"),
+        file_row("c", "rev1.2.0_20260101"),
+    ]
+    model.set_rows("/folder", rows, [True, False, True])
+    model.sort(2, Qt.AscendingOrder)
+    assert [row.doc_key for row in model.rows] == ["c.docx", "b.docx", "a.docx"]
+    assert model.index(1, 0).data(Qt.CheckStateRole) == Qt.Unchecked
+    assert model.row_for_doc_key("a.docx") == 2
+    assert model.index(0, 2).data() == "rev1.2.0"
+    assert model.index(0, 3).data() == "2026-01-01 09:00:00"
+
+
+def test_check_toggle_reports_doc_key(qapp):
+    model = app_mod.FilesTableModel()
+    model.set_rows("/folder", [file_row("a", "rev0.0.1_20260101")], [False])
+    toggled = []
+    model.check_changed.connect(lambda doc_key, checked: toggled.append((doc_key, checked)))
+    assert model.index(0, 1).data(Qt.ForegroundRole) is not None
+    model.setData(model.index(0, 0), Qt.Checked, Qt.CheckStateRole)
+    assert toggled == [("a.docx", True)]
+    assert model.index(0, 1).data(Qt.ForegroundRole) is None
+    assert model.checked_count() == 1
+
+
+def test_files_table_and_history_pane_follow_selection(wait_until, monkeypatch, tmp_path: Path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    for i in range(3):
+        (folder / f"doc{i}_rev0.0.1_20260101.docx").write_bytes(b"x")
+    registry = [{"name": "docs", "path": str(folder), "categories": ["Cat"]}]
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        window.current_folder = {"name": "docs", "path": str(folder)}
+        window.refresh_files_table()
+        assert window.files_model.rowCount() == 3
+        assert window.current_file_rows == window.files_model.rows
+
+        window.sort_files_table(1)
+        window.sort_files_table(1)
+        assert [row.doc_key for row in window.current_file_rows] == ["doc2.docx", "doc1.docx", "doc0.docx"]
+
+        window.select_doc_key("doc1.docx")
+        assert window.selected_file_index() == 1
+        assert window.hist_model.rowCount() == 1
+        assert window.hist_model.entry(0)["kind"] == "最新"
+
+        window.on_files_header_clicked(0)
+        assert window.files_model.header_check_state() == Qt.Checked
+        assert window.files_model.checked_count() == 3
+    finally:
+        window.close()
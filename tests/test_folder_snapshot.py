@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+from libra import app as app_mod
+
+
+def _age(path: Path, seconds: float = 120.0) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_snapshot_is_reused_while_folder_and_meta_are_unchanged(tmp_path: Path):
+    (tmp_path / "plan_rev0.0.1_20260101.docx").write_bytes(b"x")
+    cache = app_mod.FolderSnapshotCache()
+    first = cache.get(str(tmp_path))
+    # the first scan wrote .libra_meta.json; age the folder so it is not racy
+    _age(tmp_path)
+    second = cache.get(str(tmp_path))
+    third = cache.get(str(tmp_path))
+
+    assert [row.doc_key for row in first.rows] == ["plan.docx"]
+    assert second is third
+
+
+def test_snapshot_is_rebuilt_when_folder_changes(tmp_path: Path):
+    (tmp_path / "plan_rev0.0.1_20260101.docx").write_bytes(b"x")
+    cache = app_mod.FolderSnapshotCache()
+    cache.get(str(tmp_path))
+    _age(tmp_path)
+    before = cache.get(str(tmp_path))
+
+    (tmp_path / "spec_rev0.0.1_20260101.xlsx").write_bytes(b"y")
+    after = cache.get(str(tmp_path))
+
+    assert after is not before
+    assert sorted(row.doc_key for row in after.rows) == ["plan.docx", "spec.xlsx"]
+
+
+def test_snapshot_is_rebuilt_when_meta_is_rewritten(tmp_path: Path):
+    (tmp_path / "plan_rev0.0.1_20260101.docx").write_bytes(b"x")
+    cache = app_mod.FolderSnapshotCache()
+    cache.get(str(tmp_path))
+    _age(tmp_path)
+    before = cache.get(str(tmp_path))
+
+    meta = app_mod.load_meta(str(tmp_path))
+    meta["documents"]["plan.docx"]["last_memo"] = "changed by another client"
+    app_mod.save_meta(str(tmp_path), meta)
+    _age(tmp_path)
+    after = cache.get(str(tmp_path))
+
+    assert after is not before
+    assert after.meta["documents"]["plan.docx"]["last_memo"] == "changed by another client"
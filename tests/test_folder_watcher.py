@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from libra import app as app_mod
+
+
+def test_meta_rewrite_reports_owning_folder_once(wait_until, tmp_path: Path):
+    folder = tmp_path / "docs"
+    (folder / "_History").mkdir(parents=True)
+    meta_path = folder / app_mod.META_FILENAME
+    meta_path.write_text("{}", encoding="utf-8")
+    other = tmp_path / "category"
+    other.mkdir()
+
+    watcher = app_mod.FolderWatcher()
+    changed = []
+    watcher.folder_changed.connect(changed.append)
+    try:
+        watcher.set_folders([str(folder)], [str(other)])
+        tmp_meta = folder / "meta.tmp"
+        tmp_meta.write_text('{"documents": {}}', encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+        (folder / "_History" / "old.docx").write_bytes(b"x")
+        assert wait_until(lambda: changed == [str(folder)])
+    finally:
+        watcher.stop()
+
+
+def test_unwatchable_paths_fall_back_to_polling(wait_until, tmp_path: Path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+
+    watcher = app_mod.FolderWatcher()
+    watcher._watcher.addPaths = lambda paths: list(paths)
+    changed = []
+    watcher.folder_changed.connect(changed.append)
+    try:
+        watcher.set_folders([], [str(folder)])
+        assert watcher.polled_paths() == [str(folder)]
+        (folder / "sub").mkdir()
+        os.utime(folder, (time.time() + 10, time.time() + 10))
+        watcher.poll()
+        assert wait_until(lambda: changed == [str(folder)])
+    finally:
+        watcher.stop()
+
+
+def test_external_change_reloads_current_folder(wait_until, monkeypatch, tmp_path: Path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "spec_rev0.0.1_20260101.docx").write_bytes(b"x")
+    registry = [{"name": "docs", "path": str(folder), "categories": ["Cat"]}]
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        window.current_folder = registry[0]
+        window.refresh_files_table()
+        assert len(window.current_file_rows) == 1
+
+        (folder / "plan_rev0.0.1_20260101.xlsx").write_bytes(b"y")
+        assert wait_until(lambda: len(window.current_file_rows) == 2)
+        assert len(window.current_meta["documents"]) == 2
+    finally:
+        window.close()
+
+
+def test_change_during_a_running_scan_is_scanned_again(wait_until, monkeypatch, tmp_path: Path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "spec_rev0.0.1_20260101.docx").write_bytes(b"x")
+    registry = [{"name": "docs", "path": str(folder), "categories": ["Cat"]}]
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        window.folder_watcher.stop()
+        key = window.folder_key(str(folder))
+        assert window.unchecked_tally.folder_count(key) == 1
+
+        scanned = threading.Event()
+        release = threading.Event()
+        real_scan = app_mod.scan_folder_cached
+
+        def stale_scan(*args):
+            # the first scan reads the folder, then the change lands before it reports
+            result = real_scan(*args)
+            if not scanned.is_set():
+                scanned.set()
+                release.wait(5)
+            return result
+
+        monkeypatch.setattr(app_mod, "scan_folder_cached", stale_scan)
+        window.on_watched_folder_changed(str(folder))
+        assert scanned.wait(5)
+        (folder / "plan_rev0.0.1_20260101.xlsx").write_bytes(b"y")
+        window.on_watched_folder_changed(str(folder))
+        release.set()
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        assert window.unchecked_tally.folder_count(key) == 2
+    finally:
+        release.set()
+        window.close()
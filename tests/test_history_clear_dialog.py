@@ -52,10 +52,11 @@ class HistoryClearDialogSelectionTests(unittest.TestCase):
         dialog.select_patch_versions()
 
         checked = []
-        for row in range(dialog.table.rowCount()):
-            item = dialog.table.item(row, 0)
-            data = item.data(Qt.UserRole)
-            if item.checkState() == Qt.Checked:
+        model = dialog.table.model()
+        for row in range(model.rowCount()):
+            index = model.index(row, 0)
+            data = index.data(Qt.UserRole)
+            if index.data(Qt.CheckStateRole) == Qt.Checked:
                 checked.append(data["rev"])
 
         self.assertEqual(sorted(checked), ["rev1.2.1_20240101", "rev1.2.2_20240102"])
@@ -71,10 +72,11 @@ class HistoryClearDialogSelectionTests(unittest.TestCase):
         dialog.select_minor_versions()
 
         checked = []
-        for row in range(dialog.table.rowCount()):
-            item = dialog.table.item(row, 0)
-            data = item.data(Qt.UserRole)
-            if item.checkState() == Qt.Checked:
+        model = dialog.table.model()
+        for row in range(model.rowCount()):
+            index = model.index(row, 0)
+            data = index.data(Qt.UserRole)
+            if index.data(Qt.CheckStateRole) == Qt.Checked:
                 checked.append(data["rev"])
 
         self.assertEqual(sorted(checked), ["rev1.0.0_20231010", "rev1.1.9_20231231"])
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from libra.core import history_log
+
+
+def _entry(rev: str, memo: str = "") -> dict:
+    return {"rev": rev, "file": f"plan_{rev}.docx", "updated_at": "", "updated_by": "u", "memo": memo}
+
+
+def test_doc_history_replays_appends_memos_and_drops(tmp_path: Path):
+    folder = str(tmp_path)
+    history_log.append_history_ops(folder, [
+        history_log.append_op("plan.docx", _entry("rev1.0.0_20260101")),
+        history_log.append_op("other.docx", _entry("rev1.0.0_20260101")),
+        history_log.append_op("plan.docx", _entry("rev1.0.1_20260102")),
+    ])
+    history_log.append_history_ops(folder, [
+        history_log.memo_op("plan.docx", "rev1.0.0_20260101", "plan_rev1.0.0_20260101.docx", "first"),
+        history_log.drop_doc_op("other.docx"),
+    ])
+
+    plan = history_log.read_doc_history(folder, "plan.docx")
+    assert [item["rev"] for item in plan] == ["rev1.0.0_20260101", "rev1.0.1_20260102"]
+    assert plan[0]["memo"] == "first"
+    assert history_log.read_doc_history(folder, "other.docx") == []
+
+    history_log.compact_history_log(folder)
+    assert history_log.read_doc_history(folder, "plan.docx") == plan
+    assert len(Path(history_log.history_log_path(folder)).read_bytes().splitlines()) == 2
+
+
+def test_partial_last_line_is_skipped_and_not_glued(tmp_path: Path):
+    folder = str(tmp_path)
+    Path(history_log.history_log_path(folder)).write_bytes(b'{"op": "append", "doc": "plan.docx", "ent')
+    history_log.append_history_ops(folder, [history_log.append_op("plan.docx", _entry("rev1.0.0_20260101"))])
+
+    assert [item["rev"] for item in history_log.read_doc_history(folder, "plan.docx")] == ["rev1.0.0_20260101"]
+
+
+def test_inline_history_migrates_once(tmp_path: Path):
+    folder = str(tmp_path)
+    docs = {"plan.docx": {"current_file": "plan.docx", "history": [_entry("rev1.0.0_20260101", "m")]}}
+    again = {"plan.docx": {"current_file": "plan.docx", "history": [_entry("rev1.0.0_20260101", "m")]}}
+
+    assert history_log.migrate_inline_history(folder, docs) is True
+    assert "history" not in docs["plan.docx"]
+    # an interrupted migration (meta not saved) runs again without duplicates
+    assert history_log.migrate_inline_history(folder, again) is True
+    assert history_log.read_doc_history(folder, "plan.docx") == [_entry("rev1.0.0_20260101", "m")]
+    assert history_log.migrate_inline_history(folder, {"plan.docx": {"history": []}}) is False
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from libra.core import history_store
+from libra.core.history_store import STORE_DIR_NAME, collect_garbage, dedupe_history
+
+
+def test_identical_history_files_share_one_blob(monkeypatch, tmp_path: Path):
+    history = tmp_path / "_History"
+    history.mkdir()
+    (history / "a_rev0.0.1_20260101.docx").write_bytes(b"x" * 1000)
+    (history / "a_rev0.0.2_20260102.docx").write_bytes(b"x" * 1000)
+    (history / "a_rev0.0.3_20260103.docx").write_bytes(b"y" * 300)
+    (history / "empty.txt").write_bytes(b"")
+
+    report = dedupe_history(str(history), dry_run=True)
+    assert (report.files, report.total_bytes, report.saved_bytes, report.linked) == (4, 2300, 1000, 0)
+    assert not (history / STORE_DIR_NAME).exists()
+
+    report = dedupe_history(str(history))
+    if not report.supported:
+        pytest.skip("no hardlinks on this file system")
+    assert (report.saved_bytes, report.linked) == (1000, 1)
+    assert len(os.listdir(history / STORE_DIR_NAME)) == 2
+    first, second = (os.stat(history / f"a_rev0.0.{n}_2026010{n}.docx") for n in (1, 2))
+    assert first.st_ino == second.st_ino and first.st_nlink == 3
+    assert (history / "a_rev0.0.2_20260102.docx").read_bytes() == b"x" * 1000
+
+    # linked files are recognised by their inode, not hashed again
+    monkeypatch.setattr(history_store, "file_digest", lambda _path: pytest.fail("hashed a stored file"))
+    assert dedupe_history(str(history)).saved_bytes == 1000
+
+    # the blob goes with the last history file that used it
+    (history / "a_rev0.0.1_20260101.docx").unlink()
+    assert collect_garbage(str(history)) == 0
+    (history / "a_rev0.0.2_20260102.docx").unlink()
+    assert collect_garbage(str(history)) == 1000
+    assert len(os.listdir(history / STORE_DIR_NAME)) == 1
+
+
+def test_blob_edited_in_place_is_not_linked(tmp_path: Path):
+    history = tmp_path / "_History"
+    history.mkdir()
+    (history / "a.docx").write_bytes(b"x" * 100)
+    report = dedupe_history(str(history))
+    if not report.supported:
+        pytest.skip("no hardlinks on this file system")
+    # someone saved over the history file, and with it the blob
+    with open(history / "a.docx", "r+b") as f:
+        f.write(b"z")
+    (history / "b.docx").write_bytes(b"x" * 100)
+    report = dedupe_history(str(history))
+    assert report.linked == 0 and report.saved_bytes == 0
+    assert (history / "b.docx").read_bytes() == b"x" * 100
+
+
+def test_unchanged_updates_share_history_when_enabled(tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+    from libra.core.journal import OperationJournal
+
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    (folder / "a_rev0.0.1_20260101.docx").write_bytes(b"drawing" * 100)
+    app_mod.save_meta(str(folder), {"documents": {"a.docx": {
+        "title": "a.docx",
+        "current_file": "a_rev0.0.1_20260101.docx",
+        "current_rev": "rev0.0.1_20260101",
+    }}})
+    journal = OperationJournal(str(tmp_path / "journal"))
+
+    for rev in ("rev0.0.2_20260102", "rev0.0.3_20260103"):
+        current = app_mod.load_meta(str(folder))["documents"]["a.docx"]
+        plan = app_mod.RevisionPlan(
+            kind="update",
+            folder_path=str(folder),
+            doc_key="a.docx",
+            current_file=current["current_file"],
+            current_rev=current["current_rev"],
+            source_path=str(folder / current["current_file"]),
+            new_file=f"a_{rev}.docx",
+            new_rev=rev,
+            memo="",
+        )
+        op = app_mod.FileOperation(str(folder), "update", 0, lambda _op: None)
+        app_mod.run_revision_plans([plan], op, journal, history_dedup=True)
+
+    report = dedupe_history(str(folder / "_History"), dry_run=True)
+    assert (report.files, report.saved_bytes) == (2, 700)
+    # the current file is never linked: it is edited in place
+    assert os.stat(folder / "a_rev0.0.3_20260103.docx").st_nlink == 1
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from libra.core.journal import OperationJournal
+
+
+def test_journal_keeps_unfinished_entries_in_order(tmp_path: Path):
+    journal = OperationJournal(str(tmp_path / "journal"))
+    assert journal.pending() == []
+
+    first = journal.begin("revision", plan={"doc_key": "a.docx"}, phase="copying")
+    second = journal.begin("revision", plan={"doc_key": "b.docx"}, phase="copying")
+    second.advance("committed", history_file="b_rev1.docx")
+    done = journal.begin("revision", phase="copying")
+    done.finish()
+
+    pending = journal.pending()
+    assert [entry.data["plan"]["doc_key"] for entry in pending] == ["a.docx", "b.docx"]
+    assert pending[1].phase == "committed" and pending[1].data["history_file"] == "b_rev1.docx"
+
+    (tmp_path / "journal" / "broken.journal.json").write_bytes(b"{")
+    pending[0].finish()
+    assert [entry.phase for entry in journal.pending()] == ["committed"]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from libra.core.memo_index import MemoIndex, MemoRecord, normalize_text, tokenize
+
+
+def record(folder: str, doc_key: str, rev: str, by: str, memo: str, at: str = "2026-01-01T09:00:00") -> MemoRecord:
+    return MemoRecord(folder, doc_key, rev, f"{doc_key}_{rev}", at, by, memo)
+
+
+def test_tokens_split_words_and_cjk_bigrams():
+    assert tokenize(normalize_text("Rev-B 図面修正 ＰＤＦ")) == {
+        "rev", "b", "図面", "面修", "修正", "図", "面", "修", "正", "pdf",
+    }
+    assert tokenize("図") == {"図"}
+
+
+def test_search_matches_every_term_and_user(tmp_path: Path):
+    index = MemoIndex(str(tmp_path / "memo_index.sqlite3"))
+    assert index.open()
+    index.replace_folder("/a", "/a", (1, 10), None, [
+        record("/a", "plan.docx", "rev1.0.0_20260101", "yamada", "Rev-B 図面を差し替え", "2026-01-01T09:00:00"),
+        record("/a", "plan.docx", "rev1.1.0_20260102", "suzuki", "Rev-B 図面の誤記修正", "2026-01-02T09:00:00"),
+        record("/a", "spec.docx", "rev0.1.0_20260103", "suzuki", "Rev-A 図面", "2026-01-03T09:00:00"),
+    ])
+    index.replace_folder("/b", "/b", (2, 20), (3, 30), [
+        record("/b", "memo.txt", "rev2.0.0_20260104", "Suzuki", "rev-b 図面 確認済み", "2026-01-04T09:00:00"),
+    ])
+
+    assert [r.rev for r in index.search("Rev-B 図面")] == [
+        "rev2.0.0_20260104", "rev1.1.0_20260102", "rev1.0.0_20260101",
+    ]
+    assert [r.folder_path for r in index.search("rev-b 図面", user="suzuki")] == ["/b", "/a"]
+    assert [r.memo for r in index.search("誤記")] == ["Rev-B 図面の誤記修正"]
+    # a single character at the end of a run, never the start of a bigram
+    assert [r.memo for r in index.search("正")] == ["Rev-B 図面の誤記修正"]
+    assert len(index.search("面")) == 4
+    assert [r.doc_key for r in index.search("rev0.1")] == ["spec.docx"]
+    assert len(index.search("", user="yamada")) == 1
+    assert index.search("図面 差し替え", user="suzuki") == []
+    assert index.search("  ") == []
+    assert index.stamps("/b") == ((2, 20), (3, 30))
+
+    page, cursor = index.recent_changes("2026-01-02", 2)
+    assert [r.updated_at[:10] for r in page] == ["2026-01-04", "2026-01-03"]
+    page, cursor = index.recent_changes("2026-01-02", 2, cursor)
+    assert [r.rev for r in page] == ["rev1.1.0_20260102"] and cursor is None
+    assert index.count_changes("2026-01-02") == 3
+
+    index.replace_folder("/a", "/a", (1, 11), None, [])
+    index.retain({"/a"})
+    assert index.search("図面") == []
+    assert index.stamps("/a") == ((1, 11), None)
+    assert index.stamps("/b") is None
+    index.close()
+
+
+def test_folder_memos_are_indexed_and_opened(wait_until, monkeypatch, tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+    from libra.core.history_log import append_history_ops, append_op
+
+    folder = tmp_path / "plans"
+    folder.mkdir()
+    (folder / "plan_rev1.1.0_20260102.docx").write_bytes(b"x")
+    app_mod.save_meta(str(folder), {"documents": {"plan.docx": {
+        "title": "plan.docx",
+        "current_file": "plan_rev1.1.0_20260102.docx",
+        "current_rev": "rev1.1.0_20260102",
+        "updated_at": "2026-01-02T09:00:00",
+        "updated_by": "suzuki",
+        "last_memo": "寸法を修正",
+    }}})
+    append_history_ops(str(folder), [append_op("plan.docx", {
+        "rev": "rev1.0.0_20260101",
+        "file": "plan_rev1.0.0_20260101.docx",
+        "updated_at": "2026-01-01T09:00:00",
+        "updated_by": "yamada",
+        "memo": "Rev-B 図面を差し替え",
+    })])
+    registry = [{"name": "plans", "path": str(folder), "categories": ["Cat"]}]
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0 and window.memo_pool.pending_count() == 0)
+        entries = window.search_memos("rev-b 図面", "yamada")
+        assert [(e["kind"], e["folder_name"], e["rev"]) for e in entries] == [("履歴", "plans", "rev1.0.0_20260101")]
+
+        window.on_memo_search()
+        dialog = window.memo_search_dialog
+        dialog.user_edit.setText("suzuki")
+        assert wait_until(lambda: dialog.model.rowCount() == 1)
+        assert dialog.model.entry(0)["memo"] == "寸法を修正"
+
+        monkeypatch.setattr(app_mod, "RECENT_CHANGES_PAGE_SIZE", 1)
+        window.on_recent_changes()
+        recent = window.recent_changes_dialog
+        recent.period.setCurrentIndex(len(recent.PERIODS) - 1)
+        assert recent.model.entry(0)["rev"] == "rev1.1.0_20260102"
+        recent.next_page()
+        assert recent.model.entry(0)["memo"] == "Rev-B 図面を差し替え"
+        assert not recent.btn_next.isEnabled() and recent.status.text() == "2〜2 件目 / 全 2 件"
+
+        window.jump_to_document_entry(entries[0])
+        assert window.current_folder["path"] == str(folder)
+        assert window.current_file_rows[window.selected_file_index()].doc_key == "plan.docx"
+        assert window.hist_table.selectionModel().selectedRows()[0].row() == 1
+
+        window.current_folder = {"name": "plans", "path": str(folder)}
+        assert window.update_history_memo("plan.docx", window.hist_model.entry(0), "Rev-C 図面に更新")
+        assert wait_until(lambda: window.search_memos("rev-c", ""))
+        assert window.search_memos("寸法", "") == []
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+    finally:
+        window.close()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+from PySide6.QtWidgets import QApplication
+
+from libra import app as app_mod
+
+
+def test_marks_are_merged_into_one_request(wait_until):
+    applied = []
+    scheduler = app_mod.RefreshScheduler(applied.append)
+    scheduler.mark_folder("/a", rescan=False)
+    scheduler.mark_folder("/a")
+    scheduler.mark_doc("/b", "x.docx")
+    scheduler.mark_folder_table()
+    scheduler.mark_category_tree()
+    assert applied == []
+    assert wait_until(lambda: applied)
+    QApplication.processEvents()
+    assert len(applied) == 1
+    request = applied[0]
+    assert request.folders == {"/a": True}
+    assert request.docs == {"/b": {"x.docx"}}
+    assert request.folder_table and not request.folder_table_force_scan
+    assert request.category_tree
+    assert not scheduler.is_pending()
+
+
+def test_operation_refreshes_once_and_rescans_only_its_folder(wait_until, monkeypatch, tmp_path: Path):
+    registry = []
+    for name in ("alpha", "beta"):
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / f"{name}_rev0.0.1_20260101.docx").write_bytes(b"x")
+        registry.append({"name": name, "path": str(folder), "categories": ["Cat"]})
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        alpha = registry[0]["path"]
+        window.current_folder = {"name": "alpha", "path": alpha}
+        window.refresh_files_table()
+
+        calls = []
+        for name in ("refresh_files_table", "refresh_folder_table", "refresh_category_tree"):
+            original = getattr(window, name)
+
+            def wrapper(*args, _name=name, _original=original, **kwargs):
+                calls.append(_name)
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(window, name, wrapper)
+        submitted = []
+        original_submit = window.scan_pool.submit
+
+        def submit(key, fn, *args, **kwargs):
+            submitted.append(key)
+            return original_submit(key, fn, *args, **kwargs)
+
+        monkeypatch.setattr(window.scan_pool, "submit", submit)
+
+        (Path(alpha) / "new_rev0.0.1_20260101.docx").write_bytes(b"y")
+        window.refresh_scheduler.mark_folder(alpha)
+        window.refresh_scheduler.mark_category_tree()
+        window.refresh_scheduler.mark_folder(alpha)
+        assert wait_until(lambda: not window.refresh_scheduler.is_pending() and window.scan_pool.pending_count() == 0)
+
+        assert calls.count("refresh_files_table") == 1
+        assert "refresh_folder_table" not in calls
+        assert submitted == [window.folder_key(alpha)]
+        assert window.files_model.row_for_doc_key("new.docx") >= 0
+    finally:
+        window.close()
+
+
+def test_revision_change_patches_rows_without_rescanning(wait_until, monkeypatch, tmp_path: Path):
+    folder = tmp_path / "docs"
+    folder.mkdir()
+    for name in ("a", "b"):
+        (folder / f"{name}_rev0.0.1_20260101.docx").write_bytes(b"x")
+    registry = [{"name": "docs", "path": str(folder), "categories": ["Cat"]}]
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        window.current_folder = {"name": "docs", "path": str(folder)}
+        window.refresh_files_table()
+        window.select_doc_key("a.docx")
+        shared_meta = window.current_meta
+
+        new_file = folder / "a_rev0.0.2_20260102.docx"
+        new_file.write_bytes(b"y")
+        os.utime(new_file, (1893456000, 1893456000))  # 2030-01-01
+        change = app_mod.RevisionChange.from_doc_info(
+            str(folder),
+            "a.docx",
+            {
+                "current_file": new_file.name,
+                "current_rev": "rev0.0.2_20260102",
+                "updated_at": "2026-01-02T10:00:00",
+                "updated_by": "suzuki",
+                "last_memo": "typo fix",
+            },
+            {"rev": "rev0.0.1_20260101", "file": "a_rev0.0.1_20260101.docx", "memo": ""},
+        )
+
+        def no_rescan(*_args, **_kwargs):
+            raise AssertionError("revision changes must not rescan the folder")
+
+        monkeypatch.setattr(app_mod, "scan_folder_cached", no_rescan)
+        monkeypatch.setattr(app_mod, "read_doc_history", no_rescan)
+        window.refresh_scheduler.mark_revision(change)
+        assert wait_until(lambda: not window.refresh_scheduler.is_pending())
+
+        row = window.files_model.row_for_doc_key("a.docx")
+        assert window.current_file_rows[row].filename == new_file.name
+        assert window.files_model.index(row, 2).data() == "rev0.0.2"
+        assert window.current_meta["documents"]["a.docx"]["last_memo"] == "typo fix"
+        assert shared_meta["documents"]["a.docx"]["current_file"] == "a_rev0.0.1_20260101.docx"
+        assert [window.hist_model.entry(n)["kind"] for n in range(window.hist_model.rowCount())] == ["最新", "履歴"]
+        assert window.hist_model.entry(1)["file"] == "a_rev0.0.1_20260101.docx"
+        assert window.folder_latest_date_cache[window.folder_key(str(folder))] >= "2029-12-31"
+    finally:
+        window.close()
+
+
+def test_revision_in_a_hidden_folder_patches_its_status_without_rescanning(wait_until, monkeypatch, tmp_path: Path):
+    registry = []
+    for name in ("shown", "hidden"):
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / f"{name}_rev0.0.1_20260101.docx").write_bytes(b"x")
+        registry.append({"name": name, "path": str(folder), "categories": ["Cat"]})
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        window.current_folder = registry[0]
+        window.refresh_files_table()
+        hidden = tmp_path / "hidden"
+        key = window.folder_key(str(hidden))
+
+        new_file = hidden / "hidden_rev0.0.2_20260102.docx"
+        new_file.write_bytes(b"y")
+        os.utime(new_file, (1893456000, 1893456000))  # 2030-01-01
+        change = app_mod.RevisionChange.from_doc_info(
+            str(hidden),
+            "hidden.docx",
+            {"current_file": new_file.name, "current_rev": "rev0.0.2_20260102", "updated_by": "suzuki"},
+        )
+
+        def no_rescan(*_args, **_kwargs):
+            raise AssertionError("revision changes must not rescan the folder")
+
+        monkeypatch.setattr(app_mod, "scan_folder_cached", no_rescan)
+        monkeypatch.setattr(window.scan_pool, "submit", no_rescan)
+        window.refresh_scheduler.mark_revision(change)
+        assert wait_until(lambda: not window.refresh_scheduler.is_pending())
+
+        assert window.folder_latest_date_cache[key] >= "2029-12-31"
+        assert window.folder_unchecked_cache[key] is True
+        assert window.unchecked_tally.folder_count(key) == 1
+        assert [doc.current_file for path, doc in window.unchecked_inbox.unchecked() if path == str(hidden)] == [
+            new_file.name
+        ]
+
+        window.mark_doc_checked(str(hidden), "hidden.docx")
+        window.refresh_scheduler.mark_revision(change)
+        assert wait_until(lambda: not window.refresh_scheduler.is_pending())
+        assert window.folder_unchecked_cache[key] is False
+    finally:
+        window.close()
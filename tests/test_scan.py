@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from libra.core import scan as scan_mod
+
+
+def test_scan_directory_splits_files_and_dirs_in_one_pass(tmp_path: Path):
+    (tmp_path / "a_rev0.0.1_20260101.docx").write_bytes(b"abc")
+    (tmp_path / "b.xlsx").write_bytes(b"12345")
+    (tmp_path / "_History").mkdir()
+    (tmp_path / "child").mkdir()
+    os.utime(tmp_path / "b.xlsx", (1_700_000_000, 1_700_000_000))
+
+    result = scan_mod.scan_directory(str(tmp_path))
+
+    assert result.exists is True
+    assert sorted(result.files) == ["a_rev0.0.1_20260101.docx", "b.xlsx"]
+    assert sorted(result.dirs) == ["_History", "child"]
+    assert result.files["b.xlsx"].size == 5
+    assert result.files["b.xlsx"].mtime == 1_700_000_000
+
+
+def test_scan_directory_reports_missing_folder(tmp_path: Path):
+    result = scan_mod.scan_directory(str(tmp_path / "missing"))
+
+    assert result.exists is False
+    assert result.files == {}
+    assert result.dirs == []
+
+
+def test_latest_mtime_picks_newest_file():
+    files = {
+        "a": scan_mod.FileStat(size=1, mtime=10.0),
+        "b": scan_mod.FileStat(size=1, mtime=30.0),
+    }
+    assert scan_mod.latest_mtime(files) == 30.0
+    assert scan_mod.latest_mtime({}) is None
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from libra.core.scan_index import IndexedDocument, IndexEntry, ScanIndex
+
+
+def _entry(path: str) -> IndexEntry:
+    return IndexEntry(
+        folder_path=path,
+        exists=True,
+        dir_stamp=(1_700_000_000_000_000_000, 4096),
+        meta_stamp=None,
+        ignore_key="[]",
+        latest_mtime=1_700_000_000.5,
+        subfolder_count=2,
+        documents=[IndexedDocument("plan.docx", "plan_rev1.0.0_20260101.docx", "rev1.0.0_20260101")],
+    )
+
+
+def test_entries_round_trip_and_prune(tmp_path: Path):
+    db_path = str(tmp_path / "scan_index.sqlite3")
+    index = ScanIndex(db_path)
+    assert index.open()
+    index.put_many({"a": _entry("/a"), "b": _entry("/b")})
+    index.retain({"a"})
+    index.close()
+
+    reopened = ScanIndex(db_path)
+    assert reopened.open()
+    entries = reopened.load_all()
+    reopened.close()
+    assert list(entries) == ["a"]
+    assert entries["a"] == _entry("/a")
+
+
+def test_unreadable_index_is_a_no_op(tmp_path: Path):
+    index = ScanIndex(str(tmp_path / "missing" / "scan_index.sqlite3"))
+    assert not index.open()
+    index.put_many({"a": _entry("/a")})
+    assert index.load_all() == {}
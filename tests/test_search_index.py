@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from libra.core.search_index import SearchIndex
+
+
+def build_index() -> SearchIndex:
+    index = SearchIndex()
+    index.set_folders([
+        ("/p/alpha", "Alpha 設計", "/p/alpha", ["案件", "設計"]),
+        ("/p/beta", "Beta", "/p/beta", ["案件"]),
+    ])
+    index.set_categories([["案件"], ["案件", "設計"]])
+    index.set_documents("/p/beta", [
+        ("仕様書.docx", "仕様書_rev1.0.0_20260101.docx"),
+        ("manual.pdf", "manual_rev0.1.0_20260101.pdf"),
+    ])
+    return index
+
+
+def test_trigram_and_short_queries():
+    index = build_index()
+    index.set_folders([
+        ("/p/alpha", "Alpha 設計", "/p/alpha", ["案件", "設計"]),
+        ("/p/beta", "Beta", "/p/beta", ["案件"]),
+        ("/p/design", "設計変更の記録", "/p/design", ["案件"]),
+    ])
+    assert [hit.label for hit in index.search("ALPHA")] == ["Alpha 設計"]
+    hits = index.search("設計")
+    assert [(hit.kind, hit.label) for hit in hits] == [
+        ("folder", "設計変更の記録"),  # prefix match first
+        ("folder", "Alpha 設計"),
+        ("category", "案件 / 設計"),
+    ]
+    assert [hit.label for hit in index.search("設計", limit=1)] == ["設計変更の記録"]
+    assert [hit.label for hit in index.search("lpha 設")] == ["Alpha 設計"]
+    assert index.search("alpha設計") == []
+    hit = index.search("仕様")[0]
+    assert (hit.kind, hit.folder_path, hit.doc_key) == ("document", "/p/beta", "仕様書.docx")
+    assert hit.category_path == ("案件",)
+    assert [hit.doc_key for hit in index.search("man .PDF")] == ["manual.pdf"]
+    assert index.search("rev0.1") == []  # documents match by doc key, not by rev
+    assert index.search("missing") == []
+    assert index.search("  ") == []
+
+
+def test_documents_follow_folder_changes():
+    index = build_index()
+    index.set_documents("/p/gamma", [("draft.txt", "draft_rev0.0.1_20260101.txt")])
+    assert index.search("draft") == []
+    index.set_folders([
+        ("/p/beta", "Beta", "/p/beta", ["移動先"]),
+        ("/p/gamma", "Gamma", "/p/gamma", ["案件"]),
+    ])
+    assert [hit.folder_path for hit in index.search("draft")] == ["/p/gamma"]
+    assert index.search("manual")[0].category_path == ("移動先",)
+    assert index.search("alpha") == []
+
+    index.set_document("/p/beta", "manual.pdf", "manual_rev0.2.0_20260102.pdf")
+    assert [hit.label for hit in index.search("manual")] == ["manual_rev0.2.0_20260102.pdf"]
+    index.remove_folder("/p/beta")
+    assert index.search("manual") == []
+
+
+def test_search_hit_jumps_to_folder_and_document(wait_until, monkeypatch, tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+
+    registry = []
+    for name, category in (("alpha", "A"), ("beta", "B")):
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / f"{name}doc_rev0.0.1_20260101.docx").write_bytes(b"x")
+        registry.append({"name": name, "path": str(folder), "categories": [category]})
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        searches = []
+        search = window.search_index.search
+
+        def counting_search(query, *args):
+            searches.append(query)
+            return search(query, *args)
+
+        window.search_index.search = counting_search
+        for text in ("b", "be", "bet", "betadoc"):
+            window.search.setText(text)
+        assert wait_until(lambda: searches)
+        assert searches == ["betadoc"]
+        assert wait_until(lambda: window.search_results_model.rowCount() == 1)
+        hit = window.search_results_model.hits[0]
+        assert hit.doc_key == "betadoc.docx"
+        window.on_search_result_activated(window.search_results_model.index(0, 0))
+
+        assert window.search.text() == ""
+        assert window.selected_category_path == ["B"]
+        assert window.current_folder["path"] == registry[1]["path"]
+        assert window.current_file_rows[window.selected_file_index()].doc_key == "betadoc.docx"
+        assert window.category_tree.currentIndex().data(app_mod.Qt.UserRole)["path"] == registry[1]["path"]
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+    finally:
+        window.close()
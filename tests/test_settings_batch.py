@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+from PySide6.QtWidgets import QApplication, QDialog
+
+from libra import app as app_mod
+
+
+class AcceptAllPreview:
+    def __init__(self, items, _parent=None):
+        self._items = items
+
+    def exec(self):
+        return QDialog.Accepted
+
+    def selected_items(self):
+        return [
+            {"name": item["name"], "path": item["path"], "categories": item["categories"]}
+            for item in self._items
+        ]
+
+
+def test_batch_register_writes_settings_once(qapp, monkeypatch, tmp_path: Path):
+    root = tmp_path / "root"
+    for i in range(20):
+        (root / f"folder{i:02d}").mkdir(parents=True)
+
+    saves = []
+    monkeypatch.setattr(app_mod, "load_registry", lambda: [])
+    monkeypatch.setattr(app_mod, "save_registry", lambda _items: None)
+    monkeypatch.setattr(app_mod, "save_settings", lambda settings: saves.append(dict(settings)))
+    monkeypatch.setattr(app_mod, "BatchPreviewDialog", AcceptAllPreview)
+
+    window = app_mod.MainWindow()
+    monkeypatch.setattr(window, "info", lambda _message: None)
+    try:
+        QApplication.processEvents()
+        saves.clear()
+        assert window.run_batch_register(str(root), 1)
+        QApplication.processEvents()
+
+        assert len(saves) == 1
+        counts = saves[0]["folder_subfolder_counts"]
+        assert all(window.folder_key(str(root / f"folder{i:02d}")) in counts for i in range(20))
+    finally:
+        window.close()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from libra import app as app_mod
+
+
+def test_startup_scan_runs_in_background_and_fills_caches(wait_until, monkeypatch, tmp_path: Path):
+    folders = []
+    for name in ("alpha", "beta"):
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / f"{name}_rev0.0.1_20260101.docx").write_bytes(b"x")
+        folders.append({"name": name, "path": str(folder), "categories": ["Cat"]})
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: folders)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        for folder in folders:
+            key = window.folder_key(folder["path"])
+            assert window.folder_unchecked_cache[key] is True
+            assert window.folder_latest_date_cache[key] != ""
+    finally:
+        window.close()
+
+
+def test_cancel_pending_keeps_other_groups(wait_until):
+    import threading
+
+    release = threading.Event()
+    pool = app_mod.BackgroundTaskPool(max_workers=1)
+    finished = []
+    pool.task_finished.connect(lambda key, _result: finished.append(key))
+    try:
+        pool.submit("busy", release.wait, 5)
+        pool.submit("table", lambda: "t", group=app_mod.FOLDER_TABLE_STATUS_GROUP)
+        pool.submit("startup", lambda: "s")
+        pool.cancel_pending(app_mod.FOLDER_TABLE_STATUS_GROUP)
+        assert not pool.is_pending("table")
+        release.set()
+        assert wait_until(lambda: pool.pending_count() == 0)
+        assert sorted(finished) == ["busy", "startup"]
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_folder_rows_render_placeholder_then_update_in_place(wait_until, monkeypatch, tmp_path: Path):
+    folder = tmp_path / "gamma"
+    folder.mkdir()
+    (folder / "gamma_rev0.0.1_20260101.docx").write_bytes(b"x")
+    registry = [{"name": "gamma", "path": str(folder), "categories": ["Cat"]}]
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        key = window.folder_key(str(folder))
+        window.folder_latest_date_cache.pop(key, None)
+        window.folder_missing_cache.pop(key, None)
+        window.selected_category_path = ["Cat"]
+        window.refresh_folder_table(force_scan=False)
+        model = window.folder_model
+        row = model.row_for_key(key)
+        resets = []
+        changed_rows = []
+        model.modelReset.connect(lambda: resets.append(True))
+        model.dataChanged.connect(lambda top, bottom, _roles=(): changed_rows.append((top.row(), bottom.row())))
+        assert model.index(row, 1).data() == app_mod.FOLDER_STATUS_PLACEHOLDER
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        assert model.index(row, 1).data() == window.folder_latest_date_cache[key] != ""
+        assert resets == []
+        assert changed_rows == [(row, row)]
+    finally:
+        window.close()
+
+
+def test_warm_start_renders_from_scan_index_without_rescanning(wait_until, monkeypatch, tmp_path: Path):
+    folder = tmp_path / "delta"
+    folder.mkdir()
+    (folder / "delta_rev0.0.1_20260101.docx").write_bytes(b"x")
+    registry = [{"name": "delta", "path": str(folder), "categories": ["Cat"]}]
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    app_mod.scan_folder_cached(str(folder))
+    past = time.time() - 120
+    os.utime(folder, (past, past))
+    app_mod.FOLDER_SNAPSHOTS.invalidate()
+
+    # kept referenced until the test ends, so it is not collected on a worker thread
+    first = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: first.scan_pool.pending_count() == 0)
+    finally:
+        first.close()
+
+    app_mod.FOLDER_SNAPSHOTS.invalidate()
+    builds = []
+    real_build = app_mod.build_folder_snapshot
+    monkeypatch.setattr(
+        app_mod,
+        "build_folder_snapshot",
+        lambda *args: builds.append(args) or real_build(*args),
+    )
+    window = app_mod.MainWindow()
+    try:
+        key = window.folder_key(str(folder))
+        assert window.folder_unchecked_cache[key] is True
+        assert window.folder_latest_date_cache[key] != ""
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        assert builds == []
+    finally:
+        window.close()
+
+
+def test_name_filter_hides_rows_without_resetting_model(wait_until, monkeypatch, tmp_path: Path):
+    registry = []
+    for name in ("alpha", "beta"):
+        folder = tmp_path / name
+        folder.mkdir()
+        registry.append({"name": name, "path": str(folder), "categories": ["Cat"]})
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        window.selected_category_path = ["Cat"]
+        window.refresh_folder_table(force_scan=False)
+        window.select_folder_in_table(registry[0]["path"])
+        assert window.current_folder["path"] == registry[0]["path"]
+        resets = []
+        window.folder_model.modelReset.connect(lambda: resets.append(True))
+
+        window.search.setText("BET")
+        assert window.folder_proxy.rowCount() == 1
+        assert window.folder_model.rowCount() == 2
+        assert window.current_folder["path"] == registry[0]["path"]
+
+        window.search.setText("")
+        assert window.folder_proxy.rowCount() == 2
+        assert resets == []
+    finally:
+        window.close()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from libra.core import storage
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path: Path):
+    path = tmp_path / "settings.json"
+    before = storage.WriteStats(**vars(storage.WRITE_STATS))
+
+    assert storage.write_json_atomic(str(path), {"a": "値"}) is True
+    mtime_ns = os.stat(path).st_mtime_ns
+    assert storage.write_json_atomic(str(path), {"a": "値"}) is False
+
+    assert os.stat(path).st_mtime_ns == mtime_ns
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": "値"}
+    assert storage.WRITE_STATS.written == before.written + 1
+    assert storage.WRITE_STATS.skipped == before.skipped + 1
+
+
+def test_failed_replace_keeps_old_file_and_no_temp(tmp_path: Path, monkeypatch):
+    path = tmp_path / ".libra_meta.json"
+    storage.write_json_atomic(str(path), {"documents": {}})
+
+    def fail(_src, _dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage, "_replace", fail)
+    try:
+        storage.write_json_atomic(str(path), {"documents": {"a": {}}})
+    except OSError:
+        pass
+    else:
+        raise AssertionError("expected OSError")
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"documents": {}}
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".libra_meta.json"]
+
+
+def test_temp_files_are_not_listed_as_documents(tmp_path: Path, monkeypatch):
+    pytest.importorskip("PySide6")
+    from libra import app as app_mod
+    from libra.core.scan import FileStat
+
+    temp_names = []
+    replace = storage._replace
+    monkeypatch.setattr(storage, "_replace", lambda src, dst: temp_names.append(os.path.basename(src)) or replace(src, dst))
+    storage.write_json_atomic(str(tmp_path / ".libra_meta.json"), {"documents": {}})
+    [temp_name] = temp_names
+    assert storage.is_atomic_temp_name(temp_name)
+
+    files = {name: FileStat(1, 0.0) for name in (temp_name, "a_rev0.0.1_20260101.docx", ".hidden.docx")}
+    assert sorted(app_mod.filter_document_files(files)) == [".hidden.docx", "a_rev0.0.1_20260101.docx"]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from libra.core.unchecked_inbox import CategoryTally, InboxDocument, UncheckedInbox
+
+
+def test_inbox_follows_scans_and_toggles():
+    changes = []
+    inbox = UncheckedInbox(changes.append)
+    docs = [InboxDocument("a.docx", "a_rev1.docx"), InboxDocument("b.docx", "b_rev1.docx"), InboxDocument("gone", "")]
+    inbox.set_folder("/x", "/X", docs, lambda doc_key: doc_key == "b.docx")
+    assert len(inbox) == 1 and inbox.unchecked() == [("/X", docs[0])]
+    inbox.set_folder("/x", "/X", docs, lambda doc_key: doc_key == "b.docx")
+    assert changes == ["/x"]  # unchanged scans are no-ops
+
+    assert inbox.set_checked("/x", "b.docx", False)
+    assert not inbox.set_checked("/x", "b.docx", False)
+    assert not inbox.set_checked("/x", "gone", False)
+    assert inbox.unchecked_count("/x") == 2
+
+    inbox.set_folder("/y", "/Y", [InboxDocument("c.docx", "c_rev1.docx")], lambda _doc_key: False)
+    assert len(inbox) == 3
+    inbox.retain({"/y"})
+    assert len(inbox) == 1 and not inbox.has_unchecked("/x")
+
+
+def test_revision_replaces_one_document_of_a_scanned_folder():
+    changes = []
+    inbox = UncheckedInbox(changes.append)
+    assert not inbox.set_document("/x", InboxDocument("a.docx", "a_rev2.docx"), False)
+    docs = [InboxDocument("a.docx", "a_rev1.docx"), InboxDocument("b.docx", "b_rev1.docx")]
+    inbox.set_folder("/x", "/X", docs, lambda _doc_key: False)
+
+    assert inbox.set_document("/x", InboxDocument("a.docx", "a_rev2.docx", "rev2"), True)
+    assert inbox.unchecked() == [("/X", docs[1])]
+    assert inbox.set_document("/x", InboxDocument("c.docx", "c_rev1.docx"), False)
+    assert len(inbox) == 2 and changes == ["/x", "/x", "/x"]
+
+def test_tally_sums_counts_through_enabled_categories():
+    tally = CategoryTally()
+    tally.set_folder("/x", ["A", "B"])
+    tally.set_folder("/y", ["A"])
+    tally.set_count("/x", 2)
+    tally.set_count("/y", 1)
+    tally.set_count("/z", 5)  # not placed yet
+    assert (tally.category_count(["A", "B"]), tally.category_count(["A"]), tally.category_count([])) == (2, 3, 3)
+
+    tally.set_category_enabled(["A", "B"], False)
+    assert (tally.category_count(["A", "B"]), tally.category_count(["A"])) == (2, 1)
+    tally.set_count("/x", 4)
+    assert (tally.category_count(["A", "B"]), tally.category_count(["A"])) == (4, 1)
+    tally.set_category_enabled(["A", "B"], True)
+    assert tally.category_count([]) == 5
+
+    tally.set_folder_enabled("/y", False)
+    tally.set_folder("/z", ["A", "B"])
+    assert (tally.category_count(["A"]), tally.folder_count("/y")) == (9, 1)
+    tally.retain({"/y"})
+    assert tally.category_count([]) == 0
+    tally.set_folder_enabled("/y", True)
+    assert tally.category_count(["A"]) == 1
+
+
+def test_inbox_lists_and_checks_off_without_rescanning(wait_until, monkeypatch, tmp_path: Path):
+    pytest.importorskip("PySide6")
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QApplication
+
+    from libra import app as app_mod
+
+    registry = []
+    for name, docs in (("alpha", ("a1", "a2")), ("beta", ("b1",))):
+        folder = tmp_path / name
+        folder.mkdir()
+        for doc in docs:
+            (folder / f"{doc}_rev0.0.1_20260101.docx").write_bytes(b"x")
+        registry.append({"name": name, "path": str(folder), "categories": ["Cat"]})
+    saves = []
+
+    monkeypatch.setattr(app_mod, "load_registry", lambda: registry)
+    monkeypatch.setattr(app_mod, "save_user_checks", lambda checks: saves.append(dict(checks)))
+
+    window = app_mod.MainWindow()
+    try:
+        assert wait_until(lambda: window.scan_pool.pending_count() == 0)
+        window.on_unchecked_inbox()
+        dialog = window.inbox_dialog
+        assert sorted(e["doc_key"] for e in window.inbox_entries()) == ["a1.docx", "a2.docx", "b1.docx"]
+        assert dialog.model.rowCount() == 3
+
+        window.current_folder = {"name": "alpha", "path": registry[0]["path"]}
+        window.refresh_files_table()
+        row = window.files_model.row_for_doc_key("a1.docx")
+        window.files_model.setData(window.files_model.index(row, 0), Qt.Checked, Qt.CheckStateRole)
+        # updated in place, before any scan could have reported
+        assert len(window.unchecked_inbox) == 2
+        assert window.unchecked_tally.category_count(["Cat"]) == 2
+        assert wait_until(lambda: dialog.model.rowCount() == 2)
+        assert wait_until(lambda: not window.refresh_scheduler.is_pending())
+        cat_index = window.category_model.index(0, 0)
+        assert cat_index.data().endswith("Cat (2)")
+
+        dialog.model.set_checked([True, True])
+        saves.clear()
+        dialog.on_check_off()
+        assert len(window.unchecked_inbox) == 0
+        assert not window.folder_unchecked_cache[window.folder_key(registry[1]["path"])]
+        assert wait_until(lambda: saves and dialog.model.rowCount() == 0 and not window.refresh_scheduler.is_pending())
+        QApplication.processEvents()
+        assert len(saves) == 1
+        assert saves[0][window.folder_key(registry[1]["path"])] == {"b1.docx": True}
+        assert window.files_model.checked_count() == 2
+    finally:
+        window.close()